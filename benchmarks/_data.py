@@ -0,0 +1,9 @@
+from pathlib import Path
+
+
+BENCHMARKS_DIR = Path(__file__).parent.resolve()
+DATA_DIR = BENCHMARKS_DIR.parent / "tests" / "data"
+
+def data_path(*parts) -> Path:
+    """Join parts under tests/data and return a Path."""
+    return DATA_DIR.joinpath(*parts)
@@ -0,0 +1,55 @@
+# benchmarks/bench_core_compounding.py
+#
+# Latency per call of each compounding kernel on (curves x tenors) blocks of rates, allocating a fresh result against
+# writing into a preallocated out= buffer.
+# Run from the repository root with:  PYTHONPATH=src python benchmarks/bench_core_compounding.py
+
+import timeit
+import numpy as np
+
+from modelic.core import compounding
+
+
+CURVE_COUNTS = (1, 1_000, 10_000)
+TENORS = 120
+
+
+def time_call(fn, repeat: int = 5) -> float:
+    number = 10
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main():
+
+    rng = np.random.default_rng(0)
+    years = np.arange(1, TENORS + 1)
+
+    print(f"{'curves':>8} {'kernel':<18} {'alloc (ms)':>11} {'out= (ms)':>10}")
+
+    for n in CURVE_COUNTS:
+
+        rates = 0.03 + rng.normal(0, 0.01, (n, TENORS))
+        dfs = compounding.zero_to_df(years, rates)
+        out = np.empty_like(rates)
+
+        kernels = {
+            'zero_to_df': lambda **kw: compounding.zero_to_df(years, rates, **kw),
+            'df_to_zero': lambda **kw: compounding.df_to_zero(years, dfs, **kw),
+            'acc': lambda **kw: compounding.acc(years, rates, **kw),
+            'fwd_to_df': lambda **kw: compounding.fwd_to_df(years, rates, **kw),
+            'fwd_from_df': lambda **kw: compounding.fwd_from_df(years, dfs, **kw),
+            'fwd_from_zeros': lambda **kw: compounding.fwd_from_zeros(years, rates, **kw),
+            'par_swap_to_df': lambda **kw: compounding.par_swap_to_df(years, rates, **kw),
+            'zero_convert': lambda **kw: compounding.zero_convert(rates, 'annual', 'continuous', **kw),
+            'annuity_immediate': lambda **kw: compounding.annuity_immediate(years, rates, **kw),
+            'annuity_due': lambda **kw: compounding.annuity_due(years, rates, **kw),
+        }
+
+        for label, kernel in kernels.items():
+            alloc_time = time_call(lambda: kernel())
+            out_time = time_call(lambda: kernel(out=out))
+            print(f"{n:>8,} {label:<18} {alloc_time * 1e3:>11.3f} {out_time * 1e3:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/bench_core_mortality.py
+#
+# Latency per npx/nqx call for the lx-ratio lookups against the dense n x n table path, plus full-path
+# extraction into a preallocated out= buffer.
+# Run from the repository root with:  PYTHONPATH=src python benchmarks/bench_core_mortality.py
+
+import timeit
+import numpy as np
+import pandas as pd
+
+from modelic.core.mortality import MortalityTable
+from _data import data_path
+
+
+POLICY_COUNTS = (1_000, 100_000, 1_000_000)
+PATH_TERM = 10
+
+
+def load_mortality() -> MortalityTable:
+    mort_raw = pd.read_csv(data_path("mortality", "AM92.csv"))
+    return MortalityTable(mort_raw['x'].to_numpy(int), mort_raw['q_x'].to_numpy(float), 'AM92')
+
+
+def time_call(fn, repeat: int = 5) -> float:
+    number = 1
+    return min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main():
+
+    mortality = load_mortality()
+    rng = np.random.default_rng(0)
+
+    print(f"{'policies':>10} {'call':<22} {'lx (ms)':>10} {'table (ms)':>11}")
+
+    for n in POLICY_COUNTS:
+
+        ages = rng.integers(20, 90, n)
+        terms = rng.integers(1, 40, n)
+        path_buffer = np.empty((PATH_TERM, n))
+
+        calls = {
+            'npx': lambda tbl: mortality.npx(ages, terms, use_tables=tbl),
+            'nqx': lambda tbl: mortality.nqx(ages, terms, use_tables=tbl),
+            f'npx full_path t={PATH_TERM}': lambda tbl: mortality.npx(ages, PATH_TERM, full_path=True, use_tables=tbl),
+            f'nqx full_path t={PATH_TERM}': lambda tbl: mortality.nqx(ages, PATH_TERM, full_path=True, use_tables=tbl),
+        }
+
+        for label, fn in calls.items():
+            lx_time = time_call(lambda: fn(False))
+            table_time = time_call(lambda: fn(True))
+            print(f"{n:>10,} {label:<22} {lx_time * 1e3:>10.3f} {table_time * 1e3:>11.3f}")
+
+        out_time = time_call(lambda: mortality.npx(ages, PATH_TERM, full_path=True, out=path_buffer))
+        print(f"{n:>10,} {'npx full_path out=':<22} {out_time * 1e3:>10.3f} {'-':>11}")
+
+
+if __name__ == '__main__':
+    main()
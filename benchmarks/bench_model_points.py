@@ -0,0 +1,104 @@
+# benchmarks/bench_model_points.py
+#
+# Present value latency with and without (age, term) model point deduplication, on portfolios whose ages and terms
+# are skewed the way real in-force files are: ages bunched around the late 40s, a handful of standard terms, and a
+# whole-of-life tail. Then the speed-up against PV error of compressing such a portfolio into banded model points, at
+# several band widths.
+# Run from the repository root with:  PYTHONPATH=src python benchmarks/bench_model_points.py
+
+import timeit
+import numpy as np
+import pandas as pd
+
+from modelic.core.curves import YieldCurve
+from modelic.core.model_points import compress
+from modelic.core.mortality import MortalityTable
+from modelic.core.policy_portfolio import PolicyPortfolio
+from modelic.products.endowment import Endowment
+from modelic.products.life_assurance import LifeAssurance
+from _data import data_path
+
+
+POLICY_COUNTS = (10_000, 100_000, 1_000_000)
+COMPRESSED_POLICIES = 1_000_000
+BAND_WIDTHS = (1, 2, 5, 10)
+ERROR_SAMPLE = 10_000
+STANDARD_TERMS = np.array([5, 10, 15, 20, 25, np.nan])
+TERM_WEIGHTS = np.array([0.1, 0.3, 0.2, 0.2, 0.1, 0.1])
+
+
+def load_assumptions() -> tuple[MortalityTable, YieldCurve]:
+    mort_raw = pd.read_csv(data_path("mortality", "AM92.csv"))
+    disc_raw = pd.read_csv(data_path("curves", "boe_spot_annual.csv"))
+    return (MortalityTable(mort_raw['x'].to_numpy(int), mort_raw['q_x'].to_numpy(float), 'AM92'),
+            YieldCurve(disc_raw['year'].to_numpy(int), disc_raw['rate'].to_numpy(float), 'BoE'))
+
+
+def skewed_portfolio(rng: np.random.Generator, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    ages = np.clip(rng.normal(47, 9, n).round(), 18, 80).astype(int)
+    terms = rng.choice(STANDARD_TERMS, n, p=TERM_WEIGHTS)
+    amounts = rng.lognormal(10, 1, n)
+    return ages, terms, amounts
+
+
+def time_call(fn, repeat: int = 3) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def deduplication(mortality: MortalityTable, curve: YieldCurve, rng: np.random.Generator):
+
+    print(f"{'policies':>10} {'points':>7} {'product':<15} {'all (ms)':>10} {'deduplicated (ms)':>18}")
+
+    for n in POLICY_COUNTS:
+
+        ages, terms, amounts = skewed_portfolio(rng, n)
+        points = np.unique(np.column_stack((ages, np.nan_to_num(terms))), axis=0).shape[0]
+
+        products = {
+            'LifeAssurance': lambda dedup: LifeAssurance(curve, mortality, ages, terms, amounts, deduplicate=dedup),
+            'Endowment': lambda dedup: Endowment(curve, mortality, ages, terms, amounts, amounts, deduplicate=dedup),
+        }
+
+        for label, build in products.items():
+            full_time = time_call(lambda: build(False).present_value(aggregate=False))
+            dedup_time = time_call(lambda: build(True).present_value(aggregate=False))
+            print(f"{n:>10,} {points:>7,} {label:<15} {full_time * 1e3:>10.1f} {dedup_time * 1e3:>18.1f}")
+
+
+def compression(mortality: MortalityTable, curve: YieldCurve, rng: np.random.Generator):
+
+    ages, terms, amounts = skewed_portfolio(rng, COMPRESSED_POLICIES)
+    policies = PolicyPortfolio(ages, terms, death_contingent_benefits=amounts,
+                               terminal_survival_contingent_benefits=amounts,
+                               policy_type=np.full(ages.size, 'Endowment'), premium_type=np.full(ages.size, 'Regular'))
+    value = lambda p: Endowment.from_policy_portfolio(p, curve, mortality).present_value(aggregate=False)
+
+    full_pv = value(policies).sum()
+    full_time = time_call(lambda: value(policies))
+
+    # A portfolio is compressed once and then valued on many bases, so the speed-up is per valuation
+    print(f"\n{'band':>5} {'points':>8} {'ratio':>8} {'compress (ms)':>14} {'full (ms)':>10} {'points (ms)':>12} "
+          f"{'speed-up':>9} {'PV error':>10} {'sampled':>10}")
+
+    for band in BAND_WIDTHS:
+        compress_time = time_call(lambda: compress(policies, age_band=band, term_band=band))
+        model_points = compress(policies, age_band=band, term_band=band)
+        point_time = time_call(lambda: model_points.total(value(model_points.portfolio)))
+        error = model_points.total(value(model_points.portfolio)) / full_pv - 1
+        sampled = model_points.sampled_error(value, ERROR_SAMPLE, seed=0).relative_error
+        print(f"{band:>5} {model_points.count:>8,} {model_points.compression_ratio:>8,.0f} "
+              f"{compress_time * 1e3:>14.1f} {full_time * 1e3:>10.1f} {point_time * 1e3:>12.1f} "
+              f"{full_time / point_time:>9,.0f} {error:>10.2e} {sampled:>10.2e}")
+
+
+def main():
+
+    mortality, curve = load_assumptions()
+    rng = np.random.default_rng(0)
+
+    deduplication(mortality, curve, rng)
+    compression(mortality, curve, rng)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,9 @@ from typing import Literal, Union
 
 from modelic.core.curves import YieldCurve, IndexCurve
 from modelic.core.enums import CurveKind, YieldSchema, IndexSchema
-from modelic.core.compounding import fwd_to_df, zero_to_df
+from modelic.core.compounding import df_to_zero, fwd_to_df, par_swap_to_df
 
-Schema = Literal["one_year_forwards", "maturity_zeros", "index_levels"]
+Schema = Literal["one_year_forwards", "maturity_zeros", "par_swap", "index_levels"]
 
 
 @dataclass(frozen=True)
@@ -34,13 +34,15 @@ def load_curve(spec: CurveSpec) -> Union[YieldCurve, IndexCurve]:
     if spec.kind == CurveKind.YIELD:
         _validate_years(years, 1)
         if spec.schema == YieldSchema.MATURITY_ZEROS:
-            dvec = zero_to_df(years, rates)
+            zeros = rates
         elif spec.schema == YieldSchema.ONE_YEAR_FORWARDS:
-            dvec = fwd_to_df(years, rates)
+            zeros = df_to_zero(years, fwd_to_df(years, rates))
+        elif spec.schema == YieldSchema.PAR_SWAP:
+            zeros = df_to_zero(years, par_swap_to_df(years, rates))
         else:
             raise ValueError(f"Unknown schema: {spec.schema}")
-        return YieldCurve(years, dvec, spec.name)
+        return YieldCurve(years, zeros, spec.name)
     elif spec.kind == CurveKind.INDEX:
         _validate_years(years, 0)
         if spec.schema == IndexSchema.INDEX_LEVELS:
-            return IndexCurve(years, df, spec.name)
+            return IndexCurve(years, rates, spec.name)
@@ -1,13 +1,23 @@
 import numpy as np
 
-from modelic.core.curves import YieldCurve
+from modelic.core.compounding import df_to_zero, par_swap_to_df
+from modelic.core.curves import YieldCurve, YieldCurveSet
 from modelic.core.custom_types import ArrayLike
 
 
 # --- Curve construction ---
 
 def build_yield_curve(times: np.ndarray, zero_rates: np.ndarray, name: str = None) -> YieldCurve:
-    pass
+    return YieldCurve(np.asarray(times), np.asarray(zero_rates, dtype=float), name or "Yield curve")
+
+def build_par_swap_curve(years: np.ndarray, par_rates: np.ndarray, name: str = None) -> YieldCurve | YieldCurveSet:
+    """Zero curve bootstrapped from par swap rates; a (scenarios x years) block of rates gives a YieldCurveSet"""
+    years, par_rates = np.asarray(years), np.asarray(par_rates, dtype=float)
+    zeros = par_swap_to_df(years, par_rates)
+    df_to_zero(years, zeros, out=zeros)
+    if zeros.ndim == 1:
+        return YieldCurve(years, zeros, name or "Par swap curve")
+    return YieldCurveSet(years, zeros, name or "Par swap curves")
 
 def build_index_curve(times: np.ndarray, index_levels: np.ndarray, name: str = None) -> YieldCurve:
     pass
@@ -16,7 +26,12 @@ def build_index_curve(times: np.ndarray, index_levels: np.ndarray, name: str = N
 # --- Curve adjustments ---
 
 def apply_spread(yc: YieldCurve, spread: ArrayLike) -> YieldCurve:
-    pass
-
-def twist(yc: YieldCurve, shift_short: ArrayLike, shift_long: ArrayLike, pivot: float) -> ArrayLike:
-    pass
\ No newline at end of file
+    """Lazy curve with spread (as a rate, one or one per time) added to the zero rates"""
+    return yc.transformed(shift=spread, name=f"{yc.name} + spread")
+
+def twist(yc: YieldCurve, shift_short: ArrayLike, shift_long: ArrayLike, pivot: float) -> YieldCurve:
+    """Lazy curve shifted by shift_short at its first time and shift_long at its last, linearly through zero at pivot"""
+    if not yc.min_time < pivot < yc.max_time:
+        raise ValueError(f"Twist pivot must lie strictly inside the curve's times, got {pivot}")
+    shift = np.interp(yc.times, [yc.min_time, pivot, yc.max_time], [shift_short, 0.0, shift_long])
+    return yc.transformed(shift=shift, name=f"{yc.name} twisted at {pivot}")
\ No newline at end of file
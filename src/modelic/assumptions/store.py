@@ -0,0 +1,154 @@
+# modelic/assumptions/store.py
+
+import hashlib
+import json
+from pathlib import Path
+import numpy as np
+
+from modelic.core.curves import YieldCurve
+from modelic.core.mortality import MortalityTable
+
+MANIFEST = "manifest.json"
+
+
+class AssumptionKind:
+    MORTALITY = 'mortality'
+    YIELD_CURVE = 'yield_curve'
+    EXPENSE_SPEC = 'expense_spec'
+
+
+# --- Compiling assumptions into a store ---
+
+def save_mortality_table(store_dir, table: MortalityTable) -> str:
+    return _save(store_dir, AssumptionKind.MORTALITY, table.name, {'ages': table.ages, 'qx': table.qx})
+
+def save_yield_curve(store_dir, curve: YieldCurve) -> str:
+    return _save(store_dir, AssumptionKind.YIELD_CURVE, curve.name,
+                 {'times': curve.times, 'zero_rates': curve.zero_rates})
+
+def save_expense_spec(store_dir, name: str, expense_spec) -> str:
+    columns = {}
+    for col in expense_spec.columns:
+        values = expense_spec[col].to_numpy()
+        columns[col] = values.astype(str) if values.dtype.kind in 'OTU' else values
+    return _save(store_dir, AssumptionKind.EXPENSE_SPEC, name, columns)
+
+def _save(store_dir, kind: str, name: str, columns: dict) -> str:
+
+    store_dir = Path(store_dir)
+    entry_dir = store_dir / kind / name
+    entry_dir.mkdir(parents=True, exist_ok=True)
+
+    columns = {col: np.ascontiguousarray(values) for col, values in columns.items()}
+    for col, values in columns.items():
+        np.save(entry_dir / f"{col}.npy", values, allow_pickle=False)
+
+    content_hash = _content_hash(columns)
+    manifest = _read_manifest(store_dir)
+    manifest.setdefault(kind, {})[name] = {'columns': list(columns), 'sha256': content_hash}
+    (store_dir / MANIFEST).write_text(json.dumps(manifest, indent=2))
+
+    return content_hash
+
+def _content_hash(columns: dict) -> str:
+    digest = hashlib.sha256()
+    for col, values in columns.items():
+        digest.update(f"{col}:{values.dtype.str}:{values.shape}".encode())
+        digest.update(memoryview(np.ascontiguousarray(values)).cast('B'))
+    return digest.hexdigest()
+
+def _read_manifest(store_dir: Path) -> dict:
+    path = store_dir / MANIFEST
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+# --- Loading ---
+
+class AssumptionRegistry:
+    """ Memory-maps compiled assumptions and hands out one shared instance of each per process """
+
+    def __init__(self, store_dir, *, verify: bool = False):
+        self.store_dir = Path(store_dir).resolve()
+        self.verify = verify
+        self.manifest = _read_manifest(self.store_dir)
+        self._loaded = {}
+        self._failed = set()
+
+    def mortality_table(self, name: str) -> MortalityTable:
+        return self._get(AssumptionKind.MORTALITY, name, lambda c: MortalityTable(c['ages'], c['qx'], name))
+
+    def yield_curve(self, name: str) -> YieldCurve:
+        return self._get(AssumptionKind.YIELD_CURVE, name, lambda c: YieldCurve(c['times'], c['zero_rates'], name))
+
+    def expense_spec(self, name: str):
+        import pandas as pd
+        return self._get(AssumptionKind.EXPENSE_SPEC, name, pd.DataFrame)
+
+    def names(self, kind: str) -> list[str]:
+        return sorted(self.manifest.get(kind, {}))
+
+    def content_hash(self, kind: str, name: str) -> str:
+        return self._entry(kind, name)['sha256']
+
+    def refresh(self) -> None:
+        """Re-read the manifest, dropping any instance whose compiled content has changed"""
+        self.manifest = _read_manifest(self.store_dir)
+        self._loaded = {key: obj for key, obj in self._loaded.items()
+                        if self.manifest.get(key[0], {}).get(key[1], {}).get('sha256') == key[2]}
+
+    def _get(self, kind: str, name: str, build):
+
+        entry = self._entry(kind, name)
+        key = (kind, name, entry['sha256'])
+
+        if key not in self._loaded:
+            columns = self._columns(kind, name, entry)
+            if self.verify or key in self._failed:
+                self._check(key, columns)
+            self._loaded[key] = build(columns)
+
+        return self._loaded[key]
+
+    def verify_loaded(self) -> None:
+        """Check every instance already handed out against its manifest hash, then verify all later loads. Instances
+        that fail are dropped, and refused until their compiled content matches again."""
+        failures = []
+        for key in [*self._loaded, *self._failed]:
+            try:
+                self._check(key, self._columns(*key[:2], self._entry(*key[:2])))
+            except ValueError as error:
+                failures.append(str(error))
+        if failures:
+            raise ValueError("; ".join(failures))
+        self.verify = True
+
+    def _columns(self, kind: str, name: str, entry: dict) -> dict:
+        entry_dir = self.store_dir / kind / name
+        return {col: np.load(entry_dir / f"{col}.npy", mmap_mode='r', allow_pickle=False) for col in entry['columns']}
+
+    def _check(self, key: tuple, columns: dict) -> None:
+        kind, name, sha256 = key
+        if _content_hash(columns) != sha256:
+            self._loaded.pop(key, None)
+            self._failed.add(key)
+            raise ValueError(f"Compiled {kind} '{name}' does not match its manifest hash")
+        self._failed.discard(key)
+
+    def _entry(self, kind: str, name: str) -> dict:
+        try:
+            return self.manifest[kind][name]
+        except KeyError:
+            raise KeyError(f"No compiled {kind} named '{name}' in {self.store_dir}") from None
+
+
+_REGISTRIES = {}
+
+def get_registry(store_dir, *, verify: bool = False) -> AssumptionRegistry:
+    """Process-wide registry for store_dir, so every caller shares the same memory-mapped instances. Asking for verify
+    on a registry created without it verifies whatever that registry has already loaded, and everything after."""
+    key = Path(store_dir).resolve()
+    if key not in _REGISTRIES:
+        _REGISTRIES[key] = AssumptionRegistry(key, verify=verify)
+    elif verify and not _REGISTRIES[key].verify:
+        _REGISTRIES[key].verify_loaded()
+    return _REGISTRIES[key]
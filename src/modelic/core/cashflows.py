@@ -1,16 +1,30 @@
 # modelic/core/cashflows.py
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 import numpy as np
 import pandas as pd
 
-from modelic.core.compounding import zero_to_df
 from modelic.core.custom_types import ArrayLike, IntArrayLike
-from modelic.core.curves import YieldCurve
+from modelic.core.curves import IndexCurve, YieldCurve, YieldCurveSet
+from modelic.core.discount_cache import DISCOUNT_CACHE, DiscountFactorCache
+from modelic.core.ragged_cashflows import RaggedCashflows
+from modelic.core.sensitivities import DEFAULT_KEY_RATE_TIMES, RateSensitivities, key_rate_weights, rate_sensitivities
 
 class BaseCashflowModel(ABC):
     """Abstract base class for any models producing or valuing time-indexed cashflows."""
 
+    df_cache: DiscountFactorCache = DISCOUNT_CACHE
+
+    # Dense (times x policies) float64 arrays alive at once while valuing, used to size policy blocks for max_memory
+    _working_matrices = 3
+
+    # Value unit-benefit factors once per unique model point and scale them by each policy's amounts
+    deduplicate = False
+
+    # A CommutationTable to read per-policy factors from instead of projecting cashflows
+    commutation = None
+
     def __init__(self, times: IntArrayLike, curve: YieldCurve):
         self.times = times
         self.curve = curve
@@ -19,24 +33,249 @@ class BaseCashflowModel(ABC):
     def project_cashflows(self):
         pass
 
-    def discount_factors(self, spread: ArrayLike = 0) -> np.ndarray:
-        zeros = self.curve.zero(self.times)[:, None] + np.atleast_2d(spread)
-        return zero_to_df(self.times, zeros)
+    def _step_rows(self, first: int, last: int) -> slice:
+        # Projection steps are sorted, so the steps falling in [first, last] form a contiguous block of rows
+        return slice(int(np.searchsorted(self.times, first, 'left')), int(np.searchsorted(self.times, last, 'right')))
+
+    def _project_steps(self, steps: slice) -> np.ndarray:
+        # Cashflows for a block of projection steps. Models that can project part of the time grid on its own
+        # override this so that present_value(time_chunk=...) never holds the full (times x policies) matrix.
+        return self.project_cashflows(aggregate=False)[..., steps, :]
+
+    def _project_ragged(self) -> RaggedCashflows:
+        # Cashflows stored per policy up to its own term. Models override this to support present_value(ragged=True).
+        raise NotImplementedError(f"{type(self).__name__} cannot project ragged cashflows")
+
+    def _model_points(self) -> tuple:
+        # (inverse, [(unit-benefit model over the unique model points, per-policy amount), ...]) for deduplicate=True
+        raise NotImplementedError(f"{type(self).__name__} cannot be valued by model point")
+
+    @staticmethod
+    def _unique_model_points(age: np.ndarray, term: np.ndarray) -> tuple:
+        # Whole-year ages and terms are packed into one integer key, as a 1-d unique is far faster than axis=0
+        if age.dtype.kind in 'iu':
+            age_base, term_base = age.min(), term.min()
+            width = int(term.max() - term_base) + 1
+            keys, inverse = np.unique((age - age_base) * width + (term - term_base), return_inverse=True)
+            return keys // width + age_base, keys % width + term_base, inverse.reshape(-1)
+
+        keys, inverse = np.unique(np.column_stack((age, term)), axis=0, return_inverse=True)
+        return keys[:, 0], keys[:, 1].astype(int), inverse.reshape(-1)
+
+    def _deduplicated_present_value(self, spread: ArrayLike, **options) -> np.ndarray:
+
+        # PVs are linear in the benefit amounts, so each unit-benefit model is valued once per unique model point and
+        # its factors are scattered back to the policies sharing that point
+        inverse, units = self._model_points()
+        pv = np.zeros(self._shock_shape + inverse.shape)
+        for model, amount in units:
+            pv += model.present_value(spread, aggregate=False, **options)[..., inverse] * amount
+        return pv
+
+    def _commutation_present_value(self) -> np.ndarray:
+        raise NotImplementedError(f"{type(self).__name__} cannot be valued from commutation columns")
+
+    def _check_commutation_basis(self, escalation: float | IndexCurve, annual: bool, qx_multipliers: ArrayLike) -> None:
+        if self.commutation is None:
+            return
+        if not annual or qx_multipliers is not None:
+            raise ValueError("Commutation factors are only available for whole ages on an annual grid, without qx "
+                             "multipliers")
+        if isinstance(escalation, IndexCurve):
+            raise ValueError("Commutation factors escalate at a fixed rate, so cannot follow an index curve")
+        if not np.isclose(escalation, self.commutation.escalation):
+            raise ValueError(f"Escalation {escalation} does not match the commutation table's "
+                             f"{self.commutation.escalation}")
+
+    def _escalation_factors(self, t: np.ndarray) -> np.ndarray:
+        # Growth of escalating amounts to each time: a fixed annual rate, or the index curve's uplift from time 0.
+        # Called on the (times x 1) projection grid, so index ratios are looked up once and broadcast across policies.
+        if isinstance(self.escalation, IndexCurve):
+            return self.escalation.uplift(t)
+        return (1 + self.escalation) ** t
+
+    def _survival_basis(self) -> tuple:
+        # Models valued from a survival path return what determines it (mortality, ages, terms, qx multipliers), so
+        # that a CompositeProduct can build one path for all of its components. None opts out of fused valuation.
+        return None
+
+    def _fused_present_value(self, survival: np.ndarray, df: np.ndarray) -> np.ndarray:
+        raise NotImplementedError(f"{type(self).__name__} does not support fused valuation")
+
+    @staticmethod
+    def _discounted_sum(path: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        # One multiply-sum over the time axis of a (..., times, policies) path; weights are (times, 1 or policies)
+        if weights.shape[-1] == 1:
+            return np.einsum('...tp,t->...p', path, weights[:, 0])
+        return np.einsum('...tp,tp->...p', path, weights)
+
+    @staticmethod
+    def _weights_at(weights: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        return np.broadcast_to(weights, (weights.shape[0], rows.size))[rows, np.arange(rows.size)]
+
+    @property
+    def policy_count(self) -> int:
+        # Models that can be split into blocks of policies override this together with _policy_block
+        return None
+
+    def _policy_block(self, policies: slice) -> "BaseCashflowModel":
+        raise NotImplementedError(f"{type(self).__name__} cannot be valued in blocks of policies")
+
+    @property
+    def _shock_shape(self) -> tuple:
+        return ()
+
+    @property
+    def _bytes_per_policy(self) -> int:
+        shocks = int(np.prod(self._shock_shape))
+        return self.times.size * np.dtype(np.float64).itemsize * self._working_matrices * shocks
+
+    @staticmethod
+    def _policy_values(values, policies: slice):
+        # Per-policy inputs are sliced to the block; scalars and None apply to every policy
+        return values if values is None or np.ndim(values) == 0 else values[policies]
+
+    def _policy_chunk_size(self, policy_chunk: int, max_memory: int) -> int:
+
+        if policy_chunk is None and max_memory is None:
+            return None
+        if self.policy_count is None:
+            raise NotImplementedError(f"{type(self).__name__} cannot be valued in blocks of policies")
+
+        if max_memory is not None:
+            by_memory = max(1, int(max_memory // self._bytes_per_policy))
+            policy_chunk = by_memory if policy_chunk is None else min(policy_chunk, by_memory)
+
+        return policy_chunk if policy_chunk < self.policy_count else None
+
+    def _chunked_present_value(self, spread: ArrayLike, policy_chunk: int, time_chunk: int, **options) -> np.ndarray:
+
+        # Value fixed-size blocks of policies and stream their per-policy PVs into one preallocated result
+        spread = np.asarray(spread, dtype=float)
+        per_policy_spread = spread.size == self.policy_count and self.policy_count > 1
+
+        pv = None
+        for start in range(0, self.policy_count, policy_chunk):
+            policies = slice(start, start + policy_chunk)
+            block = self._policy_block(policies)
+            if per_policy_spread:
+                # A block's spreads are its own, so its factors go in a cache of its own, dropped with the block
+                block._use_df_cache(DiscountFactorCache())
+            block_spread = spread.reshape(-1)[policies] if per_policy_spread else spread
+            block_pv = block.present_value(block_spread, aggregate=False, time_chunk=time_chunk, **options)
+            if pv is None:
+                pv = np.empty(np.shape(block_pv)[:-1] + (self.policy_count,))
+            pv[..., policies] = block_pv
+
+        return pv
 
-    def present_value(self, spread: ArrayLike = None, aggregate: bool = True):
+    def _use_df_cache(self, cache: DiscountFactorCache) -> None:
+        self.df_cache = cache
+
+    def discount_factors(self, spread: ArrayLike = 0, steps: slice = slice(None), *,
+                         ragged: RaggedCashflows = None) -> np.ndarray:
+        """(times x spread columns) discount factors, or one per stored cashflow of ragged (over the full time grid)"""
+        df = self.df_cache.discount_factors(self.curve, self.times[steps], spread)
+        return df if ragged is None else ragged.gather(df)
+
+    def _rate_sensitivities(self, spread: ArrayLike, time_chunk: int, key_rate_times: ArrayLike) -> RateSensitivities:
+        # PV and its rate derivatives from the same projected cashflows and discount factors, one block of steps at a time
+        key_rate_times = DEFAULT_KEY_RATE_TIMES if key_rate_times is None else np.asarray(key_rate_times)
+        key_weights = key_rate_weights(self.times, key_rate_times)
+        step = time_chunk or max(self.times.size, 1)
+
+        result = 0
+        for start in range(0, self.times.size, step):
+            steps = slice(start, start + step)
+            times = self.times[steps]
+            zeros = self.curve.zero(times)[:, None] + np.atleast_2d(spread)
+            result = result + rate_sensitivities(self._project_steps(steps), times, zeros,
+                                                 self.discount_factors(spread, steps), key_weights[:, steps],
+                                                 key_rate_times)
+        return result
+
+    def present_value(self, spread: ArrayLike = None, aggregate: bool = True, *, time_chunk: int = None,
+                      policy_chunk: int = None, max_memory: int = None, ragged: bool = False,
+                      sensitivities: bool = False, key_rate_times: ArrayLike = None):
+        """time_chunk values blocks of projection steps; policy_chunk values blocks of policies, capped so each block's
+        working arrays stay under max_memory bytes (approximately) when that is given. ragged only stores each policy's
+        cashflows up to its own term. sensitivities returns RateSensitivities (PV, PV01, duration, convexity and deltas
+        to key_rate_times) from the same pass instead of the PV alone."""
 
         if spread is None:
             spread = 0
 
-        cf = self.project_cashflows(aggregate=False)
-        df = self.discount_factors(spread)
-        pv = (df * cf).sum(axis=0)
+        if sensitivities:
+            if self.commutation is not None or ragged or self._policy_chunk_size(policy_chunk, max_memory) is not None:
+                raise ValueError("Sensitivities are taken from the dense projection, so cannot use commutation factors, "
+                                 "ragged storage or policy blocks")
+            result = self._rate_sensitivities(spread, time_chunk, key_rate_times)
+            return result.total() if aggregate else result
+
+        # A spread per policy would give every policy its own factors, so model points only apply to a common spread
+        by_model_point = self.deduplicate and np.size(spread) == 1
+        chunk_size = None if by_model_point else self._policy_chunk_size(policy_chunk, max_memory)
+
+        if self.commutation is not None:
+            if np.any(np.asarray(spread) != 0):
+                raise ValueError("Commutation factors are on the table's own basis, so cannot take a spread")
+            pv = self._commutation_present_value()
+        elif by_model_point:
+            pv = self._deduplicated_present_value(spread, time_chunk=time_chunk, policy_chunk=policy_chunk,
+                                                  max_memory=max_memory, ragged=ragged)
+        elif chunk_size is not None:
+            pv = self._chunked_present_value(spread, chunk_size, time_chunk, ragged=ragged)
+        elif ragged:
+            cf = self._project_ragged()
+            pv = cf.with_values(cf.values * self.discount_factors(spread, ragged=cf)).sum(axis='times')
+        elif time_chunk is None:
+            cf = self.project_cashflows(aggregate=False)
+            df = self.discount_factors(spread)
+            pv = (df * cf).sum(axis=-2)
+        else:
+            pv = 0
+            for start in range(0, self.times.size, time_chunk):
+                steps = slice(start, start + time_chunk)
+                pv = pv + (self.discount_factors(spread, steps) * self._project_steps(steps)).sum(axis=-2)
 
         if type(pv) is pd.Series:
             return float(pv.sum()) if aggregate else pv.unstack(fill_value=0)
+        elif pv.ndim > 1:
+            # Leading axes (e.g. one row per mortality shock) are kept when aggregating over policies
+            return pv.sum(axis=-1) if aggregate else pv
         else:
             return float(pv.sum()) if aggregate else pv
 
+    @classmethod
+    def present_value_batches(cls, batches: Iterable, *args, aggregate: bool = True, valuation: dict = None,
+                              **kwargs) -> ArrayLike:
+        """Value policy batches (e.g. from PolicyPortfolio.iter_batches) one at a time, each through
+        cls.from_policy_portfolio(batch, *args, **kwargs), so only one batch is ever projected. valuation holds
+        present_value options. Per-policy PVs come back in file order."""
+        pvs = [cls.from_policy_portfolio(batch, *args, **kwargs).present_value(aggregate=aggregate, **(valuation or {}))
+               for batch in batches]
+        return sum(pvs) if aggregate else np.concatenate(pvs, axis=-1)
+
+    def present_value_scenarios(self, curves: YieldCurveSet, aggregate: bool = True, *, spread: float = 0.0,
+                                scenario_chunk: int = None) -> np.ndarray:
+        """PVs under each of the S curves in curves: (S,) when aggregating, else (S x policies), after any leading shock
+        axes. Cashflows are projected once and discounted against scenario_chunk curves at a time by one matrix
+        product, so at most (scenario_chunk x times) discount factors are held."""
+
+        cf = self.project_cashflows(aggregate=False)
+        if aggregate:
+            cf = cf.sum(axis=-1, keepdims=True)
+
+        if scenario_chunk is None:
+            scenario_chunk = curves.scenario_count
+
+        pv = np.empty(cf.shape[:-2] + (curves.scenario_count, cf.shape[-1]))
+        for start in range(0, curves.scenario_count, scenario_chunk):
+            scenarios = slice(start, start + scenario_chunk)
+            pv[..., scenarios, :] = curves.discount_factors(self.times, scenarios, spread) @ cf
+
+        return pv[..., 0] if aggregate else pv
+
 
 class CompositeProduct(BaseCashflowModel):
     """Aggregates multiple BaseCashflowModel components into one"""
@@ -55,8 +294,78 @@ class CompositeProduct(BaseCashflowModel):
         cfs = sum([c.project_cashflows(aggregate) for c in self.components])
         return cfs
 
-    def present_value(self, spread: ArrayLike = None, aggregate: bool = True):
+    @property
+    def policy_count(self) -> int:
+        counts = {c.policy_count for c in self.components}
+        return counts.pop() if len(counts) == 1 else None
+
+    def _policy_block(self, policies: slice) -> "CompositeProduct":
+        return CompositeProduct([c._policy_block(policies) for c in self.components], self.curve)
+
+    def _use_df_cache(self, cache: DiscountFactorCache) -> None:
+        super()._use_df_cache(cache)
+        for c in self.components:
+            c._use_df_cache(cache)
+
+    @property
+    def _bytes_per_policy(self) -> int:
+        return sum(c._bytes_per_policy for c in self.components)
+
+    def present_value(self, spread: ArrayLike = None, aggregate: bool = True, *, time_chunk: int = None,
+                      fused: bool = None, policy_chunk: int = None, max_memory: int = None, ragged: bool = False,
+                      sensitivities: bool = False, key_rate_times: ArrayLike = None):
+        """fused=None values components in one pass over a shared survival path whenever they allow it"""
+
+        if sensitivities:
+            # Derivatives add across components like PVs do, and duration and convexity follow from the totals
+            result = sum(c.present_value(spread, False, time_chunk=time_chunk, policy_chunk=policy_chunk,
+                                         max_memory=max_memory, ragged=ragged, sensitivities=True,
+                                         key_rate_times=key_rate_times) for c in self.components)
+            return result.total() if aggregate else result
+
+        policy_chunk = self._policy_chunk_size(policy_chunk, max_memory)
+        by_model_point = any(c.deduplicate or c.commutation is not None for c in self.components)
+        basis = (self._shared_survival_basis() if time_chunk is None and not ragged and not by_model_point
+                 and fused is not False else None)
+        if fused and basis is None:
+            raise ValueError("Components do not share a survival basis, so cannot be valued in one pass")
+
+        if policy_chunk is not None:
+            pvs = self._chunked_present_value(0 if spread is None else spread, policy_chunk, time_chunk, fused=fused,
+                                              ragged=ragged)
+            pvs = pvs.sum(axis=-1) if aggregate else pvs
+        elif basis is None:
+            pvs = sum(c.present_value(spread, aggregate, time_chunk=time_chunk, ragged=ragged) for c in self.components)
+        else:
+            pvs = self._fused_present_value_all(basis, 0 if spread is None else spread)
+            pvs = pvs.sum(axis=-1) if aggregate else pvs
+
+        return float(pvs) if aggregate and np.ndim(pvs) == 0 else pvs
+
+    def present_value_scenarios(self, curves: YieldCurveSet, aggregate: bool = True, *, spread: float = 0.0,
+                                scenario_chunk: int = None) -> np.ndarray:
+        return sum(c.present_value_scenarios(curves, aggregate, spread=spread, scenario_chunk=scenario_chunk)
+                   for c in self.components)
+
+    def _fused_present_value_all(self, basis: tuple, spread: ArrayLike) -> np.ndarray:
+
+        mortality, age, term, qx_multipliers = basis
+        survival = mortality.npx(age, term, full_path=True, incl_t0=True, qx_multipliers=qx_multipliers)
+
+        return sum(c._fused_present_value(survival, c.discount_factors(spread)) for c in self.components)
+
+    def _shared_survival_basis(self) -> tuple:
+
+        bases = [c._survival_basis() for c in self.components]
+        if any(b is None for b in bases):
+            return None
 
-        pvs = sum(c.present_value(spread, aggregate) for c in self.components)
+        mortality, age, term, qx_multipliers = bases[0]
+        for other_mortality, other_age, other_term, other_multipliers in bases[1:]:
+            if (other_mortality is not mortality or not np.array_equal(other_age, age)
+                    or not np.array_equal(other_term, term)
+                    or (other_multipliers is None) != (qx_multipliers is None)
+                    or (qx_multipliers is not None and not np.array_equal(other_multipliers, qx_multipliers))):
+                return None
 
-        return float(sum(pvs)) if aggregate and (type(pvs) is not float) else pvs
+        return bases[0]
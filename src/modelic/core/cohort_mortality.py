@@ -0,0 +1,119 @@
+# modelic/core/cohort_mortality.py
+
+from dataclasses import dataclass
+from functools import cached_property
+import numpy as np
+
+from modelic.core.mortality import BaseMortalityTable
+from modelic.core.custom_types import IntArrayLike
+
+
+@dataclass(frozen=True)
+class MortalityTable2D(BaseMortalityTable):
+    """ Age x calendar year mortality. Lookups follow each policyholder's birth-year diagonal through the table """
+
+    ages: np.ndarray
+    years: np.ndarray
+    qx: np.ndarray
+    name: str
+    base_year: int = None
+
+
+    def __post_init__(self):
+        self._validate_inputs(self.qx, self.ages, self.years)
+        if self.base_year is None:
+            object.__setattr__(self, 'base_year', int(self.years[0]))
+
+
+    @cached_property
+    def cohort_years(self) -> np.ndarray:
+        # Earlier (later) birth years only ever see the first (last) calendar year, so share that cohort's rates
+        return np.arange(self.years[0] - self.max_age, self.years[-1] - self.min_age + 1)
+
+    @cached_property
+    def cohort_qx(self) -> np.ndarray:
+        year_idx = self.cohort_years[:, None] + self.ages[None, :] - self.years[0]
+        year_idx = year_idx.clip(0, self.years.size - 1)
+        return self.qx[np.arange(self.ages.size)[None, :], year_idx]
+
+    @property
+    def lx(self) -> np.ndarray:
+        return self.cohort_lx
+
+    def _cohort_idx(self, age: np.ndarray, cohort: IntArrayLike) -> np.ndarray:
+        # cohort is the year of birth; by default a policyholder is age at base_year
+        birth_year = self.base_year - age if cohort is None else np.asarray(cohort, dtype=int)
+        return (birth_year - self.cohort_years[0]).clip(0, self.cohort_years.size - 1)
+
+    @staticmethod
+    def _validate_inputs(qx: np.ndarray, ages: np.ndarray, years: np.ndarray) -> None:
+
+        if qx.ndim != 2:
+            raise ValueError("qx must be 2-dimensional")
+        if ages.ndim != 1 or years.ndim != 1:
+            raise ValueError("ages and years must be 1-dimensional")
+        if qx.shape != (ages.size, years.size):
+            raise ValueError("qx must have shape (len(ages), len(years))")
+        if (qx[-1] != 1).any():
+            raise ValueError("terminal qx value must be 1 in every year")
+        if (qx < 0).any() or (qx > 1).any():
+            raise ValueError("qx must be between 0 and 1")
+        if not np.all(np.diff(ages) == 1):
+            raise ValueError("ages must be consecutive with step 1")
+        if not np.all(np.diff(years) == 1):
+            raise ValueError("years must be consecutive with step 1")
+
+
+@dataclass(frozen=True)
+class SelectMortalityTable(BaseMortalityTable):
+    """ Select-and-ultimate mortality. Lookups follow the select rates for each policyholder's age at selection """
+
+    ages: np.ndarray
+    qx: np.ndarray
+    select_qx: np.ndarray
+    name: str
+
+
+    def __post_init__(self):
+        self._validate_inputs(self.qx, self.select_qx, self.ages)
+
+
+    @property
+    def select_period(self) -> int:
+        return self.select_qx.shape[1]
+
+    @cached_property
+    def cohort_qx(self) -> np.ndarray:
+        # Row r holds the rates for a life selected at ages[r]: select_qx[r, d] for durations d inside the select
+        # period, then the ultimate rates. The terminal age always takes the ultimate rate of 1.
+        duration = np.arange(self.ages.size)[None, :] - np.arange(self.ages.size)[:, None]
+        in_select = (duration >= 0) & (duration < self.select_period)
+        select = np.take_along_axis(self.select_qx, duration.clip(0, self.select_period - 1), axis=1)
+        cohort_qx = np.where(in_select, select, self.qx[None, :])
+        cohort_qx[:, -1] = self.qx[-1]
+        return cohort_qx
+
+    @property
+    def lx(self) -> np.ndarray:
+        return self.cohort_lx
+
+    def _cohort_idx(self, age: np.ndarray, cohort: IntArrayLike) -> np.ndarray:
+        # cohort is the age at selection; by default a policyholder is newly selected
+        selection_age = age if cohort is None else np.asarray(cohort, dtype=int)
+        return self._resolve_idx(selection_age)
+
+    @staticmethod
+    def _validate_inputs(qx: np.ndarray, select_qx: np.ndarray, ages: np.ndarray) -> None:
+
+        if qx.ndim != 1 or ages.ndim != 1:
+            raise ValueError("qx and ages must be 1-dimensional")
+        if select_qx.ndim != 2:
+            raise ValueError("select_qx must be 2-dimensional")
+        if len(ages) != len(qx) or len(ages) != len(select_qx):
+            raise ValueError("ages, qx and select_qx must have same length")
+        if qx[-1] != 1:
+            raise ValueError("terminal qx value must be 1")
+        if (qx < 0).any() or (qx > 1).any() or (select_qx < 0).any() or (select_qx > 1).any():
+            raise ValueError("qx and select_qx must be between 0 and 1")
+        if not np.all(np.diff(ages) == 1):
+            raise ValueError("ages must be consecutive with step 1")
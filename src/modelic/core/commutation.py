@@ -0,0 +1,130 @@
+# modelic/core/commutation.py
+
+from dataclasses import dataclass
+from functools import cached_property
+import numpy as np
+
+from modelic.core.curves import YieldCurve
+from modelic.core.mortality import MortalityTable
+from modelic.core.custom_types import ArrayLike, IntArrayLike
+
+
+@dataclass(frozen=True)
+class CommutationTable:
+    """ Assurance and annuity factors for arbitrary (age, term) read from precomputed commutation columns.
+
+    discount[t] is the value at time 0 of 1 (escalated) paid at time t, for t = 0 .. number of ages. A flat rate gives
+    the classic Dx, Nx, Cx, Mx columns; a yield curve gives the same sums laid out by age and duration. As elsewhere,
+    benefits are paid at the end of the year, and a nan term means whole of life. """
+
+    mortality: MortalityTable
+    discount: np.ndarray
+    name: str
+    escalation: float = 0.0
+    rate: float = None
+
+
+    @classmethod
+    def from_rate(cls, mortality: MortalityTable, rate: float, *, escalation: float = 0.0) -> "CommutationTable":
+        v = (1 + escalation) / (1 + rate)
+        discount = v ** np.arange(mortality.ages.size + 1)
+        return cls(mortality, discount, f"{mortality.name} @ {rate:.2%}", escalation, rate)
+
+    @classmethod
+    def from_curve(cls, mortality: MortalityTable, curve: YieldCurve, *, escalation: float = 0.0) -> "CommutationTable":
+        # Durations past the end of the curve are discounted at its last zero rate
+        t = np.arange(mortality.ages.size + 1)
+        zeros = curve.zero(np.clip(t, curve.min_time, curve.max_time))
+        discount = ((1 + escalation) / (1 + zeros)) ** t
+        return cls(mortality, discount, f"{mortality.name} @ {curve.name}", escalation)
+
+
+    # --- Flat-rate commutation columns (indexed by age - min_age, with a terminal zero) ---
+
+    @cached_property
+    def Dx(self) -> np.ndarray:
+        self._require_flat_rate()
+        return self.discount * self.mortality.lx
+
+    @cached_property
+    def Nx(self) -> np.ndarray:
+        return self.Dx[::-1].cumsum()[::-1]
+
+    @cached_property
+    def Cx(self) -> np.ndarray:
+        self._require_flat_rate()
+        return np.append(self.discount[1:], 0.0) * self.mortality.dx
+
+    @cached_property
+    def Mx(self) -> np.ndarray:
+        return self.Cx[::-1].cumsum()[::-1]
+
+
+    # --- Age x duration form: row x, column n sums durations 1..n for a life aged min_age + x ---
+
+    @cached_property
+    def survival_by_duration(self) -> np.ndarray:
+        lx = self.mortality.lx
+        return self.mortality.lx_windows(self.discount.size)[:-1] / lx[:-1, None]
+
+    @cached_property
+    def annuity_by_duration(self) -> np.ndarray:
+        return self._cumulative(self.survival_by_duration[:, 1:] * self.discount[1:])
+
+    @cached_property
+    def assurance_by_duration(self) -> np.ndarray:
+        deaths = self.mortality.dx_windows(self.discount.size - 1)[:-1] / self.mortality.lx[:-1, None]
+        return self._cumulative(deaths * self.discount[1:])
+
+
+    # --- Factors ---
+
+    def pure_endowment(self, age: IntArrayLike, term: ArrayLike) -> np.ndarray:
+        """nEx: value of 1 paid at the end of the term on survival"""
+        x, n = self._resolve(age, term)
+        if self.rate is not None:
+            return self.Dx[self._clip(x + n)] / self.Dx[x]
+        return self.survival_by_duration[x, n] * self.discount[n]
+
+    def annuity(self, age: IntArrayLike, term: ArrayLike) -> np.ndarray:
+        """Temporary annuity-immediate: 1 paid at the end of each year survived, up to the term"""
+        x, n = self._resolve(age, term)
+        if self.rate is not None:
+            return (self.Nx[self._clip(x + 1)] - self.Nx[self._clip(x + n + 1)]) / self.Dx[x]
+        return self.annuity_by_duration[x, n]
+
+    def annuity_due(self, age: IntArrayLike, term: ArrayLike) -> np.ndarray:
+        """Temporary annuity-due: 1 paid at the start of each year survived, up to the term"""
+        n = self._resolve(age, term)[1]
+        return np.where(n > 0, 1 + self.annuity(age, np.maximum(n - 1, 0)), 0.0)
+
+    def assurance(self, age: IntArrayLike, term: ArrayLike) -> np.ndarray:
+        """Term assurance: 1 paid at the end of the year of death, within the term"""
+        x, n = self._resolve(age, term)
+        if self.rate is not None:
+            return (self.Mx[x] - self.Mx[self._clip(x + n)]) / self.Dx[x]
+        return self.assurance_by_duration[x, n]
+
+    def endowment_assurance(self, age: IntArrayLike, term: ArrayLike) -> np.ndarray:
+        return self.assurance(age, term) + self.pure_endowment(age, term)
+
+
+    # --- Utilities ---
+
+    def _resolve(self, age: IntArrayLike, term: ArrayLike) -> tuple:
+        term = np.asarray(term, dtype=float)
+        term = np.nan_to_num(term, nan=self.mortality.max_age - self.mortality.min_age).astype(int)
+        x = self.mortality._resolve_idx(np.asarray(age, dtype=int))
+        return np.broadcast_arrays(x, np.clip(term, 0, self.discount.size - 1))
+
+    def _clip(self, idx: np.ndarray) -> np.ndarray:
+        return np.minimum(idx, self.mortality.ages.size)
+
+    def _require_flat_rate(self) -> None:
+        if self.rate is None:
+            raise ValueError(f"{self.name} was built from a yield curve, so has no flat-rate commutation columns")
+
+    @staticmethod
+    def _cumulative(values: np.ndarray) -> np.ndarray:
+        # Running sums over durations with a leading zero column, so column n is the sum over durations 1..n
+        return np.concatenate((np.zeros((values.shape[0], 1)), values.cumsum(axis=1)), axis=1)
@@ -1,42 +1,114 @@
 # modelic/core/compounding.py
 
-# --- Conversions ---
+# Kernels over annually compounded rates. Times broadcast against rates in the usual NumPy way, so a (curves x tenors)
+# block of rates takes a (tenors,) time vector, and a (tenors x columns) block takes times[:, None]. Kernels that run
+# along the tenor axis (forwards, annuities) treat the last axis as tenors. Every kernel writes into out when given.
+
+import numpy as np
 
-def zero_to_df(years, rates):
-    return (1 + rates) ** -years.reshape(-1, 1)
+COMPOUNDING_FREQUENCIES = {'annual': 1, 'semi_annual': 2, 'quarterly': 4, 'monthly': 12, 'continuous': None}
 
-def df_to_zero():
-    pass
 
-def fwd_to_df():
-    pass
+# --- Conversions ---
 
-def zero_convert(): # 'to' and 'from' taken as string arguments to define the required conversion
-    pass
+def zero_to_df(years, rates, out=None):
+    return np.power(np.add(rates, 1.0), np.negative(years), out=out)
+
+def df_to_zero(years, dfs, out=None):
+    # years must be positive: a time 0 factor carries no rate
+    out = np.power(dfs, np.divide(-1.0, years), out=out)
+    return np.subtract(out, 1.0, out=out)
+
+def fwd_to_df(years, fwds, out=None):
+    """Discount factors at years from the one-period forwards running up to each of them (from time 0)"""
+    out = np.power(np.add(fwds, 1.0), -_periods(years), out=out)
+    return np.cumprod(out, axis=-1, out=out)
+
+def par_swap_to_df(years, par_rates, out=None):
+    """Bootstrap discount factors from par swap rates whose fixed legs pay at each of years up to their tenor.
+
+    The par condition s_n A_n + df_n = 1 makes the fixed leg annuity a linear recurrence, A_n = (A_n-1 + d_n) a_n with
+    a_n = 1 / (1 + s_n d_n), so every tenor's annuity (and factor) comes from cumulative products and sums in one pass
+    along the tenor axis, for any number of curves at once."""
+    periods = _periods(years)
+    shrink = 1 / (1 + np.multiply(par_rates, periods))
+    decay = np.cumprod(shrink, axis=-1)
+    annuity = decay * np.cumsum(periods * shrink / decay, axis=-1)
+
+    previous = np.zeros_like(annuity)
+    previous[..., 1:] = annuity[..., :-1]
+    out = np.subtract(annuity, previous, out=out)
+    return np.divide(out, periods, out=out)
+
+def par_swap_from_df(years, dfs, out=None):
+    """Par swap rates at each tenor: (1 - df_n) / A_n with A_n the fixed leg annuity up to the tenor"""
+    annuity = np.cumsum(np.multiply(_periods(years), dfs), axis=-1)
+    return np.divide(np.subtract(1.0, dfs), annuity, out=out)
+
+def zero_convert(rates, from_: str, to: str, out=None): # 'to' and 'from' taken as string arguments to define the required conversion
+    """Convert zero rates between the compounding bases in COMPOUNDING_FREQUENCIES"""
+    source, target = _frequency(from_), _frequency(to)
+    if out is None:
+        out = np.array(rates, dtype=float)
+    else:
+        np.copyto(out, rates)
+
+    # Via the continuously compounded rate
+    if source is not None:
+        np.log1p(np.divide(out, source, out=out), out=out)
+        np.multiply(out, source, out=out)
+    if target is not None:
+        np.expm1(np.divide(out, target, out=out), out=out)
+        np.multiply(out, target, out=out)
+    return out
 
 
 # --- Discounting and accumulation ---
 
-def df():   # Alias of zero_to_df()
-    pass
+df = zero_to_df   # Alias of zero_to_df()
 
-def acc():  # Accumulation factors
-    pass
+def acc(years, rates, out=None):  # Accumulation factors
+    return np.power(np.add(rates, 1.0), years, out=out)
 
 
 # --- Forwards ---
 
-def fwd_from_zeros():
-    pass
+def fwd_from_zeros(years, rates, out=None):
+    return fwd_from_df(years, zero_to_df(years, rates, out=out), out=out)
 
-def fwd_from_df():
-    pass
+def fwd_from_df(years, dfs, out=None):
+    """One-period forwards between consecutive years (the first from time 0), annually compounded"""
+    dfs = np.asarray(dfs)
+    previous = np.concatenate((np.ones(dfs.shape[:-1] + (1,)), dfs[..., :-1]), axis=-1)
+    out = np.divide(previous, dfs, out=out)
+    np.power(out, 1.0 / _periods(years), out=out)
+    return np.subtract(out, 1.0, out=out)
 
 
 # --- Annuity factors ---
 
-def annuity_immediate():
-    pass
+def annuity_immediate(years, rates, out=None):
+    """Value of 1 paid at each of years, up to and including each tenor"""
+    out = zero_to_df(years, rates, out=out)
+    return np.cumsum(out, axis=-1, out=out)
+
+def annuity_due(years, rates, out=None):
+    """Value of 1 paid at the start of each period (time 0, then each of years but the last), up to each tenor"""
+    # The annuity-immediate to the previous tenor, plus the payment at time 0
+    out = annuity_immediate(years, rates, out=out)
+    np.add(out[..., :-1], 1.0, out=out[..., 1:])
+    out[..., 0] = 1.0
+    return out
+
+
+# --- Utilities ---
+
+def _periods(years):
+    years = np.asarray(years, dtype=float)
+    return np.diff(years, axis=-1, prepend=0.0)
 
-def annuity_due():
-    pass
\ No newline at end of file
+def _frequency(basis: str):
+    try:
+        return COMPOUNDING_FREQUENCIES[basis]
+    except KeyError:
+        raise ValueError(f"Unknown compounding basis: {basis}") from None
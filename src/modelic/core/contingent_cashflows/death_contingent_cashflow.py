@@ -3,37 +3,54 @@
 import numpy as np
 
 from modelic.core.cashflows import BaseCashflowModel
-from modelic.core.curves import YieldCurve
-from modelic.core.mortality import MortalityTable
+from modelic.core.commutation import CommutationTable
+from modelic.core.curves import IndexCurve, YieldCurve
+from modelic.core.mortality import BaseMortalityTable
 from modelic.core.policy_portfolio import PolicyPortfolio
+from modelic.core.ragged_cashflows import RaggedCashflows
 from modelic.core.custom_types import ArrayLike, IntArrayLike
+from modelic.core.enums import FractionalAge
 
 
 class DeathContingentCashflow(BaseCashflowModel):
     """ Projects cashflows and calculates present values for death contingent contingent_cashflows """
 
-    def __init__(self, yield_curve: YieldCurve, mortality_table: MortalityTable, ph_age: IntArrayLike, term: IntArrayLike,
-                 death_contingent_cf: ArrayLike = 1, *, projection_steps: IntArrayLike = None, escalation: float = 0.0):
+    def __init__(self, yield_curve: YieldCurve, mortality_table: BaseMortalityTable, ph_age: IntArrayLike, term: IntArrayLike,
+                 death_contingent_cf: ArrayLike = 1, *, projection_steps: IntArrayLike = None,
+                 escalation: float | IndexCurve = 0.0,
+                 qx_multipliers: ArrayLike = None, frequency: int = 1, fractional_age: FractionalAge = FractionalAge.UDD,
+                 deduplicate: bool = False,
+                 commutation: CommutationTable = None):
 
         policy_terms = np.nan_to_num(np.asarray(term, dtype=np.float64), nan=mortality_table.max_age-mortality_table.min_age).astype(int)
-        ph_age = np.asarray(ph_age)
+        ph_age = np.asarray(ph_age, dtype=float)
 
         if projection_steps is None:
-            projection_steps = np.arange(1, policy_terms.max() + 1)
+            projection_steps = np.arange(1, policy_terms.max() * frequency + 1)
+            projection_steps = projection_steps / frequency if frequency > 1 else projection_steps
 
         super().__init__(projection_steps, yield_curve)
 
-        self.age = np.asarray(ph_age, dtype=int)
+        self.frequency = frequency
+        self.fractional_age = fractional_age
+        self.deduplicate = deduplicate
+        self.commutation = commutation
+        self._on_annual_grid = frequency == 1 and np.all(ph_age % 1 == 0)
+        self.age = ph_age.astype(int) if self._on_annual_grid else ph_age
         self.term = policy_terms
         self.amount = np.asarray(death_contingent_cf, dtype=float)
         self.mortality = mortality_table
         self.discount_curve = yield_curve
         self.escalation = escalation
+        self.qx_multipliers = None if qx_multipliers is None else np.asarray(qx_multipliers, dtype=float)
+        self._check_commutation_basis(escalation, self._on_annual_grid, qx_multipliers)
 
     @classmethod
     def from_policy_portfolio(cls, policy_data: PolicyPortfolio, yield_curve: YieldCurve,
-                              mortality_table: MortalityTable, *, projection_steps: IntArrayLike = None,
-                              policy_mask: bool = None) -> "DeathContingentCashflow":
+                              mortality_table: BaseMortalityTable, *, projection_steps: IntArrayLike = None,
+                              policy_mask: bool = None, frequency: int = 1,
+                              deduplicate: bool = False,
+                              commutation: CommutationTable = None) -> "DeathContingentCashflow":
 
         ages = policy_data.ages
         terms = policy_data.terms
@@ -46,14 +63,102 @@ class DeathContingentCashflow(BaseCashflowModel):
             death_contingent_benefits = death_contingent_benefits[policy_mask]
 
         return cls(yield_curve, mortality_table, ages, terms, death_contingent_benefits,
-                   projection_steps=projection_steps)
+                   projection_steps=projection_steps, frequency=frequency, deduplicate=deduplicate,
+                   commutation=commutation)
 
-    def project_cashflows(self, aggregate: bool = True) -> ArrayLike:
+    def project_cashflows(self, aggregate: bool = True, *, ragged: bool = False) -> ArrayLike:
 
-        cfs = np.zeros((self.times.size, self.age.size))
+        if ragged:
+            cfs = self._project_ragged()
+            return cfs.sum(axis='policies') if aggregate else cfs
 
-        death_in_year = self.mortality.nqx(self.age, self.term, full_path=True)
-        cfs[(self.times >= 1) & (self.times <= self.term.max())] = self.amount * death_in_year
-        cfs *= (1 + self.escalation) ** np.tile(self.times.reshape(-1, 1), self.age.size)
+        if not self._on_annual_grid:
+            cfs = self._project_steps(slice(None))
+            return cfs.sum(axis=-1) if aggregate else cfs
 
-        return cfs.sum(axis=1) if aggregate else cfs
\ No newline at end of file
+        cfs = np.zeros(self._shock_shape + (self.times.size, self.age.size))
+
+        death_in_year = self.mortality.nqx(self.age, self.term, full_path=True, qx_multipliers=self.qx_multipliers,
+                                           out=cfs[..., self._step_rows(1, self.term.max()), :])
+        death_in_year *= self.amount
+        cfs *= self._escalation_factors(self.times.reshape(-1, 1))
+
+        return cfs.sum(axis=-1) if aggregate else cfs
+
+    def _project_ragged(self) -> RaggedCashflows:
+
+        # Each policy's cashflows run from the first step after t = 0 up to and including its term
+        first_row = int(np.searchsorted(self.times, 0, 'right'))
+        stop_rows = np.searchsorted(self.times, self.term + 1e-9, 'right')
+        layout = RaggedCashflows.for_steps(self.times, first_row, stop_rows)
+
+        age, t = layout.expand(self.age), layout.step_times
+        if self._on_annual_grid:
+            cfs = self.mortality.nqx(age, t, qx_multipliers=self.qx_multipliers)
+        else:
+            kwargs = {'assumption': self.fractional_age, 'qx_multipliers': self.qx_multipliers}
+            cfs = self.mortality.tpx(age, t - 1 / self.frequency, **kwargs)
+            cfs -= self.mortality.tpx(age, t, **kwargs)
+
+        cfs *= layout.expand(self.amount)
+        cfs *= layout.gather(self._escalation_factors(self.times.reshape(-1, 1)))
+        return layout.with_values(cfs)
+
+    def _project_steps(self, steps: slice) -> np.ndarray:
+
+        # Deaths between consecutive (possibly sub-annual) steps from exact ages, paid at the end of the step
+        t = self.times[steps].reshape(-1, 1)
+        kwargs = {'assumption': self.fractional_age, 'qx_multipliers': self.qx_multipliers}
+        deaths = self.mortality.tpx(self.age, t - 1 / self.frequency, **kwargs)
+        deaths -= self.mortality.tpx(self.age, t, **kwargs)
+
+        cfs = np.where((t > 0) & (t <= self.term), deaths, 0.0) * self.amount
+        cfs *= self._escalation_factors(t)
+        return cfs
+
+    @property
+    def policy_count(self) -> int:
+        return self.age.size
+
+    def _policy_block(self, policies: slice) -> "DeathContingentCashflow":
+        term = self.term[policies]
+        return DeathContingentCashflow(self.discount_curve, self.mortality, self.age[policies], term,
+                                       self._policy_values(self.amount, policies),
+                                       projection_steps=self.times[self.times <= term.max()],
+                                       escalation=self.escalation, qx_multipliers=self.qx_multipliers,
+                                       frequency=self.frequency, fractional_age=self.fractional_age)
+
+    def _model_points(self) -> tuple:
+
+        ages, terms, inverse = self._unique_model_points(self.age, self.term)
+        unit = DeathContingentCashflow(self.discount_curve, self.mortality, ages, terms, 1.0,
+                                       projection_steps=self.times, escalation=self.escalation,
+                                       qx_multipliers=self.qx_multipliers, frequency=self.frequency,
+                                       fractional_age=self.fractional_age)
+        return inverse, [(unit, self.amount)]
+
+    def _commutation_present_value(self) -> np.ndarray:
+        return self.commutation.assurance(self.age, self.term) * self.amount
+
+    def _survival_basis(self) -> tuple:
+        if not self._on_annual_grid or not np.array_equal(self.times, np.arange(1, self.term.max() + 1)):
+            return None
+        return self.mortality, self.age, self.term, self.qx_multipliers
+
+    def _fused_present_value(self, survival: np.ndarray, df: np.ndarray) -> np.ndarray:
+
+        # Deaths in year t are survival[t - 1] - survival[t]. Survival is zeroed beyond each policy's term, which
+        # leaves a spurious death of survival[term] in the year after the term that is taken back out here.
+        weights = df * self._escalation_factors(self.times.reshape(-1, 1))
+
+        pv = self._discounted_sum(survival[..., :-1, :], weights)
+        pv -= self._discounted_sum(survival[..., 1:, :], weights)
+
+        after_term = self._weights_at(weights, np.minimum(self.term, self.times.size - 1))
+        after_term = np.where(self.term < self.times.size, after_term, 0.0)
+        pv -= survival[..., self.term, np.arange(self.age.size)] * after_term
+        return pv * self.amount
+
+    @property
+    def _shock_shape(self) -> tuple:
+        return () if self.qx_multipliers is None else (self.qx_multipliers.shape[0],)
\ No newline at end of file
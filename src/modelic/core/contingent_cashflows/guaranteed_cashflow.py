@@ -49,7 +49,18 @@ class GuaranteedCashflow(BaseCashflowModel):
         return cfs.sum(axis=1) if aggregate else cfs
 
 
-    def present_value(self, spread: ArrayLike = None, aggregate: bool = True) -> ArrayLike:
+    @property
+    def policy_count(self) -> int:
+        return self.maturity.size
+
+    def _policy_block(self, policies: slice) -> "GuaranteedCashflow":
+        maturity = self.maturity[policies]
+        return GuaranteedCashflow(self.curve, self._policy_values(self.notional, policies),
+                                  self._policy_values(self.coupon_rate, policies), maturity,
+                                  self._policy_values(self.spread, policies),
+                                  projection_steps=self.times[self.times <= maturity.max()], escalation=self.escalation)
+
+    def present_value(self, spread: ArrayLike = None, aggregate: bool = True, **options) -> ArrayLike:
         if spread is None:
             spread = self.spread
-        return super().present_value(spread=spread, aggregate=aggregate)
+        return super().present_value(spread=spread, aggregate=aggregate, **options)
@@ -3,39 +3,54 @@
 import numpy as np
 
 from modelic.core.cashflows import BaseCashflowModel
-from modelic.core.curves import YieldCurve
-from modelic.core.mortality import MortalityTable
+from modelic.core.commutation import CommutationTable
+from modelic.core.curves import IndexCurve, YieldCurve
+from modelic.core.mortality import BaseMortalityTable
 from modelic.core.custom_types import ArrayLike, IntArrayLike
+from modelic.core.enums import FractionalAge
 from modelic.core.policy_portfolio import PolicyPortfolio
+from modelic.core.ragged_cashflows import RaggedCashflows
 
 
 class SurvivalContingentCashflow(BaseCashflowModel):
     """ Projects cashflows and calculates present values for death contingent contingent_cashflows """
 
-    def __init__(self, yield_curve: YieldCurve, mortality_table: MortalityTable, ph_age: IntArrayLike, term: IntArrayLike,
+    def __init__(self, yield_curve: YieldCurve, mortality_table: BaseMortalityTable, ph_age: IntArrayLike, term: IntArrayLike,
                  *, periodic_cf: ArrayLike = None, terminal_cf: ArrayLike = None, projection_steps: IntArrayLike = None,
-                 escalation: float = 0.0):
+                 escalation: float | IndexCurve = 0.0, qx_multipliers: ArrayLike = None, frequency: int = 1,
+                 fractional_age: FractionalAge = FractionalAge.UDD, deduplicate: bool = False,
+                 commutation: CommutationTable = None):
 
         term = np.nan_to_num(np.asarray(term, dtype=np.float64), nan=mortality_table.max_age-mortality_table.min_age).astype(int)
-        ph_age = np.asarray(ph_age)
+        ph_age = np.asarray(ph_age, dtype=float)
 
         if projection_steps is None:
-            projection_steps = np.arange(1, term.max() + 1)
+            projection_steps = np.arange(1, term.max() * frequency + 1)
+            projection_steps = projection_steps / frequency if frequency > 1 else projection_steps
 
         super().__init__(projection_steps, yield_curve)
 
-        self.age = np.asarray(ph_age, dtype=int)
+        self.frequency = frequency
+        self.fractional_age = fractional_age
+        self.deduplicate = deduplicate
+        self.commutation = commutation
+        self._on_annual_grid = frequency == 1 and np.all(ph_age % 1 == 0)
+        self.age = ph_age.astype(int) if self._on_annual_grid else ph_age
         self.term = term
         self.periodic_amount = None if periodic_cf is None else np.asarray(periodic_cf, dtype=float)
         self.terminal_amount = None if terminal_cf is None else np.asarray(terminal_cf, dtype=float)
         self.mortality = mortality_table
         self.discount_curve = yield_curve
         self.escalation = escalation
+        self.qx_multipliers = None if qx_multipliers is None else np.asarray(qx_multipliers, dtype=float)
+        self._check_commutation_basis(escalation, self._on_annual_grid, qx_multipliers)
 
     @classmethod
     def from_policy_portfolio(cls, policy_data: PolicyPortfolio, yield_curve: YieldCurve,
-                              mortality_table: MortalityTable, *, projection_steps: IntArrayLike = None,
-                              policy_mask: bool = None) -> "SurvivalContingentCashflow":
+                              mortality_table: BaseMortalityTable, *, projection_steps: IntArrayLike = None,
+                              policy_mask: bool = None, frequency: int = 1,
+                              deduplicate: bool = False,
+                              commutation: CommutationTable = None) -> "SurvivalContingentCashflow":
 
         ages = policy_data.ages
         terms = policy_data.terms
@@ -55,19 +70,131 @@ class SurvivalContingentCashflow(BaseCashflowModel):
                    terms,
                    periodic_cf=periodic_survival_contingent_benefits,
                    terminal_cf=terminal_survival_contingent_benefits,
-                   projection_steps=projection_steps)
+                   projection_steps=projection_steps,
+                   frequency=frequency,
+                   deduplicate=deduplicate,
+                   commutation=commutation)
 
-    def project_cashflows(self, aggregate: bool = True) -> ArrayLike:
+    def project_cashflows(self, aggregate: bool = True, *, ragged: bool = False) -> ArrayLike:
 
-        cfs = np.zeros((self.times.size, self.age.size))
+        if ragged:
+            cfs = self._project_ragged()
+            return cfs.sum(axis='policies') if aggregate else cfs
+
+        if not self._on_annual_grid:
+            cfs = self._project_steps(slice(None))
+            return cfs.sum(axis=-1) if aggregate else cfs
+
+        cfs = np.zeros(self._shock_shape + (self.times.size, self.age.size))
         if self.periodic_amount is not None:
-            survival_path = self.mortality.npx(self.age, self.term, full_path=True)
-            cfs[(self.times >= 1) & (self.times <= self.term.max())] += self.periodic_amount * survival_path
+            survival_path = self.mortality.npx(self.age, self.term, full_path=True, qx_multipliers=self.qx_multipliers,
+                                               out=cfs[..., self._step_rows(1, self.term.max()), :])
+            survival_path *= self.periodic_amount
 
         if self.terminal_amount is not None:
-            survival_to_year = self.mortality.npx(self.age, self.term, full_path=False)
-            cfs[self.term - self.times.min(), np.arange(self.age.size)] += self.terminal_amount * survival_to_year
+            survival_to_year = self.mortality.npx(self.age, self.term, full_path=False,
+                                                  qx_multipliers=self.qx_multipliers)
+            cfs[..., self.term - self.times.min(), np.arange(self.age.size)] += self.terminal_amount * survival_to_year
+
+        cfs *= self._escalation_factors(self.times.reshape(-1, 1))
+
+        return cfs.sum(axis=-1) if aggregate else cfs
+
+    def _project_ragged(self) -> RaggedCashflows:
+
+        # Each policy's cashflows run from the first step after t = 0 up to and including its term
+        first_row = int(np.searchsorted(self.times, 0, 'right'))
+        stop_rows = np.searchsorted(self.times, self.term + 1e-9, 'right')
+        layout = RaggedCashflows.for_steps(self.times, first_row, stop_rows)
+
+        age, t = layout.expand(self.age), layout.step_times
+        if self._on_annual_grid:
+            survival = self.mortality.npx(age, t, qx_multipliers=self.qx_multipliers)
+        else:
+            survival = self.mortality.tpx(age, t, assumption=self.fractional_age, qx_multipliers=self.qx_multipliers)
+
+        cfs = np.zeros(survival.shape)
+        if self.periodic_amount is not None:
+            cfs += survival * layout.expand(self.periodic_amount / self.frequency)
+        if self.terminal_amount is not None:
+            policies = np.flatnonzero(layout.lengths)
+            last = layout.offsets[policies + 1] - 1
+            amount = np.broadcast_to(self.terminal_amount, self.term.shape)[policies]
+            cfs[..., last] += survival[..., last] * np.where(np.isclose(t[last], self.term[policies]), amount, 0.0)
+
+        cfs *= layout.gather(self._escalation_factors(self.times.reshape(-1, 1)))
+        return layout.with_values(cfs)
+
+    def _project_steps(self, steps: slice) -> np.ndarray:
+
+        # Survival to each (possibly sub-annual) step from exact ages, so only this block of steps is ever held
+        t = self.times[steps].reshape(-1, 1)
+        survival = self.mortality.tpx(self.age, t, assumption=self.fractional_age, qx_multipliers=self.qx_multipliers)
+
+        cfs = np.zeros(survival.shape)
+        if self.periodic_amount is not None:
+            cfs += np.where((t > 0) & (t <= self.term), survival, 0.0) * (self.periodic_amount / self.frequency)
+        if self.terminal_amount is not None:
+            cfs += np.where(np.isclose(t, self.term), survival, 0.0) * self.terminal_amount
+
+        cfs *= self._escalation_factors(t)
+        return cfs
 
-        cfs *= (1 + self.escalation) ** np.tile(self.times.reshape(-1, 1), self.age.size)
+    @property
+    def policy_count(self) -> int:
+        return self.age.size
+
+    def _policy_block(self, policies: slice) -> "SurvivalContingentCashflow":
+        term = self.term[policies]
+        return SurvivalContingentCashflow(self.discount_curve, self.mortality, self.age[policies], term,
+                                          periodic_cf=self._policy_values(self.periodic_amount, policies),
+                                          terminal_cf=self._policy_values(self.terminal_amount, policies),
+                                          projection_steps=self.times[self.times <= term.max()],
+                                          escalation=self.escalation, qx_multipliers=self.qx_multipliers,
+                                          frequency=self.frequency, fractional_age=self.fractional_age)
+
+    def _model_points(self) -> tuple:
+
+        ages, terms, inverse = self._unique_model_points(self.age, self.term)
+        unit = dict(projection_steps=self.times, escalation=self.escalation, qx_multipliers=self.qx_multipliers,
+                    frequency=self.frequency, fractional_age=self.fractional_age)
+
+        units = []
+        if self.periodic_amount is not None:
+            units.append((SurvivalContingentCashflow(self.discount_curve, self.mortality, ages, terms, periodic_cf=1.0,
+                                                     **unit), self.periodic_amount))
+        if self.terminal_amount is not None:
+            units.append((SurvivalContingentCashflow(self.discount_curve, self.mortality, ages, terms, terminal_cf=1.0,
+                                                     **unit), self.terminal_amount))
+        return inverse, units
+
+    def _commutation_present_value(self) -> np.ndarray:
+
+        pv = np.zeros(self.age.shape)
+        if self.periodic_amount is not None:
+            pv += self.commutation.annuity(self.age, self.term) * self.periodic_amount
+        if self.terminal_amount is not None:
+            pv += self.commutation.pure_endowment(self.age, self.term) * self.terminal_amount
+        return pv
+
+    def _survival_basis(self) -> tuple:
+        if not self._on_annual_grid or not np.array_equal(self.times, np.arange(1, self.term.max() + 1)):
+            return None
+        return self.mortality, self.age, self.term, self.qx_multipliers
+
+    def _fused_present_value(self, survival: np.ndarray, df: np.ndarray) -> np.ndarray:
+
+        # survival holds tpx for t = 0..max term, already zero beyond each policy's term
+        weights = df * self._escalation_factors(self.times.reshape(-1, 1))
+
+        pv = np.zeros(survival.shape[:-2] + survival.shape[-1:])
+        if self.periodic_amount is not None:
+            pv += self._discounted_sum(survival[..., 1:, :], weights) * self.periodic_amount
+        if self.terminal_amount is not None:
+            at_term = survival[..., self.term, np.arange(self.age.size)]
+            pv += at_term * self._weights_at(weights, self.term - 1) * self.terminal_amount
+        return pv
 
-        return cfs.sum(axis=1) if aggregate else cfs
+    @property
+    def _shock_shape(self) -> tuple:
+        return () if self.qx_multipliers is None else (self.qx_multipliers.shape[0],)
@@ -1,18 +1,18 @@
 # modelic/core/curves.py
 
 from dataclasses import dataclass
+from functools import cached_property
 import numpy as np
 
-from modelic.core.compounding import zero_to_df
+from modelic.core.compounding import df_to_zero, zero_to_df
 from modelic.core.custom_types import ArrayLike
+from modelic.core.enums import Extrapolation, Interpolation
 
 
-@dataclass(frozen=True)
-class YieldCurve:
-    times: np.ndarray
-    zero_rates: np.ndarray
-    name: str
-
+class _ZeroCurve:
+    """ Queries shared by YieldCurve and YieldCurveSet: annually compounded zero rates at times along the last axis of
+    zero_rates (one curve, or one per scenario down a leading axis), interpolated and extrapolated as the curve's
+    interpolation and extrapolation settings say. """
 
     # --- Properties ---
 
@@ -24,16 +24,168 @@ class YieldCurve:
     def max_time(self):
         return self.times[-1]
 
+    @cached_property
+    def discount_vector(self) -> np.ndarray:
+        df = zero_to_df(self.times, self.zero_rates)
+        df.flags.writeable = False
+        return df
+
+    @cached_property
+    def _unit_grid(self) -> bool:
+        return self.times.dtype.kind in 'iu' and bool(np.all(np.diff(self.times) == 1))
+
     # --- Core queries ---
 
     def zero(self, t: ArrayLike) -> ArrayLike:
-        idx = self._resolve_idx(t)
-        return self.zero_rates[idx]
+        t = np.asarray(t)
+        if self._on_grid(t):
+            return self.zero_rates[..., self._resolve_idx(t)]
+        return self._zero_between(t.astype(float).ravel()).reshape(self.zero_rates.shape[:-1] + t.shape)
 
     def df(self, t: ArrayLike) -> ArrayLike:
-        df = zero_to_df(self.times, self.zero_rates)
-        idx = self._resolve_idx(t)
-        return df[idx]
+        t = np.asarray(t)
+        if self._on_grid(t):
+            return self.discount_vector[..., self._resolve_idx(t)]
+        return zero_to_df(t, self.zero(t))
+
+    def _resolve_idx(self, times: np.ndarray) -> np.ndarray:
+        return (times - self.min_time).astype(int)
+
+    def _on_grid(self, t: np.ndarray) -> bool:
+        # Whole years on a whole-year curve are looked up directly
+        return (self._unit_grid and t.dtype.kind in 'iu'
+                and (t.size == 0 or (t.min() >= self.min_time and t.max() <= self.max_time)))
+
+
+    # --- Interpolation and extrapolation ---
+
+    def _zero_between(self, t: np.ndarray) -> np.ndarray:
+
+        inside = np.clip(t, self.min_time, self.max_time)
+        if self.interpolation == Interpolation.LINEAR_ZERO:
+            zeros = _interp(inside, self.times, self.zero_rates)
+        elif self.interpolation == Interpolation.LOG_LINEAR_DF:
+            # ln df is linear between times. Before the first time, ln df linear from ln df(0) = 0 is t times the first
+            # node's ln(1 + zero), i.e. that node's zero rate held flat, which the clip to min_time already gives.
+            zeros = df_to_zero(inside, np.exp(_interp(inside, self.times, np.log(self.discount_vector))))
+        elif self.interpolation == Interpolation.MONOTONE_CONVEX:
+            zeros = self._monotone_convex_zero(inside)
+        else:
+            raise ValueError(f"Unknown interpolation: {self.interpolation}")
+
+        if self.extrapolation == Extrapolation.SMITH_WILSON:
+            beyond = t > self.max_time
+            if beyond.any():
+                zeros[..., beyond] = self._smith_wilson_zero(t[beyond])
+        elif self.extrapolation != Extrapolation.FLAT:
+            raise ValueError(f"Unknown extrapolation: {self.extrapolation}")
+        return zeros
+
+    @cached_property
+    def _monotone_convex_nodes(self) -> tuple:
+        # Hagan & West (2006): discrete forwards between times (continuously compounded, from time 0) and the
+        # instantaneous forwards at each time that the interpolated forward curve passes through
+        tau = np.append(0.0, self.times)
+        rt = self.times * np.log1p(self.zero_rates)
+        rt = np.concatenate((np.zeros(rt.shape[:-1] + (1,)), rt), axis=-1)
+        discrete = np.diff(rt, axis=-1) / np.diff(tau)
+
+        inner = ((np.diff(tau[:-1]) * discrete[..., 1:] + np.diff(tau[1:]) * discrete[..., :-1])
+                 / (tau[2:] - tau[:-2]))
+        if inner.shape[-1]:
+            first = discrete[..., :1] - 0.5 * (inner[..., :1] - discrete[..., :1])
+            last = discrete[..., -1:] - 0.5 * (inner[..., -1:] - discrete[..., -1:])
+        else:
+            first = last = discrete[..., :1]
+        return tau, rt, discrete, np.concatenate((first, inner, last), axis=-1)
+
+    def _monotone_convex_zero(self, t: np.ndarray) -> np.ndarray:
+
+        tau, rt, discrete, instantaneous = self._monotone_convex_nodes
+        i = np.clip(np.searchsorted(tau, t, 'left'), 1, tau.size - 1)
+        width = tau[i] - tau[i - 1]
+        x = (t - tau[i - 1]) / width
+        fd = discrete[..., i - 1]
+        g0, g1 = instantaneous[..., i - 1] - fd, instantaneous[..., i] - fd
+
+        # Integral over [0, x] of the forward's departure from the discrete forward, in each of the four zones
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zone_i = ((g0 < 0) & (-0.5 * g0 <= g1) & (g1 <= -2 * g0)) | ((g0 > 0) & (-0.5 * g0 >= g1) & (g1 >= -2 * g0))
+            zone_ii = ((g0 < 0) & (g1 > -2 * g0)) | ((g0 > 0) & (g1 < -2 * g0))
+            zone_iii = ((g0 > 0) & (0 > g1) & (g1 > -0.5 * g0)) | ((g0 < 0) & (0 < g1) & (g1 < -0.5 * g0))
+            flat = (g0 == 0) & (g1 == 0)
+
+            eta_ii = (g1 + 2 * g0) / (g1 - g0)
+            eta_iii = 3 * g1 / (g1 - g0)
+            eta_iv = g1 / (g1 + g0)
+            level = -g0 * g1 / (g0 + g1)
+
+            integral = np.select(
+                [flat, zone_i, zone_ii, zone_iii],
+                [0.0,
+                 g0 * (x - 2 * x ** 2 + x ** 3) + g1 * (x ** 3 - x ** 2),
+                 g0 * x + (g1 - g0) * self._rise_after(x, eta_ii),
+                 g1 * x + (g0 - g1) * self._decay_before(x, eta_iii)],
+                level * x + (g0 - level) * self._decay_before(x, eta_iv) + (g1 - level) * self._rise_after(x, eta_iv))
+
+        continuous = (rt[..., i - 1] + fd * (t - tau[i - 1]) + width * integral) / t
+        return np.expm1(continuous)
+
+    @staticmethod
+    def _decay_before(x: np.ndarray, eta: np.ndarray) -> np.ndarray:
+        # Integral over [0, x] of ((eta - s) / eta)^2 for s < eta, zero when eta is 0
+        cube = eta ** 3 - np.maximum(eta - x, 0) ** 3
+        return np.divide(cube, 3 * eta ** 2, out=np.zeros_like(cube), where=eta != 0)
+
+    @staticmethod
+    def _rise_after(x: np.ndarray, eta: np.ndarray) -> np.ndarray:
+        # Integral over [0, x] of ((s - eta) / (1 - eta))^2 for s > eta, zero when eta is 1
+        cube = np.maximum(x - eta, 0) ** 3
+        return np.divide(cube, 3 * (1 - eta) ** 2, out=np.zeros_like(cube), where=eta != 1)
+
+    @cached_property
+    def _smith_wilson_weights(self) -> np.ndarray:
+        # Solved once per curve: the fitted prices at every curve time match the curve's discount factors. One
+        # factorisation serves every scenario, which are the columns of the right-hand side.
+        omega = np.log1p(self.ufr)
+        u = self.times.astype(float)
+        return np.linalg.solve(self._wilson(u, u), (self.discount_vector - np.exp(-omega * u)).T)
+
+    def _smith_wilson_zero(self, t: np.ndarray) -> np.ndarray:
+        fitted = (self._wilson(t, self.times.astype(float)) @ self._smith_wilson_weights).T
+        return df_to_zero(t, np.exp(-np.log1p(self.ufr) * t) + fitted)
+
+    def _wilson(self, t: np.ndarray, u: np.ndarray) -> np.ndarray:
+        # Wilson kernel W(t_i, u_j)
+        omega, alpha = np.log1p(self.ufr), self.alpha
+        t, u = t[:, None], u[None, :]
+        low, high = np.minimum(t, u), np.maximum(t, u)
+        return np.exp(-omega * (t + u)) * (alpha * low - np.exp(-alpha * high) * np.sinh(alpha * low))
+
+
+@dataclass(frozen=True)
+class YieldCurve(_ZeroCurve):
+    """ Annually compounded zero rates at times. Zero rates between times are interpolated; before the first time they
+    are flat, and after the last they are flat or follow a Smith-Wilson extrapolation to the ultimate forward rate ufr
+    with convergence speed alpha. """
+    times: np.ndarray
+    zero_rates: np.ndarray
+    name: str
+    interpolation: Interpolation = Interpolation.LINEAR_ZERO
+    extrapolation: Extrapolation = Extrapolation.FLAT
+    ufr: float = 0.036
+    alpha: float = 0.1
+
+
+    # --- Properties ---
+
+    @cached_property
+    def fingerprint(self) -> tuple:
+        # Content key for caches: two curves with the same name and rates share cached results
+        return (self.name, self.times.tobytes(), self.zero_rates.dtype.str, self.zero_rates.tobytes(),
+                self.interpolation, self.extrapolation, self.ufr, self.alpha)
+
+    # --- Core queries ---
 
     def fwd(self, t: ArrayLike, p: int) -> ArrayLike:
         pass
@@ -42,13 +194,18 @@ class YieldCurve:
     # --- Transformations (return NEW YieldCurve objects) ---
 
     def with_spread(self, bp: ArrayLike) -> "YieldCurve":
-        pass
+        """Zero rates plus bp basis points: one spread, or one per time"""
+        return self.transformed(shift=np.asarray(bp, dtype=float) * 1e-4, name=f"{self.name} + spread")
 
     def shifted(self, bp: float) -> "YieldCurve":   # Alias for with_spread
-        pass
+        return self.with_spread(bp)
 
     def scaled(self, factor: float) -> "YieldCurve":
-        pass
+        return self.transformed(scale=factor, name=f"{self.name} x {factor}")
+
+    def transformed(self, *, scale: float = 1.0, shift: ArrayLike = 0.0, name: str = None) -> "YieldCurve":
+        """Lazy curve with zero rates scale * zero_rates + shift (shift a scalar or one per time)"""
+        return DerivedYieldCurve(self, scale, shift, name or self.name)
 
 
     # --- Utilities ---
@@ -63,33 +220,161 @@ class YieldCurve:
     def validate(self) -> None:
         pass
 
-    def _resolve_idx(self, times: np.ndarray) -> np.ndarray:
-        return (times - self.min_time).astype(int)
+
+class DerivedYieldCurve(YieldCurve):
+    """ A YieldCurve defined as scale * base zero rates + shift. It holds the base curve and the transform, and only
+    materialises zero rates (and discount factors) on first query. Transforming it again composes the transforms onto
+    the same base, so a chain of transforms is still evaluated once. """
+
+    def __init__(self, base: YieldCurve, scale: float, shift: ArrayLike, name: str):
+        if isinstance(base, DerivedYieldCurve):
+            scale, shift = base.scale * scale, base.shift * scale + shift
+            base = base.base
+
+        shift = np.asarray(shift, dtype=float)
+        if shift.ndim and shift.shape != base.times.shape:
+            raise ValueError("shift must be a scalar or have one value per curve time")
+
+        object.__setattr__(self, 'base', base)
+        object.__setattr__(self, 'scale', float(scale))
+        object.__setattr__(self, 'shift', shift)
+        object.__setattr__(self, 'name', name)
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.base.times
+
+    # Interpolation and extrapolation settings follow the base curve
+    interpolation = property(lambda self: self.base.interpolation)
+    extrapolation = property(lambda self: self.base.extrapolation)
+    ufr = property(lambda self: self.base.ufr)
+    alpha = property(lambda self: self.base.alpha)
+
+    @cached_property
+    def zero_rates(self) -> np.ndarray:
+        zeros = self.base.zero_rates * self.scale if self.scale != 1.0 else self.base.zero_rates.copy()
+        zeros += self.shift
+        zeros.flags.writeable = False
+        return zeros
+
+    @cached_property
+    def fingerprint(self) -> tuple:
+        # Keyed on the transform, so caching never forces the zero rates to materialise
+        return self.base.fingerprint, self.scale, self.shift.shape, self.shift.tobytes()
+
+    def __repr__(self) -> str:
+        return f"DerivedYieldCurve(base={self.base.name!r}, scale={self.scale}, shift={self.shift}, name={self.name!r})"
+
+
+@dataclass(frozen=True)
+class YieldCurveSet(_ZeroCurve):
+    """ S yield curves (e.g. economic scenarios) on a common time grid, held as one (scenarios x times) array. Every
+    scenario is interpolated and extrapolated like a YieldCurve with the same settings, all scenarios at once. """
+    times: np.ndarray
+    zero_rates: np.ndarray
+    name: str
+    interpolation: Interpolation = Interpolation.LINEAR_ZERO
+    extrapolation: Extrapolation = Extrapolation.FLAT
+    ufr: float = 0.036
+    alpha: float = 0.1
+
+
+    def __post_init__(self):
+        if self.zero_rates.ndim != 2 or self.zero_rates.shape[1] != self.times.size:
+            raise ValueError("zero_rates must have shape (scenarios, len(times))")
+
+    @classmethod
+    def from_curves(cls, curves: list[YieldCurve], name: str) -> "YieldCurveSet":
+        """The curves as one set, interpolated and extrapolated with the first curve's settings"""
+        times = curves[0].times
+        if any(not np.array_equal(c.times, times) for c in curves):
+            raise ValueError("All curves in a YieldCurveSet must share the same times")
+        return cls(times, np.stack([c.zero_rates for c in curves]), name, **cls._settings(curves[0]))
+
+    @property
+    def scenario_count(self) -> int:
+        return self.zero_rates.shape[0]
+
+    def __len__(self) -> int:
+        return self.scenario_count
+
+    def __getitem__(self, scenario: int) -> YieldCurve:
+        return YieldCurve(self.times, self.zero_rates[scenario], f"{self.name}[{scenario}]", **self._settings(self))
+
+    def select(self, scenarios: slice) -> "YieldCurveSet":
+        return YieldCurveSet(self.times, self.zero_rates[scenarios], self.name, **self._settings(self))
+
+    def discount_factors(self, t: ArrayLike, scenarios: slice = slice(None), spread: float = 0.0) -> np.ndarray:
+        """(scenarios x times) discount factors"""
+        t = np.asarray(t)
+        curves = self if scenarios == slice(None) else self.select(scenarios)
+        zeros = np.add(curves.zero(t), spread)
+        return zero_to_df(t, zeros, out=zeros)
+
+    @staticmethod
+    def _settings(curve: _ZeroCurve) -> dict:
+        return {'interpolation': curve.interpolation, 'extrapolation': curve.extrapolation, 'ufr': curve.ufr,
+                'alpha': curve.alpha}
+
 
 @dataclass(frozen=True)
 class IndexCurve:
+    """ Projected levels of a price index (e.g. RPI) at times. Levels between times are log-linear, i.e. the index grows
+    at a constant rate within each period, and beyond either end they carry on at the nearest period's rate. """
     times: np.ndarray
     index_levels: np.ndarray
     name: str
 
+
+    # --- Properties ---
+
+    @property
+    def min_time(self):
+        return self.times[0]
+
+    @property
+    def max_time(self):
+        return self.times[-1]
+
+    @cached_property
+    def _log_levels(self) -> np.ndarray:
+        return np.log(self.index_levels)
+
+    @cached_property
+    def _unit_grid(self) -> bool:
+        return self.times.dtype.kind in 'iu' and bool(np.all(np.diff(self.times) == 1))
+
     # --- Core queries ---
     def level(self, t: ArrayLike) -> ArrayLike:
-        pass
+        t = np.asarray(t)
+        if (self._unit_grid and t.dtype.kind in 'iu'
+                and (t.size == 0 or (t.min() >= self.min_time and t.max() <= self.max_time))):
+            return self.index_levels[(t - self.min_time).astype(int)]
+        return np.exp(self._log_level(t.astype(float)))
 
     def ratio(self, t: ArrayLike, shift: int) -> ArrayLike:
-        pass
+        """Growth in the index over the shift years up to t"""
+        t = np.asarray(t)
+        return self.level(t) / self.level(t - shift)
+
+    def uplift(self, t: ArrayLike) -> ArrayLike:
+        """Growth in the index from the first time (the valuation date) to t"""
+        return self.level(t) / self.index_levels[0]
 
 
     # --- Real discount rate helpers ---
 
     def real_df(self, nominal_curve: YieldCurve, t: ArrayLike) -> ArrayLike:
-        pass
+        """Value now of an amount indexed from now and paid at t"""
+        return nominal_curve.df(t) * self.uplift(t)
 
 
     # --- Transformations and utilities ---
 
     def with_wedge(self, wedge_bps: float) -> "IndexCurve":
-        pass
+        """The index growing wedge_bps basis points a year faster (e.g. RPI from a CPI curve)"""
+        wedge = (1 + wedge_bps * 1e-4) ** (self.times - self.min_time)
+        return IndexCurve(self.times, self.index_levels * wedge, f"{self.name} + {wedge_bps}bp")
 
     def to_json(self) -> dict:
         pass
@@ -100,3 +385,25 @@ class IndexCurve:
 
     def validate(self) -> None:
         pass
+
+    def _log_level(self, t: np.ndarray) -> np.ndarray:
+        times, log_levels = self.times.astype(float), self._log_levels
+        inside = np.interp(t, times, log_levels)
+        if times.size < 2:
+            return inside
+        first_rate = (log_levels[1] - log_levels[0]) / (times[1] - times[0])
+        last_rate = (log_levels[-1] - log_levels[-2]) / (times[-1] - times[-2])
+        inside += np.where(t < times[0], (t - times[0]) * first_rate, 0.0)
+        inside += np.where(t > times[-1], (t - times[-1]) * last_rate, 0.0)
+        return inside
+
+
+def _interp(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    # np.interp along the last axis of fp, for x within [xp[0], xp[-1]]
+    if fp.ndim == 1:
+        return np.interp(x, xp, fp)
+    if xp.size == 1:
+        return np.repeat(fp, x.size, axis=-1)
+    i = np.clip(np.searchsorted(xp, x, 'right'), 1, xp.size - 1)
+    w = (x - xp[i - 1]) / (xp[i] - xp[i - 1])
+    return fp[..., i - 1] * (1 - w) + fp[..., i] * w
@@ -0,0 +1,62 @@
+# modelic/core/discount_cache.py
+
+from collections import OrderedDict
+import numpy as np
+
+from modelic.core.compounding import zero_to_df
+from modelic.core.curves import YieldCurve
+from modelic.core.custom_types import ArrayLike
+
+
+class DiscountFactorCache:
+    """ Discount factors keyed by (curve, time grid, spread), kept in an LRU cache. Only a single spread (for the
+    whole curve) is cached: a spread per policy or shock rarely repeats, and each would hold a (times x spreads)
+    matrix, so those factors are computed afresh every call. """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def discount_factors(self, curve: YieldCurve, times: np.ndarray, spread: ArrayLike = 0) -> np.ndarray:
+        """(times x spread columns) discount factors, read-only since cached arrays are shared"""
+
+        times = np.asarray(times)
+        spread = np.atleast_2d(np.asarray(spread, dtype=float))
+        if spread.size != 1:
+            return self._calculate(curve, times, spread)
+
+        key = (curve.fingerprint, self._fingerprint(times), self._fingerprint(spread))
+
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        self.misses += 1
+        df = self._cache[key] = self._calculate(curve, times, spread)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return df
+
+    def cache_info(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'maxsize': self.maxsize}
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def _calculate(curve: YieldCurve, times: np.ndarray, spread: np.ndarray) -> np.ndarray:
+        df = zero_to_df(times[:, None], curve.zero(times)[:, None] + spread)
+        df.flags.writeable = False
+        return df
+
+    @staticmethod
+    def _fingerprint(values: np.ndarray) -> tuple:
+        return values.dtype.str, values.shape, values.tobytes()
+
+
+# Shared by every cashflow model unless one is given its own
+DISCOUNT_CACHE = DiscountFactorCache()
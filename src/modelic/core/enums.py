@@ -11,7 +11,21 @@ class CurveKind:
 class YieldSchema(str, Enum):
     ONE_YEAR_FORWARDS = "one_year_forwards"
     MATURITY_ZEROS = "maturity_zeros"
+    PAR_SWAP = "par_swap"
 
 @dataclass
 class IndexSchema(str, Enum):
     INDEX_LEVELS = "index_levels"
+
+class FractionalAge(str, Enum):
+    UDD = "udd"
+    CFM = "cfm"
+
+class Interpolation(str, Enum):
+    LINEAR_ZERO = "linear_zero"
+    LOG_LINEAR_DF = "log_linear_df"
+    MONOTONE_CONVEX = "monotone_convex"
+
+class Extrapolation(str, Enum):
+    FLAT = "flat"
+    SMITH_WILSON = "smith_wilson"
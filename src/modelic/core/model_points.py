@@ -0,0 +1,148 @@
+# modelic/core/model_points.py
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cached_property
+import numpy as np
+import pandas as pd
+
+from modelic.core.custom_types import ArrayLike
+from modelic.core.policy_portfolio import PolicyPortfolio
+
+_BENEFIT_COLUMNS = ('death_contingent_benefits', 'terminal_survival_contingent_benefits',
+                    'periodic_survival_contingent_benefits')
+
+
+@dataclass(frozen=True)
+class CompressionError:
+    """ Total of a per-policy value over a sample of policies, valued policy by policy and estimated from the model
+    points they belong to """
+
+    sample_size: int
+    full: float
+    estimated: float
+
+    @property
+    def error(self) -> float:
+        return self.estimated - self.full
+
+    @property
+    def relative_error(self) -> float:
+        return self.error / self.full
+
+
+@dataclass(frozen=True)
+class ModelPoints:
+    """ A portfolio compressed into model points: portfolio holds one representative (average) policy per group, and
+    weights the number of policies it stands for, so weights @ per-point values totals the value over policies.
+    groups maps each of the original policies to its model point. """
+
+    portfolio: PolicyPortfolio
+    weights: np.ndarray
+    groups: np.ndarray
+    policies: PolicyPortfolio
+
+
+    @property
+    def count(self) -> int:
+        return self.portfolio.count
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.policies.count / self.count
+
+
+    def total(self, values: ArrayLike) -> np.ndarray:
+        """Per-point values (last axis model points) summed over the policies they stand for"""
+        return np.asarray(values) @ self.weights
+
+    def expand(self, values: ArrayLike, by_benefit: bool = True) -> np.ndarray:
+        """Per-point values (last axis model points) as estimates for each original policy, scaled by the policy's
+        share of its model point's benefits unless by_benefit is False"""
+        values = np.asarray(values)[..., self.groups]
+        return values * self._benefit_shares if by_benefit else values
+
+    @cached_property
+    def _benefit_shares(self) -> np.ndarray:
+        point_benefits = _total_benefits(self.portfolio)[self.groups]
+        return np.divide(_total_benefits(self.policies), point_benefits, out=np.ones(self.groups.size),
+                         where=point_benefits != 0)
+
+
+    def sampled_error(self, value: Callable[[PolicyPortfolio], ArrayLike], sample_size: int = 1_000,
+                      seed: int = None) -> CompressionError:
+        """The error in the total of value (per-policy values of a portfolio, e.g. benefit PVs) over a random sample
+        of the original policies, valued in full, against its estimate from the model points"""
+
+        rng = np.random.default_rng(seed)
+        size = min(sample_size, self.policies.count)
+        rows = np.sort(rng.choice(self.policies.count, size, replace=False))
+
+        full = np.sum(value(self.policies.select(rows)))
+        estimated = np.sum(self.expand(value(self.portfolio))[rows])
+        return CompressionError(size, float(full), float(estimated))
+
+
+def compress(policies: PolicyPortfolio, age_band: float = 5, term_band: float = 5) -> ModelPoints:
+    """Group policies of the same product and premium type whose ages and terms fall in the same age_band and
+    term_band wide bands (whole-of-life terms in their own band) into model points. Each point takes its group's
+    mean benefits and premium, and its ages and terms weighted by total benefits, rounded to whole years when the
+    policies' are. Wider bands give fewer points and a larger error."""
+
+    keys = [np.floor_divide(policies.ages, age_band),
+            np.where(np.isnan(policies._terms), -1, np.floor_divide(np.nan_to_num(policies._terms), term_band))]
+    keys += [labels for labels in (policies.policy_type, policies.premium_type) if labels is not None]
+    groups, first = _group(keys)
+
+    weights = np.bincount(groups).astype(float)
+    benefits = _total_benefits(policies)
+    benefit_sums = np.bincount(groups, weights=benefits)
+
+    def weighted(values: np.ndarray) -> np.ndarray:
+        # Benefit-weighted mean over each group, or the plain mean where the group has no benefits
+        plain = np.bincount(groups, weights=values) / weights
+        return np.divide(np.bincount(groups, weights=values * benefits), benefit_sums, out=plain,
+                         where=benefit_sums != 0)
+
+    def mean(values: np.ndarray) -> np.ndarray:
+        # Mean of the values present in each group; NaN where a group has none
+        present = ~np.isnan(values)
+        sums = np.bincount(groups, weights=np.where(present, values, 0.0))
+        counts = np.bincount(groups, weights=present, minlength=weights.size)
+        return np.divide(sums, counts, out=np.full(weights.size, np.nan), where=counts != 0)
+
+    ages = weighted(policies.ages.astype(float))
+    if policies.ages.dtype.kind in 'iu':
+        ages = ages.round().astype(policies.ages.dtype)
+
+    wol = np.isnan(policies._terms)
+    terms = np.where(wol[first], np.nan, weighted(np.where(wol, 0.0, policies._terms)))
+    if np.array_equal(policies._terms[~wol], policies._terms[~wol].round()):
+        terms = terms.round()
+
+    columns = {name: mean(getattr(policies, name)) for name in _BENEFIT_COLUMNS + ('premiums',)
+               if getattr(policies, name) is not None}
+    portfolio = PolicyPortfolio(ages, terms, policy_type=_first(policies.policy_type, first),
+                                premium_type=_first(policies.premium_type, first), **columns)
+
+    return ModelPoints(portfolio, weights, groups, policies)
+
+
+def _group(keys: list) -> tuple[np.ndarray, np.ndarray]:
+    # Hashes rather than sorts: each key is coded to small ints, the codes combine into one int per policy, and groups
+    # are numbered in order of appearance, so each starts where its number first exceeds all those before it
+    codes = [pd.factorize(key)[0] for key in keys]
+    combined = np.ravel_multi_index(codes, [code.max() + 1 for code in codes])
+    groups = pd.factorize(combined)[0]
+    first = np.flatnonzero(np.diff(np.maximum.accumulate(groups), prepend=-1))
+    return groups, first
+
+def _first(labels: np.ndarray, first: np.ndarray):
+    return None if labels is None else labels[first]
+
+def _total_benefits(policies: PolicyPortfolio) -> np.ndarray:
+    benefits = np.zeros(policies.count)
+    for name in _BENEFIT_COLUMNS:
+        if getattr(policies, name) is not None:
+            benefits += np.nan_to_num(getattr(policies, name))
+    return benefits
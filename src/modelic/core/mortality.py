@@ -1,22 +1,19 @@
 # modelic/core/mortality.py
 
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from functools import cached_property
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from modelic.core.custom_types import IntArrayLike, ArrayLike
+from modelic.core.enums import FractionalAge
 
 
-@dataclass(frozen=True)
-class MortalityTable:
-    ages: np.ndarray
-    qx: np.ndarray
-    name: str
-
-
-    def __post_init__(self):
-        self._validate_inputs(self.qx, self.ages)
+class BaseMortalityTable(ABC):
+    """Survival and death lookups for any table that can be laid out as one qx vector per cohort."""
 
+    ages: np.ndarray
 
     @property
     def min_age(self) -> int:
@@ -28,9 +25,215 @@ class MortalityTable:
         return int(self.ages[-1])
 
 
+    @property
+    @abstractmethod
+    def cohort_qx(self) -> np.ndarray:
+        """(cohorts x ages) qx; row c is the rate at each age for a life in cohort c"""
+        pass
+
+    @abstractmethod
+    def _cohort_idx(self, age: np.ndarray, cohort: IntArrayLike) -> np.ndarray:
+        pass
+
+    @cached_property
+    def cohort_lx(self) -> np.ndarray:
+        return self._lx_from_qx(self.cohort_qx)
+
+    @cached_property
+    def cohort_dx(self) -> np.ndarray:
+        return self._dx_from_qx(self.cohort_qx, self.cohort_lx)
+
+    def npx(self, age, term=1, *, cohort: IntArrayLike = None, proj_horizon = None, incl_t0 = False,
+            full_path = False, out: np.ndarray = None, qx_multipliers: ArrayLike = None):
+
+        rows, cols, term = self._broadcast_inputs(age, term, cohort)
+        lx, dx, rows = self._stressed_tables(rows, qx_multipliers)
+
+        if not full_path:
+            self._check_no_out(out)
+            return self._lookup(lx, lx, rows, cols, term)
+
+        start = 0 if incl_t0 else 1
+        num_rows = (term.max() + 1 if proj_horizon is None else proj_horizon) - start
+        surv = self._path(lx, lx, rows, cols, start, num_rows, out)
+        self._truncate(surv, term + 1 - start)
+        return surv
+
+    def nqx(self, age, term=1, *, cohort: IntArrayLike = None, proj_horizon = None, full_path = False,
+            out: np.ndarray = None, qx_multipliers: ArrayLike = None):
+
+        rows, cols, term = self._broadcast_inputs(age, term, cohort)
+        lx, dx, rows = self._stressed_tables(rows, qx_multipliers)
+
+        if not full_path:
+            self._check_no_out(out)
+            return self._lookup(dx, lx, rows, cols, term, shift=-1)
+
+        num_rows = term.max() if proj_horizon is None else proj_horizon
+        death = self._path(dx, lx, rows, cols, 0, num_rows, out)
+        self._truncate(death, term)
+        return death
+
+    def tpx(self, age: ArrayLike, t: ArrayLike, *, cohort: IntArrayLike = None,
+            assumption: FractionalAge = FractionalAge.UDD, qx_multipliers: ArrayLike = None) -> np.ndarray:
+        """Survival probability over t years from (possibly fractional) age; t broadcasts against age, so a (times x 1)
+        grid of t gives a (times x policies) result"""
+
+        age = np.atleast_1d(np.asarray(age, dtype=float))
+        rows = self._cohort_idx(np.floor(age).astype(int), cohort)
+        lx, _, rows = self._stressed_tables(rows, qx_multipliers)
+
+        t = np.asarray(t, dtype=float)
+        if rows.ndim > 1:
+            # Put the shock axis in front of however many axes t adds
+            rows = rows.reshape(rows.shape[:1] + (1,) * max(t.ndim - 1, 0) + rows.shape[1:])
+
+        position = age.clip(self.min_age, self.max_age) - self.min_age
+        return self._fractional_lx(lx, rows, position + t, assumption) / self._fractional_lx(lx, rows, position,
+                                                                                               assumption)
+
+    def tqx(self, age: ArrayLike, t: ArrayLike, *, cohort: IntArrayLike = None,
+            assumption: FractionalAge = FractionalAge.UDD, qx_multipliers: ArrayLike = None) -> np.ndarray:
+        return 1 - self.tpx(age, t, cohort=cohort, assumption=assumption, qx_multipliers=qx_multipliers)
+
+    def _fractional_lx(self, lx, rows, position, assumption):
+        # Interpolate each cohort's lx between integer ages: linearly under UDD, log-linearly under a constant force
+        width = lx.shape[1]
+        position = np.clip(position, 0, width - 1)
+        whole = np.minimum(np.floor(position).astype(int), width - 2)
+        frac = position - whole
+
+        lower = lx.take(self._flat_idx(lx, rows, whole, width))
+        upper = lx.take(self._flat_idx(lx, rows, whole + 1, width))
+
+        if assumption == FractionalAge.UDD:
+            return lower + frac * (upper - lower)
+        elif assumption == FractionalAge.CFM:
+            ratio = np.divide(upper, lower, out=np.zeros(np.broadcast(upper, lower).shape), where=lower > 0)
+            return lower * ratio ** frac
+        else:
+            raise ValueError(f"Unknown fractional age assumption: {assumption}")
+
+    def _stressed_tables(self, rows, qx_multipliers):
+        # A stack of K multipliers (scalars, or one per age) turns the C cohort rows into K * C stressed rows, so all
+        # shocks come out of the same gather with a leading shock axis on the result
+        if qx_multipliers is None:
+            return self.cohort_lx, self.cohort_dx, rows
+
+        multipliers = np.asarray(qx_multipliers, dtype=float)
+        multipliers = multipliers.reshape(multipliers.shape[0], 1, -1)
+
+        num_cohorts, num_ages = self.cohort_qx.shape
+        qx = np.minimum(self.cohort_qx[None, :, :] * multipliers, 1.0)
+        qx[:, :, -1] = 1.0
+        qx = qx.reshape(-1, num_ages)
+
+        lx = self._lx_from_qx(qx)
+        shock_rows = np.arange(multipliers.shape[0])[:, None] * num_cohorts + rows
+        return lx, self._dx_from_qx(qx, lx), shock_rows
+
+    def _lookup(self, table, lx, rows, cols, offset, shift=0):
+        # Reads table at offset + shift past each policy's column. Each row of table (cohort lx or dx) ends in a zero,
+        # so positions beyond the end of the table read that zero, and negative offsets (e.g. nqx with term 0) read as
+        # zero too. Positions are only clipped or masked when some are out of range, so the usual lookup is one gather
+        # from each table and one division in place.
+        width = table.shape[1]
+        pos = cols + offset
+        if shift:
+            pos += shift
+        negative = offset.min() + shift < 0
+        if table.shape[0] > 1:
+            if negative or pos.max() >= width:
+                np.clip(pos, 0, width - 1, out=pos)
+            pos = rows * width + pos
+        # A single row is clipped by take itself, onto its final zero
+        out = table.take(pos, mode='clip')
+        np.divide(out, lx.take(self._flat_idx(table, rows, cols, width)), out=out)
+        if negative:
+            out[np.broadcast_to(offset + shift < 0, out.shape)] = 0.0
+        return out
+
+    def _path(self, table, lx, rows, cols, start, num_rows, out):
+        # Gather each policy's window of table straight into the (num_rows x policies) result, then rescale in place.
+        # With stressed tables rows is (shocks x policies) and the result is (shocks x num_rows x policies).
+        windows, width = self._windows(table, start + num_rows)
+        if out is None:
+            out = np.empty(rows.shape[:-1] + (num_rows, rows.shape[-1]))
+        out_by_row = np.moveaxis(out, -2, 0)
+        flat_idx = self._flat_idx(table, rows, cols, width)
+        np.take(windows[:, start:].T, flat_idx, axis=1, out=out_by_row, mode='clip')
+        out_by_row *= 1 / lx.take(self._flat_idx(table, rows, cols, lx.shape[1]))
+        return out
+
+    @staticmethod
+    def _flat_idx(table, rows, cols, width):
+        # Position of (row, col) in a flattened (cohorts x width) array; a single-cohort table needs no offset
+        return rows * width + cols if table.shape[0] > 1 else cols
+
+    @staticmethod
+    def _lx_from_qx(qx):
+        survivors = (1 - qx).cumprod(axis=1)
+        return np.concatenate((np.ones((survivors.shape[0], 1)), survivors), axis=1)
+
+    @staticmethod
+    def _dx_from_qx(qx, lx):
+        deaths = lx[:, :-1] * qx
+        return np.concatenate((deaths, np.zeros((deaths.shape[0], 1))), axis=1)
+
+    @staticmethod
+    def _windows(table, length):
+        # Read-only view whose row (c * width + i) is table[c, i:i + length]. Each cohort row is zero-padded by
+        # length before flattening so that no window runs into the next cohort.
+        width = table.shape[1] + length
+        padded = np.zeros((table.shape[0], width))
+        padded[:, :table.shape[1]] = table
+        return sliding_window_view(padded.ravel(), length), width
+
+    @staticmethod
+    def _truncate(path, keep):
+        # Zero rows at or beyond each policy's term, one row at a time so no (rows x policies) mask is allocated
+        for row in range(max(int(keep.min()), 0), path.shape[-2]):
+            path[..., row, keep <= row] = 0.0
+
+    @staticmethod
+    def _check_no_out(out):
+        if out is not None:
+            raise ValueError("out is only supported with full_path=True")
+
+    def _broadcast_inputs(self, age, term, cohort):
+        age = np.atleast_1d(np.asarray(age, dtype=int))
+        term = np.atleast_1d(np.asarray(term, dtype=int))
+        rows = self._cohort_idx(age, cohort)
+        return np.broadcast_arrays(rows, self._resolve_idx(age), term)
+
+    def _resolve_idx(self, age: IntArrayLike) -> IntArrayLike:
+        idx = age.clip(self.min_age, self.max_age)
+        idx -= self.min_age
+        return idx
+
+
+@dataclass(frozen=True)
+class MortalityTable(BaseMortalityTable):
+    ages: np.ndarray
+    qx: np.ndarray
+    name: str
+
+
+    def __post_init__(self):
+        self._validate_inputs(self.qx, self.ages)
+
+
+    @property
+    def cohort_qx(self) -> np.ndarray:
+        return self.qx[None, :]
+
     @cached_property
     def lx(self) -> np.ndarray:
-        return np.concatenate(([1.0], (1 - self.qx).cumprod()))
+        return self.cohort_lx[0]
+
+    @cached_property
+    def dx(self) -> np.ndarray:
+        return self.cohort_dx[0]
 
     @cached_property
     def survival_table(self) -> np.ndarray:
@@ -48,7 +251,38 @@ class MortalityTable:
             out[:(n - i), i] = arr_in[i:]
         return out
 
-    def npx(self, age, term=1, *, proj_horizon = None, incl_t0 = False, full_path = False):
+    def lx_windows(self, length: int) -> np.ndarray:
+        return self._windows(self.cohort_lx, length)[0][:self.lx.size]
+
+    def dx_windows(self, length: int) -> np.ndarray:
+        return self._windows(self.cohort_dx, length)[0][:self.dx.size]
+
+    def npx(self, age, term=1, *, proj_horizon = None, incl_t0 = False, full_path = False, use_tables = False,
+            out: np.ndarray = None, qx_multipliers: ArrayLike = None):
+
+        if use_tables:
+            return self._npx_table(age, term, proj_horizon=proj_horizon, incl_t0=incl_t0, full_path=full_path)
+
+        return super().npx(age, term, proj_horizon=proj_horizon, incl_t0=incl_t0, full_path=full_path, out=out,
+                           qx_multipliers=qx_multipliers)
+
+    def nqx(self, age, term=1, *, proj_horizon = None, full_path = False, use_tables = False,
+            out: np.ndarray = None, qx_multipliers: ArrayLike = None):
+
+        if use_tables:
+            return self._nqx_table(age, term, proj_horizon=proj_horizon, full_path=full_path)
+
+        return super().nqx(age, term, proj_horizon=proj_horizon, full_path=full_path, out=out,
+                           qx_multipliers=qx_multipliers)
+
+    def _cohort_idx(self, age: np.ndarray, cohort: IntArrayLike) -> np.ndarray:
+        # Every policy is on the one row: a read-only view of zeros rather than an array per policy
+        return np.broadcast_to(0, age.shape)
+
+
+    # --- Dense n x n table path (reference implementation, retained for parity testing) ---
+
+    def _npx_table(self, age, term=1, *, proj_horizon = None, incl_t0 = False, full_path = False):
 
         age = np.asarray(age, dtype=int)
 
@@ -62,7 +296,7 @@ class MortalityTable:
         surv = self._filter_table(self.survival_table, self._resolve_idx(age), term, num_rows=proj_horizon, fill_val=0.0, full_path=full_path)
         return surv[1:] if not incl_t0 and full_path else surv
 
-    def nqx(self, age, term=1, *, proj_horizon = None, full_path = False):
+    def _nqx_table(self, age, term=1, *, proj_horizon = None, full_path = False):
 
         age = np.asarray(age, dtype=int)
 
@@ -90,11 +324,6 @@ class MortalityTable:
             return array[row_filter, col_filter]
 
 
-    def _resolve_idx(self, age: IntArrayLike) -> IntArrayLike:
-        return age.clip(self.min_age, self.max_age) - self.min_age
-
-
-
     @staticmethod
     def _validate_inputs(qx: ArrayLike, ages: IntArrayLike) -> None:
 
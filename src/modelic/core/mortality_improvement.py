@@ -0,0 +1,108 @@
+# modelic/core/mortality_improvement.py
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+
+from modelic.core.mortality import MortalityTable
+from modelic.core.cohort_mortality import MortalityTable2D
+
+
+@dataclass(frozen=True)
+class ImprovementBasis:
+    """ CMI-style annual improvement rates by age and calendar year, relative to a base table for base_year """
+
+    ages: np.ndarray
+    years: np.ndarray
+    rates: np.ndarray
+    base_year: int
+    name: str
+    long_term_rate: float = None
+
+
+    def __post_init__(self):
+        self._validate_inputs(self.rates, self.ages, self.years)
+
+
+    def rates_for(self, ages: np.ndarray, years: np.ndarray) -> np.ndarray:
+        """(ages x years) improvement rates; years past the basis use long_term_rate if given, else the last year"""
+        age_idx = (ages - self.ages[0]).clip(0, self.ages.size - 1)
+        year_idx = (years - self.years[0]).clip(0, self.years.size - 1)
+        rates = self.rates[age_idx[:, None], year_idx[None, :]]
+        if self.long_term_rate is not None:
+            rates[:, years > self.years[-1]] = self.long_term_rate
+        return rates
+
+    @staticmethod
+    def _validate_inputs(rates: np.ndarray, ages: np.ndarray, years: np.ndarray) -> None:
+
+        if rates.shape != (ages.size, years.size):
+            raise ValueError("rates must have shape (len(ages), len(years))")
+        if (rates >= 1).any():
+            raise ValueError("improvement rates must be less than 1")
+        if not np.all(np.diff(ages) == 1):
+            raise ValueError("ages must be consecutive with step 1")
+        if not np.all(np.diff(years) == 1):
+            raise ValueError("years must be consecutive with step 1")
+
+
+class MortalityImprovementEngine:
+    """ Builds improved cohort mortality once per (base table, basis, valuation year) and keeps it in an LRU cache """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def table(self, base: MortalityTable, basis: ImprovementBasis, valuation_year: int) -> MortalityTable2D:
+
+        key = (self._fingerprint(base.name, base.ages, base.qx),
+               self._fingerprint(basis.name, basis.ages, basis.years, basis.rates, basis.base_year,
+                                 basis.long_term_rate),
+               int(valuation_year))
+
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        self.misses += 1
+        table = self._build(base, basis, int(valuation_year))
+        self._cache[key] = table
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return table
+
+    def cache_info(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._cache), 'maxsize': self.maxsize}
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def _build(base: MortalityTable, basis: ImprovementBasis, valuation_year: int) -> MortalityTable2D:
+
+        if valuation_year < basis.base_year:
+            raise ValueError(f"Valuation year {valuation_year} is before the improvement base year {basis.base_year}")
+
+        # Calendar years reached by the youngest life at valuation_year before the table runs out
+        years = np.arange(valuation_year, valuation_year + base.ages.size)
+
+        rate_years = np.arange(basis.base_year + 1, years[-1] + 1)
+        factors = np.cumprod(1 - basis.rates_for(base.ages, rate_years), axis=1)
+        factors = np.concatenate((np.ones((base.ages.size, 1)), factors), axis=1)[:, years - basis.base_year]
+
+        qx = np.minimum(base.qx[:, None] * factors, 1.0)
+        qx[-1] = 1.0
+
+        table = MortalityTable2D(base.ages, years, qx, f"{base.name} + {basis.name} ({valuation_year})",
+                                 base_year=valuation_year)
+        # Build the cohort survival vectors now so every lookup against the cached table is a pure gather
+        table.cohort_lx, table.cohort_dx
+        return table
+
+    @staticmethod
+    def _fingerprint(*parts) -> tuple:
+        return tuple(p.tobytes() if isinstance(p, np.ndarray) else p for p in parts)
@@ -1,14 +1,35 @@
 #modelic/core/policy_portfolio.py
 
-from dataclasses import dataclass
+from collections.abc import Iterator
+from dataclasses import dataclass, fields
+from functools import cached_property
+import json
+from pathlib import Path
 import numpy as np
 import pandas as pd
 
 from modelic.core.custom_types import IntArrayLike, ArrayLike
 from modelic.core.udf_globals import policy_data_csv_columns, wol_years
 
+# Storage type of each column; None keeps the type the data arrives with (e.g. whole or fractional ages, labels)
+_COLUMN_TYPES = {'ages': None, '_terms': np.float64, 'death_contingent_benefits': np.float64,
+                 'terminal_survival_contingent_benefits': np.float64,
+                 'periodic_survival_contingent_benefits': np.float64, 'policy_type': None, 'premium_type': None,
+                 '_policy_id': None, 'premiums': np.float64}
+
+# Types read from policy files (ages may be fractional); any other column in a file is never read
+FILE_COLUMN_TYPES = {'age': np.float64, 'term': np.float64, 'death_contingent_benefit': np.float64,
+                     'terminal_survival_contingent_benefit': np.float64,
+                     'periodic_survival_contingent_benefit': np.float64, 'premium': np.float64, 'policy_type': str,
+                     'premium_type': str, 'policy_id': np.int64}
+
+STORE_MANIFEST = "manifest.json"
+
+
 @dataclass(frozen=True)
 class PolicyPortfolio:
+    """ Policy data held column by column, each column one contiguous typed array. Derived columns (filled-in terms,
+    default policy ids, the DataFrame view) are built on first access and cached, so they are read-only. """
     ages: IntArrayLike
     _terms: IntArrayLike
     death_contingent_benefits: ArrayLike = None
@@ -19,12 +40,54 @@ class PolicyPortfolio:
     _policy_id: IntArrayLike = None
     premiums: ArrayLike = None
 
+    def __post_init__(self):
+        for name, dtype in _COLUMN_TYPES.items():
+            values = getattr(self, name)
+            if values is not None:
+                object.__setattr__(self, name, np.ascontiguousarray(values, dtype=dtype))
+
     @classmethod
     def from_csv(cls, path: str):
         csv_data = pd.read_csv(path)
         return cls.from_df(csv_data)
 
 
+    @classmethod
+    def iter_batches(cls, path: str, batch_size: int = 100_000, *, columns: list[str] = None,
+                     dtypes: dict = None) -> Iterator["PolicyPortfolio"]:
+        """Portfolios of up to batch_size policies read in turn from a CSV or Parquet file, so only one batch is held at
+        a time. Only the policy columns (or those of them in columns) are read, with the types in FILE_COLUMN_TYPES
+        unless overridden in dtypes. Policies without a policy_id column are numbered by their row in the file."""
+
+        dtypes = {**FILE_COLUMN_TYPES, **(dtypes or {})}
+        wanted = set(FILE_COLUMN_TYPES if columns is None else columns) | {'age', 'term'}
+
+        if str(path).endswith(('.parquet', '.pq')):
+            frames = cls._parquet_frames(path, batch_size, wanted, dtypes)
+        else:
+            frames = pd.read_csv(path, chunksize=batch_size, usecols=lambda c: c in wanted,
+                                 dtype={k: v for k, v in dtypes.items() if k in wanted})
+
+        start = 0
+        for frame in frames:
+            if 'policy_id' not in frame.columns:
+                frame['policy_id'] = np.arange(start + 1, start + len(frame) + 1)
+            start += len(frame)
+            yield cls.from_df(frame)
+
+    @staticmethod
+    def _parquet_frames(path: str, batch_size: int, wanted: set, dtypes: dict) -> Iterator[pd.DataFrame]:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading policies from Parquet requires pyarrow") from None
+
+        parquet = pq.ParquetFile(path)
+        present = [name for name in parquet.schema_arrow.names if name in wanted]
+        for batch in parquet.iter_batches(batch_size=batch_size, columns=present):
+            yield batch.to_pandas().astype({k: v for k, v in dtypes.items() if k in present})
+
+
     @classmethod
     def from_df(cls, df: pd.DataFrame):
 
@@ -42,19 +105,60 @@ class PolicyPortfolio:
                    premiums=df['premium'].to_numpy())
 
 
-    @property
-    def policy_id(self):
-        if self._policy_id is None:
-            return np.arange(1, self.count+1)
-        else:
-            return self._policy_id
+    # --- On-disk store ---
 
+    def to_store(self, path) -> Path:
+        """Write each column to its own .npy file in the directory path, with a manifest naming them, for open_store.
+        The manifest is written last, so a store only opens once every column is in place."""
 
-    @property
-    def terms(self):
-        policy_terms = self._terms.astype(float)
-        policy_terms[np.isnan(policy_terms)] = wol_years
-        return policy_terms.astype(int)
+        store_dir = Path(path)
+        store_dir.mkdir(parents=True, exist_ok=True)
+
+        columns = {}
+        for f in fields(self):
+            values = self.policy_id if f.name == '_policy_id' else getattr(self, f.name)
+            if values is None:
+                continue
+            if values.dtype.kind == 'O':
+                values = values.astype(str)
+            np.save(store_dir / f"{f.name}.npy", values, allow_pickle=False)
+            columns[f.name] = values.dtype.str
+
+        manifest = {'count': self.count, 'columns': columns}
+        (store_dir / STORE_MANIFEST).write_text(json.dumps(manifest, indent=2))
+        return store_dir
+
+    @classmethod
+    def open_store(cls, path) -> "PolicyPortfolio":
+        """The portfolio written by to_store, with every column memory-mapped read-only: opening it reads no policy
+        data, and processes opening the same store share the pages the OS has cached rather than each copying them."""
+
+        store_dir = Path(path)
+        manifest_path = store_dir / STORE_MANIFEST
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"No policy store in {store_dir}")
+        manifest = json.loads(manifest_path.read_text())
+
+        columns = {name: np.load(store_dir / f"{name}.npy", mmap_mode='r', allow_pickle=False)
+                   for name in manifest['columns']}
+        for name, values in columns.items():
+            if values.dtype.str != manifest['columns'][name] or len(values) != manifest['count']:
+                raise ValueError(f"Column '{name}' in {store_dir} does not match its manifest")
+        return cls(**columns)
+
+
+    @cached_property
+    def policy_id(self) -> np.ndarray:
+        policy_id = np.arange(1, self.count+1) if self._policy_id is None else self._policy_id.view()
+        policy_id.flags.writeable = False
+        return policy_id
+
+
+    @cached_property
+    def terms(self) -> np.ndarray:
+        policy_terms = np.nan_to_num(self._terms, nan=wol_years).astype(int)
+        policy_terms.flags.writeable = False
+        return policy_terms
 
 
     @property
@@ -63,15 +167,70 @@ class PolicyPortfolio:
 
 
     @property
-    def data(self):
+    def data(self) -> pd.DataFrame:
+        # A shallow copy: callers may add or replace columns without touching the cached frame
+        return self._frame.copy(deep=False)
+
+    @cached_property
+    def _frame(self) -> pd.DataFrame:
         return pd.DataFrame({k: getattr(self, k) for k in policy_data_csv_columns})
 
 
+    def select(self, rows) -> "PolicyPortfolio":
+        """The policies in rows (a slice, boolean mask or index array). Slices share memory with this portfolio; masks
+        and index arrays gather each column once. Derived columns already built are carried over, not rebuilt."""
+        columns = {f.name: None if getattr(self, f.name) is None else getattr(self, f.name)[rows] for f in fields(self)}
+        columns['_policy_id'] = self.policy_id[rows]
+        selected = PolicyPortfolio(**columns)
+        if 'terms' in self.__dict__:
+            terms = self.terms[rows]
+            terms.flags.writeable = False
+            selected.__dict__['terms'] = terms
+        return selected
+
+
+    # --- Product-type groups ---
+
+    @cached_property
+    def _type_groups(self) -> tuple:
+        # Product types coded as small ints, the stable permutation sorting policies by code, and each code's offsets
+        product_types, codes = np.unique(self.policy_type, return_inverse=True)
+        order = np.argsort(codes, kind='stable')
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=product_types.size))))
+        return product_types, codes, order, offsets
+
+    @property
+    def product_types(self) -> np.ndarray:
+        return self._type_groups[0]
+
+    @cached_property
+    def by_type(self) -> "PolicyPortfolio":
+        """The policies sorted by product type (keeping their order within each), so type_slice picks out each type"""
+        return self.select(self._type_groups[2])
+
+    def type_slice(self, product_type: str) -> slice:
+        product_types, _, _, offsets = self._type_groups
+        code = int(np.searchsorted(product_types, product_type))
+        if code == product_types.size or product_types[code] != product_type:
+            return slice(0, 0)
+        return slice(int(offsets[code]), int(offsets[code + 1]))
+
+    def scatter_by_type(self, values: ArrayLike) -> np.ndarray:
+        """Per-policy values computed on by_type, back in this portfolio's policy order"""
+        values = np.asarray(values)
+        scattered = np.empty_like(values)
+        scattered[..., self._type_groups[2]] = values
+        return scattered
+
+
     def get(self, attr: str, product_type: str):
+        rows = self.type_slice(product_type)
         if attr == 'count':
-            return int(sum(self.policy_type == product_type))
-        return getattr(self, attr)[self.policy_type == product_type]
+            return rows.stop - rows.start
+        return getattr(self.by_type, attr)[rows]
 
 
     def is_type(self, product_type: str):
-        return np.asarray(self.policy_type == product_type, dtype=bool)
+        mask = np.zeros(self.count, dtype=bool)
+        mask[self._type_groups[2][self.type_slice(product_type)]] = True
+        return mask
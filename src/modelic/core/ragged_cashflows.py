@@ -0,0 +1,79 @@
+# modelic/core/ragged_cashflows.py
+
+from dataclasses import dataclass
+from functools import cached_property
+import numpy as np
+
+from modelic.core.custom_types import ArrayLike
+
+
+@dataclass(frozen=True)
+class RaggedCashflows:
+    """ Per-policy cashflows stored back to back in one flat array. Policy p has lengths[p] cashflows, on time rows
+    first_row .. first_row + lengths[p] - 1, so storage scales with the sum of policy terms rather than
+    policies x longest term. values may carry leading axes (e.g. one row per mortality shock). """
+
+    times: np.ndarray
+    first_row: int
+    lengths: np.ndarray
+    values: np.ndarray = None
+
+
+    @classmethod
+    def for_steps(cls, times: np.ndarray, first_row: int, stop_rows: np.ndarray) -> "RaggedCashflows":
+        """Empty layout for policies whose cashflows run from first_row up to (not including) stop_rows"""
+        return cls(times, first_row, np.maximum(np.asarray(stop_rows) - first_row, 0))
+
+    def with_values(self, values: np.ndarray) -> "RaggedCashflows":
+        ragged = RaggedCashflows(self.times, self.first_row, self.lengths, values)
+        # Share the index arrays already built for this layout
+        ragged.__dict__.update({k: v for k, v in self.__dict__.items() if k in ('offsets', 'policy_index', 'row_index')})
+        return ragged
+
+    @property
+    def policy_count(self) -> int:
+        return self.lengths.size
+
+    @cached_property
+    def offsets(self) -> np.ndarray:
+        return np.concatenate(([0], np.cumsum(self.lengths)))
+
+    @cached_property
+    def policy_index(self) -> np.ndarray:
+        return np.repeat(np.arange(self.policy_count), self.lengths)
+
+    @cached_property
+    def row_index(self) -> np.ndarray:
+        return self.first_row + np.arange(self.offsets[-1]) - np.repeat(self.offsets[:-1], self.lengths)
+
+    @property
+    def step_times(self) -> np.ndarray:
+        return self.times[self.row_index]
+
+    def expand(self, per_policy: ArrayLike) -> ArrayLike:
+        """Repeat a per-policy input along each policy's cashflows; scalars are returned as they are"""
+        return per_policy if np.ndim(per_policy) == 0 else np.asarray(per_policy)[self.policy_index]
+
+    def gather(self, dense: np.ndarray) -> np.ndarray:
+        """Pick out a (times x 1 or policies) array, e.g. discount factors, at each stored cashflow"""
+        dense = np.broadcast_to(dense, (self.times.size, self.policy_count))
+        return dense[self.row_index, self.policy_index]
+
+    def to_dense(self) -> np.ndarray:
+        dense = np.zeros(self.values.shape[:-1] + (self.times.size, self.policy_count))
+        dense[..., self.row_index, self.policy_index] = self.values
+        return dense
+
+    def sum(self, axis: str = 'policies') -> np.ndarray:
+        """Total over policies for each time step (axis='policies'), or over time steps for each policy (axis='times')"""
+        if axis == 'policies':
+            return self._segment_sum(self.values, self.row_index, self.times.size)
+        elif axis == 'times':
+            return self._segment_sum(self.values, self.policy_index, self.policy_count)
+        raise ValueError(f"Unknown axis: {axis}")
+
+    @staticmethod
+    def _segment_sum(values: np.ndarray, index: np.ndarray, size: int) -> np.ndarray:
+        flat = values.reshape(-1, values.shape[-1])
+        sums = np.stack([np.bincount(index, weights=row, minlength=size) for row in flat])
+        return sums.reshape(values.shape[:-1] + (size,))
@@ -0,0 +1,77 @@
+# modelic/core/sensitivities.py
+
+from dataclasses import dataclass
+import numpy as np
+
+from modelic.core.custom_types import ArrayLike
+
+BASIS_POINT = 1e-4
+DEFAULT_KEY_RATE_TIMES = np.array([1, 2, 5, 10, 20, 30, 50])
+
+
+@dataclass(frozen=True)
+class RateSensitivities:
+    """ PV with its first and second derivatives to a parallel shift in the annually compounded zero rates, and first
+    derivatives to each key-rate bucket. Derived measures follow the usual conventions: PV01 is the gain in PV for a 1bp
+    fall in rates, duration is modified duration. The last axis is policies until total() sums it away. """
+
+    pv: np.ndarray
+    dpv: np.ndarray
+    d2pv: np.ndarray
+    key_rate_times: np.ndarray
+    key_rate_dpv: np.ndarray
+
+
+    @property
+    def pv01(self) -> np.ndarray:
+        return -self.dpv * BASIS_POINT
+
+    @property
+    def duration(self) -> np.ndarray:
+        return -self.dpv / self.pv
+
+    @property
+    def convexity(self) -> np.ndarray:
+        return self.d2pv / self.pv
+
+    @property
+    def key_rate_deltas(self) -> np.ndarray:
+        """(..., key rates, policies) PV01 of each key-rate bucket; they sum to pv01"""
+        return -self.key_rate_dpv * BASIS_POINT
+
+    def total(self) -> "RateSensitivities":
+        return RateSensitivities(self.pv.sum(axis=-1), self.dpv.sum(axis=-1), self.d2pv.sum(axis=-1),
+                                 self.key_rate_times, self.key_rate_dpv.sum(axis=-1))
+
+    def __add__(self, other: "RateSensitivities") -> "RateSensitivities":
+        if not np.array_equal(self.key_rate_times, other.key_rate_times):
+            raise ValueError("Cannot add sensitivities bucketed on different key rates")
+        return RateSensitivities(self.pv + other.pv, self.dpv + other.dpv, self.d2pv + other.d2pv,
+                                 self.key_rate_times, self.key_rate_dpv + other.key_rate_dpv)
+
+    def __radd__(self, other):
+        # Lets sum() start from 0
+        return self if other == 0 else NotImplemented
+
+
+def key_rate_weights(times: ArrayLike, key_rate_times: ArrayLike) -> np.ndarray:
+    """(key rates x times) triangular bucket weights. Each time is split linearly between its neighbouring key rates;
+    times outside the key rates belong wholly to the nearest one, so every column sums to 1"""
+    key_rate_times = np.asarray(key_rate_times, dtype=float)
+    identity = np.eye(key_rate_times.size)
+    return np.stack([np.interp(times, key_rate_times, row) for row in identity])
+
+
+def rate_sensitivities(cf: np.ndarray, times: np.ndarray, zeros: np.ndarray, df: np.ndarray,
+                       key_weights: np.ndarray, key_rate_times: np.ndarray) -> RateSensitivities:
+    """Sensitivities of (..., times, policies) cashflows discounted at (times x 1 or policies) zeros and factors"""
+
+    t = np.asarray(times, dtype=float).reshape(-1, 1)
+    discounted = df * cf
+    slope = t / (1 + zeros)
+
+    dpv_by_time = -slope * discounted
+    d2pv = (slope * (t + 1) / (1 + zeros) * discounted).sum(axis=-2)
+    key_rate_dpv = np.einsum('kt,...tp->...kp', key_weights, dpv_by_time)
+
+    return RateSensitivities(discounted.sum(axis=-2), dpv_by_time.sum(axis=-2), d2pv, key_rate_times, key_rate_dpv)
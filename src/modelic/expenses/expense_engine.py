@@ -6,6 +6,7 @@ import pandas as pd
 from modelic.core.policy_portfolio import PolicyPortfolio
 from modelic.core.curves import YieldCurve
 from modelic.core.mortality import MortalityTable
+from modelic.core.commutation import CommutationTable
 from modelic.expenses.expense_bases import ExpenseBasis
 from modelic.expenses.expense_timings import ExpenseTiming
 from modelic.expenses.expense_factor_factory import EXPENSE_FACTOR_FACTORY
@@ -13,14 +14,20 @@ from modelic.expenses.expense_factor_factory import EXPENSE_FACTOR_FACTORY
 
 class ExpenseEngine:
 
-    def __init__(self, expense_spec: pd.DataFrame, yield_curve: YieldCurve, mortality_table: MortalityTable, expense_inflation_rate: float):
+    def __init__(self, expense_spec: pd.DataFrame, yield_curve: YieldCurve, mortality_table: MortalityTable, expense_inflation_rate: float,
+                 *, commutation: CommutationTable = None):
         self.expense_spec = expense_spec
         self.yield_curve = yield_curve
         self.mortality_table = mortality_table
         self.expense_inflation_rate = expense_inflation_rate
+        # Expense factors are read from commutation columns (escalated at expense_inflation_rate) when given
+        self.commutation = commutation
 
 
-    def present_value(self, policy_data: PolicyPortfolio, *, group_by: str = None, unstack=False):
+    def present_value(self, policy_data: PolicyPortfolio, *, group_by: str = None, unstack=False,
+                      policy_chunk: int = None, max_memory: int = None):
+        """Expense PV of each policy and expense in the spec; expense factors are valued in blocks of policies when
+        policy_chunk or max_memory (bytes, approximately) is given"""
 
         num_cfs = self.mortality_table.ages.max() - self.mortality_table.ages.min() + 1
         times = np.arange(num_cfs)
@@ -40,7 +47,9 @@ class ExpenseEngine:
         factors = np.zeros_like(amounts)
         for expense_timing in np.unique(timing_col):
             factors[timing_col == expense_timing] = self._get_expense_factors(timing_col, ages_col, terms_col,
-                                                                              expense_timing, times)
+                                                                              expense_timing, times,
+                                                                              policy_chunk=policy_chunk,
+                                                                              max_memory=max_memory)
 
         expenses_table['Expense PV'] = (factors * amounts)
 
@@ -65,7 +74,8 @@ class ExpenseEngine:
         return expenses_table
 
 
-    def _get_expense_factors(self, expense_timing_col: np.ndarray, ages: np.ndarray, terms: np.ndarray, expense_timing: ExpenseTiming, times: np.ndarray):
+    def _get_expense_factors(self, expense_timing_col: np.ndarray, ages: np.ndarray, terms: np.ndarray, expense_timing: ExpenseTiming, times: np.ndarray,
+                             *, policy_chunk: int = None, max_memory: int = None):
 
         if expense_timing == ExpenseTiming.INITIAL:
             return 1.0
@@ -82,9 +92,10 @@ class ExpenseEngine:
             class_kwargs = factory['kwargs']
 
             surv_obj = class_constructor(self.yield_curve, self.mortality_table, ages, terms, projection_steps=times,
-                                         escalation=self.expense_inflation_rate, **class_kwargs)
+                                         escalation=self.expense_inflation_rate, commutation=self.commutation,
+                                         **class_kwargs)
 
-            return surv_obj.present_value(aggregate=False)
+            return surv_obj.present_value(aggregate=False, policy_chunk=policy_chunk, max_memory=max_memory)
 
         else:
 
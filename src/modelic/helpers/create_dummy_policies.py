@@ -1,9 +1,11 @@
 # modelic/helpers/create_dummy_policies.py
 
+from pathlib import Path
 import numpy as np
 import pandas as pd
 from scipy.optimize import root_scalar
 
+from modelic.assumptions.store import get_registry
 from modelic.core.curves import YieldCurve
 from modelic.core.mortality import MortalityTable
 from modelic.core.policy_portfolio import PolicyPortfolio
@@ -16,20 +18,21 @@ from modelic.core.custom_types import IntArrayLike, ArrayLike
 from modelic.core.udf_globals import policy_data_csv_columns
 
 
-mort_raw = pd.read_csv(r"../../../tests/data/mortality/AM92.csv")
-ages = mort_raw['x'].to_numpy(int)
-qx = mort_raw['q_x'].to_numpy(float)
-mortality = MortalityTable(ages, qx, 'AM92')
+TEST_DATA = Path(__file__).parents[3] / "tests" / "data"
+ASSUMPTION_STORE = TEST_DATA / "assumption_store"
 
-disc_raw = pd.read_csv(r"../../../tests/data/curves/boe_spot_annual.csv")
-times = disc_raw['year'].to_numpy(int)
-zeros = disc_raw['rate'].to_numpy(float)
-discount_curve = YieldCurve(times, zeros, 'BoE')
+
+def _assumptions() -> tuple[MortalityTable, YieldCurve]:
+    """AM92 and the BoE spot curve, memory-mapped from the compiled assumption store on first use"""
+
+    registry = get_registry(ASSUMPTION_STORE)
+    return registry.mortality_table('AM92'), registry.yield_curve('BoE')
 
 
 def create_dummy_assurance_policies(ph_age: IntArrayLike, term: IntArrayLike, sum_assured: ArrayLike, loading: float = 0):
 
     policies = PolicyPortfolio(ph_age, term, death_contingent_benefits=sum_assured)
+    mortality, discount_curve = _assumptions()
     life_assurance = LifeAssurance(policies, discount_curve, mortality)
     pvs = life_assurance.present_value(aggregate=False)
     prems = _goalseek_regular_premium(pvs, ph_age, term)
@@ -42,6 +45,7 @@ def create_dummy_assurance_policies(ph_age: IntArrayLike, term: IntArrayLike, su
 def create_dummy_pure_endowment_policies(ph_age: IntArrayLike, term: IntArrayLike, sum_assured: ArrayLike, loading: float = 0):
 
     policies = PolicyPortfolio(ph_age, term, terminal_survival_contingent_benefits=sum_assured)
+    mortality, discount_curve = _assumptions()
     pure_endowment = PureEndowment(policies, discount_curve, mortality)
     pvs = pure_endowment.present_value(aggregate=False)
     prems = _goalseek_regular_premium(pvs, ph_age, term)
@@ -54,6 +58,7 @@ def create_dummy_pure_endowment_policies(ph_age: IntArrayLike, term: IntArrayLik
 def create_dummy_endowment_policies(ph_age: IntArrayLike, term: IntArrayLike, death_ben: ArrayLike, surv_ben: ArrayLike, loading: float = 0):
 
     policies = PolicyPortfolio(ph_age, term, death_contingent_benefits=death_ben, terminal_survival_contingent_benefits=surv_ben)
+    mortality, discount_curve = _assumptions()
     pure_endowment = Endowment(policies, discount_curve, mortality)
     pvs = pure_endowment.present_value(aggregate=False)
     prems = _goalseek_regular_premium(pvs, ph_age, term)
@@ -66,6 +71,7 @@ def create_dummy_endowment_policies(ph_age: IntArrayLike, term: IntArrayLike, de
 def create_dummy_annuity_policies(ph_age: IntArrayLike, term: IntArrayLike, amount: ArrayLike, loading: float = 0):
 
     policies = PolicyPortfolio(ph_age, term, periodic_survival_contingent_benefits=amount)
+    mortality, discount_curve = _assumptions()
     pure_endowment = PureEndowment(policies, discount_curve, mortality)
     pvs = pure_endowment.present_value(aggregate=False)
 
@@ -76,6 +82,7 @@ def create_dummy_annuity_policies(ph_age: IntArrayLike, term: IntArrayLike, amou
 
 def _goalseek_regular_premium(target: ArrayLike, ph_age: IntArrayLike, term: IntArrayLike):
 
+    mortality, discount_curve = _assumptions()
     results = []
 
     for i in range(ph_age.size):
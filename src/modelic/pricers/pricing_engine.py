@@ -1,5 +1,6 @@
 # modelic/pricers/pricing_engine.py
 
+from collections.abc import Iterable
 import numpy as np
 import pandas as pd
 
@@ -16,12 +17,18 @@ from modelic.core.custom_types import ArrayLike
 class PricingEngine:
 
     def __init__(self, mortality_table: MortalityTable, yield_curves: YieldCurve, expense_spec: pd.DataFrame,
-                 expense_inflation_rate: float):
+                 expense_inflation_rate: float, *, policy_chunk: int = None, max_memory: int = None,
+                 deduplicate: bool = False):
 
         self.mortality_table = mortality_table
         self.yield_curves = yield_curves
         self.expense_spec = expense_spec
         self.expense_inflation_rate = expense_inflation_rate
+        # Benefit, premium and expense PVs are valued in blocks of policies when either limit is set
+        self.policy_chunk = policy_chunk
+        self.max_memory = max_memory
+        # Value policies sharing an (age, term) model point once, scaled by their benefit amounts
+        self.deduplicate = deduplicate
         self.expense_engine = ExpenseEngine(self.expense_spec, self.yield_curves, self.mortality_table,
                                             self.expense_inflation_rate)
 
@@ -34,19 +41,32 @@ class PricingEngine:
         return prices
 
 
+    def price_batches(self, batches: Iterable[PolicyPortfolio]) -> pd.Series:
+        """Prices for policy batches (e.g. PolicyPortfolio.iter_batches over a file), priced one batch at a time"""
+        return pd.concat([self.price_policy_portfolio(batch) for batch in batches])
+
+
+    def present_value_of_benefits(self, policy_portfolio: PolicyPortfolio) -> pd.Series:
+        """Benefit PV of each policy, by policy_id"""
+        return self._calculate_pv_of_benefits(policy_portfolio)
+
+
     def _calculate_pv_of_benefits(self, policy_portfolio: PolicyPortfolio) -> pd.Series:
 
-        benefit_pvs = pd.Series(index=policy_portfolio.policy_id)
+        # Value each product type on its contiguous block of the type-sorted portfolio, then scatter back
+        by_type = policy_portfolio.by_type
+        benefit_pvs = np.zeros(policy_portfolio.count)
 
-        for policy_type in np.unique(policy_portfolio.policy_type):
+        for policy_type in policy_portfolio.product_types:
 
-            product_engine = PRODUCT_FACTORY[policy_type].from_policy_portfolio(policy_portfolio, self.yield_curves,
+            rows = policy_portfolio.type_slice(policy_type)
+            product_engine = PRODUCT_FACTORY[policy_type].from_policy_portfolio(by_type.select(rows), self.yield_curves,
                                                                                 self.mortality_table,
-                                                                                policy_mask=policy_portfolio.is_type(policy_type))
-            ben_pvs = product_engine.present_value(aggregate=False)
-            benefit_pvs.loc[policy_portfolio.get('policy_id', policy_type)] = ben_pvs
+                                                                                deduplicate=self.deduplicate)
+            benefit_pvs[rows] = product_engine.present_value(aggregate=False, policy_chunk=self.policy_chunk,
+                                                             max_memory=self.max_memory)
 
-        return benefit_pvs
+        return pd.Series(policy_portfolio.scatter_by_type(benefit_pvs), index=policy_portfolio.policy_id)
 
 
     def price_policy_group(self, policy_data: PolicyPortfolio, pv_bens: pd.Series) -> pd.Series:
@@ -58,11 +78,15 @@ class PricingEngine:
 
             prem_ann_fac_obj = SurvivalContingentCashflow(self.yield_curves, self.mortality_table,
                                                           policy_data.ages[reg_prem_pols],
-                                                          policy_data.terms[reg_prem_pols] - 1, periodic_cf=1.0)
+                                                          policy_data.terms[reg_prem_pols] - 1, periodic_cf=1.0,
+                                                          deduplicate=self.deduplicate)
 
-            prem_ann_fac[reg_prem_pols] += prem_ann_fac_obj.present_value(aggregate=False)
+            prem_ann_fac[reg_prem_pols] += prem_ann_fac_obj.present_value(aggregate=False,
+                                                                          policy_chunk=self.policy_chunk,
+                                                                          max_memory=self.max_memory)
 
-        pv_expenses = self.expense_engine.present_value(policy_data, group_by=['policy_id', 'Basis'], unstack=True)
+        pv_expenses = self.expense_engine.present_value(policy_data, group_by=['policy_id', 'Basis'], unstack=True,
+                                                        policy_chunk=self.policy_chunk, max_memory=self.max_memory)
         per_policy_expenses = pv_expenses[ExpenseBasis.PER_POLICY] if ExpenseBasis.PER_POLICY in pv_expenses.columns else 0
         pct_premium_expenses = pv_expenses[ExpenseBasis.PCT_PREMIUM] if ExpenseBasis.PCT_PREMIUM in pv_expenses.columns else 0
         premium = (pv_bens + per_policy_expenses) / (prem_ann_fac - pct_premium_expenses)
@@ -1,7 +1,8 @@
 # modelic/products/annuity.py
 
 from modelic.core.cashflows import CompositeProduct
-from modelic.core.curves import YieldCurve
+from modelic.core.commutation import CommutationTable
+from modelic.core.curves import IndexCurve, YieldCurve
 from modelic.core.mortality import MortalityTable
 from modelic.core.contingent_cashflows.survival_contingent_cashflow import SurvivalContingentCashflow
 from modelic.core.policy_portfolio import PolicyPortfolio
@@ -12,13 +13,19 @@ class Annuity(CompositeProduct):
 
     """ Projects cashflows and calculates present values for death contingent contingent_cashflows """
 
-    def __init__(self, yield_curve: YieldCurve, mortality_table: MortalityTable, age: IntArrayLike, term: IntArrayLike, annual_amount: ArrayLike):
-        components = [SurvivalContingentCashflow(yield_curve, mortality_table, age, term, periodic_cf=annual_amount)]
+    def __init__(self, yield_curve: YieldCurve, mortality_table: MortalityTable, age: IntArrayLike, term: IntArrayLike, annual_amount: ArrayLike,
+                 *, frequency: int = 1, deduplicate: bool = False,
+                 commutation: CommutationTable = None, escalation: float | IndexCurve = 0.0):
+        components = [SurvivalContingentCashflow(yield_curve, mortality_table, age, term, periodic_cf=annual_amount,
+                                                 frequency=frequency, deduplicate=deduplicate, commutation=commutation,
+                                                 escalation=escalation)]
         super().__init__(components, yield_curve)
 
     @classmethod
     def from_policy_portfolio(cls, policy_data: PolicyPortfolio, yield_curve: YieldCurve, mortality_table: MortalityTable,
-                              *, policy_mask: ArrayLike = None):
+                              *, policy_mask: ArrayLike = None, frequency: int = 1,
+                              deduplicate: bool = False, commutation: CommutationTable = None,
+                              escalation: float | IndexCurve = 0.0):
 
         ages = policy_data.ages
         terms = policy_data.terms
@@ -30,4 +37,5 @@ class Annuity(CompositeProduct):
             terms = terms[policy_mask]
             periodic_survival_contingent_benefits = periodic_survival_contingent_benefits[policy_mask]
 
-        return cls(yield_curve, mortality_table, ages, terms, periodic_survival_contingent_benefits)
+        return cls(yield_curve, mortality_table, ages, terms, periodic_survival_contingent_benefits, frequency=frequency,
+                   deduplicate=deduplicate, commutation=commutation, escalation=escalation)
@@ -1,6 +1,7 @@
 # modelic/products/endowment.py
 
 from modelic.core.cashflows import CompositeProduct
+from modelic.core.commutation import CommutationTable
 from modelic.core.curves import YieldCurve
 from modelic.core.mortality import MortalityTable
 from modelic.core.contingent_cashflows.survival_contingent_cashflow import SurvivalContingentCashflow
@@ -14,16 +15,21 @@ class Endowment(CompositeProduct):
     """ Projects cashflows and calculates present values for death contingent contingent_cashflows """
 
     def __init__(self, yield_curve: YieldCurve, mortality_table: MortalityTable, age: IntArrayLike, term: IntArrayLike,
-                 survival_benefit: ArrayLike, death_benefit: ArrayLike):
+                 survival_benefit: ArrayLike, death_benefit: ArrayLike, *, frequency: int = 1,
+                 deduplicate: bool = False,
+                 commutation: CommutationTable = None):
 
-        components = [SurvivalContingentCashflow(yield_curve, mortality_table, age, term, terminal_cf=survival_benefit),
-                      DeathContingentCashflow(yield_curve, mortality_table, age, term, death_benefit)]
+        components = [SurvivalContingentCashflow(yield_curve, mortality_table, age, term, terminal_cf=survival_benefit,
+                                                 frequency=frequency, deduplicate=deduplicate, commutation=commutation),
+                      DeathContingentCashflow(yield_curve, mortality_table, age, term, death_benefit, frequency=frequency,
+                                              deduplicate=deduplicate, commutation=commutation)]
 
         super().__init__(components, yield_curve)
 
     @classmethod
     def from_policy_portfolio(cls, policy_data: PolicyPortfolio, yield_curve: YieldCurve, mortality_table: MortalityTable,
-                              *, policy_mask: ArrayLike = None):
+                              *, policy_mask: ArrayLike = None, frequency: int = 1,
+                              deduplicate: bool = False, commutation: CommutationTable = None):
 
         ages = policy_data.ages
         terms = policy_data.terms
@@ -38,6 +44,6 @@ class Endowment(CompositeProduct):
             death_contingent_benefits = death_contingent_benefits[policy_mask]
 
         return cls(yield_curve, mortality_table, ages, terms, terminal_survival_contingent_benefits,
-                   death_contingent_benefits)
+                   death_contingent_benefits, frequency=frequency, deduplicate=deduplicate, commutation=commutation)
 
 
@@ -1,6 +1,7 @@
 # modelic/products/life_assurance.py
 
 from modelic.core.cashflows import CompositeProduct
+from modelic.core.commutation import CommutationTable
 from modelic.core.curves import YieldCurve
 from modelic.core.mortality import MortalityTable
 from modelic.core.contingent_cashflows.death_contingent_cashflow import DeathContingentCashflow
@@ -12,13 +13,17 @@ class LifeAssurance(CompositeProduct):
 
     """ Projects cashflows and calculates present values for death contingent contingent_cashflows """
 
-    def __init__(self, yield_curve: YieldCurve, mortality_table: MortalityTable, age: IntArrayLike, term: IntArrayLike, death_benefit: ArrayLike):
-        components = [DeathContingentCashflow(yield_curve, mortality_table, age, term, death_benefit)]
+    def __init__(self, yield_curve: YieldCurve, mortality_table: MortalityTable, age: IntArrayLike, term: IntArrayLike, death_benefit: ArrayLike,
+                 *, frequency: int = 1, deduplicate: bool = False,
+                 commutation: CommutationTable = None):
+        components = [DeathContingentCashflow(yield_curve, mortality_table, age, term, death_benefit, frequency=frequency,
+                                              deduplicate=deduplicate, commutation=commutation)]
         super().__init__(components, yield_curve)
 
     @classmethod
     def from_policy_portfolio(cls, policy_data: PolicyPortfolio, yield_curve: YieldCurve, mortality_table: MortalityTable,
-                              *, policy_mask: ArrayLike = None):
+                              *, policy_mask: ArrayLike = None, frequency: int = 1,
+                              deduplicate: bool = False, commutation: CommutationTable = None):
 
         ages = policy_data.ages
         terms = policy_data.terms
@@ -31,5 +36,6 @@ class LifeAssurance(CompositeProduct):
             death_contingent_benefits = death_contingent_benefits[policy_mask]
 
 
-        return cls(yield_curve, mortality_table, ages, terms, death_contingent_benefits)
+        return cls(yield_curve, mortality_table, ages, terms, death_contingent_benefits, frequency=frequency,
+                   deduplicate=deduplicate, commutation=commutation)
 
@@ -1,6 +1,7 @@
 # modelic/products/pure_endowment.py
 
 from modelic.core.cashflows import CompositeProduct
+from modelic.core.commutation import CommutationTable
 from modelic.core.curves import YieldCurve
 from modelic.core.mortality import MortalityTable
 from modelic.core.contingent_cashflows.survival_contingent_cashflow import SurvivalContingentCashflow
@@ -13,15 +14,18 @@ class PureEndowment(CompositeProduct):
     """ Projects cashflows and calculates present values for death contingent contingent_cashflows """
 
     def __init__(self, yield_curve: YieldCurve, mortality_table: MortalityTable, age: IntArrayLike, term: IntArrayLike,
-                 survival_benefit: ArrayLike):
+                 survival_benefit: ArrayLike, *, frequency: int = 1, deduplicate: bool = False,
+                 commutation: CommutationTable = None):
 
-        components = [SurvivalContingentCashflow(yield_curve, mortality_table, age, term, terminal_cf=survival_benefit)]
+        components = [SurvivalContingentCashflow(yield_curve, mortality_table, age, term, terminal_cf=survival_benefit,
+                                                 frequency=frequency, deduplicate=deduplicate, commutation=commutation)]
 
         super().__init__(components, yield_curve)
 
     @classmethod
     def from_policy_portfolio(cls, policy_data: PolicyPortfolio, yield_curve: YieldCurve, mortality_table: MortalityTable,
-                              *, policy_mask: ArrayLike = None):
+                              *, policy_mask: ArrayLike = None, frequency: int = 1,
+                              deduplicate: bool = False, commutation: CommutationTable = None):
 
         ages = policy_data.ages
         terms = policy_data.terms
@@ -33,6 +37,7 @@ class PureEndowment(CompositeProduct):
             terms = terms[policy_mask]
             terminal_survival_contingent_benefits = terminal_survival_contingent_benefits[policy_mask]
 
-        return cls(yield_curve, mortality_table, ages, terms, terminal_survival_contingent_benefits)
+        return cls(yield_curve, mortality_table, ages, terms, terminal_survival_contingent_benefits, frequency=frequency,
+                   deduplicate=deduplicate, commutation=commutation)
 
 
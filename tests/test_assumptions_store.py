@@ -0,0 +1,113 @@
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from modelic.core.curves import YieldCurve
+from modelic.core.mortality import MortalityTable
+from modelic.assumptions.store import (AssumptionKind, AssumptionRegistry, get_registry, save_expense_spec,
+                                       save_mortality_table, save_yield_curve)
+from _data import data_path
+
+
+class TestAssumptionStore(unittest.TestCase):
+
+    mort_raw = pd.read_csv(data_path("mortality", "AM92.csv"))
+    mortality = MortalityTable(mort_raw['x'].to_numpy(int), mort_raw['q_x'].to_numpy(float), 'AM92')
+
+    disc_raw = pd.read_csv(data_path("curves", "boe_spot_annual.csv"))
+    discount_curve = YieldCurve(disc_raw['year'].to_numpy(int), disc_raw['rate'].to_numpy(float), 'BoE')
+
+    expense_spec = pd.DataFrame({'Product': ['Annuity', 'LifeAssurance'], 'Initial': [100.0, 150.0],
+                                 'Renewal': [20.0, 25.0]})
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.store_dir = Path(self._tmp.name)
+        save_mortality_table(self.store_dir, self.mortality)
+        save_yield_curve(self.store_dir, self.discount_curve)
+        save_expense_spec(self.store_dir, 'standard', self.expense_spec)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip(self):
+        registry = AssumptionRegistry(self.store_dir)
+
+        mortality = registry.mortality_table('AM92')
+        self.assertIsInstance(mortality.qx, np.memmap)
+        np.testing.assert_array_equal(mortality.qx, self.mortality.qx)
+        np.testing.assert_allclose(mortality.npx(np.array([40, 60]), np.array([10, 20])),
+                                   self.mortality.npx(np.array([40, 60]), np.array([10, 20])))
+
+        curve = registry.yield_curve('BoE')
+        self.assertIsInstance(curve.zero_rates, np.memmap)
+        np.testing.assert_array_equal(curve.df(np.arange(1, 11)), self.discount_curve.df(np.arange(1, 11)))
+
+        pd.testing.assert_frame_equal(registry.expense_spec('standard'), self.expense_spec, check_dtype=False)
+        self.assertEqual(registry.names(AssumptionKind.MORTALITY), ['AM92'])
+
+    def test_instances_are_shared(self):
+        registry = get_registry(self.store_dir)
+        self.assertIs(get_registry(str(self.store_dir)), registry)
+        self.assertIs(registry.mortality_table('AM92'), registry.mortality_table('AM92'))
+
+    def test_shared_registry_honours_verify(self):
+        registry = get_registry(self.store_dir)
+        registry.mortality_table('AM92')
+
+        qx = np.load(self.store_dir / AssumptionKind.MORTALITY / 'AM92' / 'qx.npy')
+        qx[0] = 0.5
+        np.save(self.store_dir / AssumptionKind.MORTALITY / 'AM92' / 'qx.npy', qx)
+
+        # The cached registry was created unverified, so asking for verification checks what it already handed out
+        with self.assertRaises(ValueError):
+            get_registry(self.store_dir, verify=True)
+        with self.assertRaises(ValueError):
+            get_registry(self.store_dir, verify=True)
+        self.assertFalse(registry.verify)
+        self.assertIs(get_registry(self.store_dir), registry)
+
+        # The tampered table is dropped and refused, even by the unverified registry
+        with self.assertRaises(ValueError):
+            registry.mortality_table('AM92')
+        self.assertIsNotNone(registry.yield_curve('BoE'))
+
+        np.save(self.store_dir / AssumptionKind.MORTALITY / 'AM92' / 'qx.npy', self.mortality.qx)
+        self.assertIs(get_registry(self.store_dir, verify=True), registry)
+        np.testing.assert_array_equal(registry.mortality_table('AM92').qx, self.mortality.qx)
+
+    def test_refresh_picks_up_recompiled_content(self):
+        registry = AssumptionRegistry(self.store_dir)
+        before = registry.mortality_table('AM92')
+
+        registry.refresh()
+        self.assertIs(registry.mortality_table('AM92'), before)
+
+        qx = self.mortality.qx.copy()
+        qx[:-1] *= 1.1
+        save_mortality_table(self.store_dir, MortalityTable(self.mortality.ages, qx, 'AM92'))
+        registry.refresh()
+        np.testing.assert_allclose(registry.mortality_table('AM92').qx, qx)
+
+    def test_verify_detects_tampering(self):
+        qx = np.load(self.store_dir / AssumptionKind.MORTALITY / 'AM92' / 'qx.npy')
+        qx[0] = 0.5
+        np.save(self.store_dir / AssumptionKind.MORTALITY / 'AM92' / 'qx.npy', qx)
+
+        with self.assertRaises(ValueError):
+            AssumptionRegistry(self.store_dir, verify=True).mortality_table('AM92')
+        with self.assertRaises(KeyError):
+            AssumptionRegistry(self.store_dir).yield_curve('missing')
+
+
+    def test_compiled_test_data_matches_csvs(self):
+        # create_dummy_policies reads the compiled copy of the test CSVs, so it must be recompiled whenever they change
+        registry = AssumptionRegistry(data_path("assumption_store"), verify=True)
+        np.testing.assert_array_equal(registry.mortality_table('AM92').qx, self.mortality.qx)
+        np.testing.assert_array_equal(registry.yield_curve('BoE').zero_rates, self.discount_curve.zero_rates)
+
+
+if __name__ == '__main__':
+    unittest.main()
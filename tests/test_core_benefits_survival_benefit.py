@@ -83,3 +83,63 @@ class TestSurvivalBenefit(unittest.TestCase):
         actual = self.annuity.present_value(aggregate=True)
 
         assert np.allclose(actual, expected)
+
+
+    def test_present_value_qx_multipliers(self):
+
+        multipliers = np.array([1.0, 0.8])
+        stressed = SurvivalContingentCashflow(self.discount_curve, self.mortality, [34, 47, 73], [3, 3, 3],
+                                              periodic_cf=[5, 10, 15], terminal_cf=[1, 2, 3], qx_multipliers=multipliers)
+
+        actual = stressed.present_value(aggregate=False)
+
+        stressed_qx = self.qx * 0.8
+        stressed_qx[-1] = 1.0
+        expected = SurvivalContingentCashflow(self.discount_curve, MortalityTable(self.ages, stressed_qx, 'stressed'),
+                                              [34, 47, 73], [3, 3, 3], periodic_cf=[5, 10, 15], terminal_cf=[1, 2, 3])
+
+        assert actual.shape == (2, 3)
+        assert np.allclose(actual[1], expected.present_value(aggregate=False))
+        assert (actual[1] > actual[0]).all()
+
+
+    def test_present_value_time_chunked(self):
+
+        expected = self.annuity.present_value(aggregate=False)
+
+        actual = self.annuity.present_value(aggregate=False, time_chunk=7)
+
+        assert actual.shape == expected.shape
+        assert np.allclose(actual, expected)
+
+
+    def test_present_value_monthly(self):
+
+        annual = SurvivalContingentCashflow(self.discount_curve, self.mortality, [34, 47, 73], [3, 3, 3],
+                                            periodic_cf=[12, 24, 36])
+        monthly = SurvivalContingentCashflow(self.discount_curve, self.mortality, [34, 47, 73], [3, 3, 3],
+                                             periodic_cf=[12, 24, 36], frequency=12)
+
+        expected_cfs = np.array([1, 2, 3]) * (1 - np.array([0.00066, 0.001802, 0.034144]) / 12)
+
+        assert monthly.times.size == 36
+        assert np.allclose(monthly.project_cashflows(aggregate=False)[0], expected_cfs)
+        assert np.allclose(monthly.present_value(aggregate=False, time_chunk=5), monthly.present_value(aggregate=False))
+        assert (monthly.present_value(aggregate=False) > annual.present_value(aggregate=False)).all()
+
+    def test_ragged_cashflows(self):
+
+        rng = np.random.default_rng(11)
+        ages = rng.integers(20, 80, 40)
+        terms = np.where(rng.random(40) < 0.1, np.nan, rng.integers(1, 30, 40))
+
+        for kwargs in ({}, {'qx_multipliers': np.array([0.8, 1.2])}, {'frequency': 4}):
+            benefit = SurvivalContingentCashflow(self.discount_curve, self.mortality, ages, terms,
+                                                 periodic_cf=rng.random(40) * 100, terminal_cf=rng.random(40) * 1000,
+                                                 escalation=0.02, **kwargs)
+            ragged = benefit.project_cashflows(aggregate=False, ragged=True)
+
+            assert ragged.values.shape[-1] == ragged.lengths.sum() < benefit.times.size * ages.size
+            assert np.allclose(ragged.to_dense(), benefit.project_cashflows(aggregate=False))
+            assert np.allclose(benefit.project_cashflows(ragged=True), benefit.project_cashflows())
+            assert np.allclose(benefit.present_value(aggregate=False, ragged=True), benefit.present_value(aggregate=False))
@@ -0,0 +1,91 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from modelic.core.mortality import MortalityTable
+from modelic.core.cohort_mortality import MortalityTable2D, SelectMortalityTable
+from _data import data_path
+
+
+class TestMortalityTable2D(unittest.TestCase):
+
+    df = pd.read_csv(data_path("mortality", "AM92.csv"))
+    ages = df['x'].to_numpy(int)
+    qx = df['q_x'].to_numpy(float)
+    mort = MortalityTable(ages, qx, 'AM92')
+
+    years = np.arange(2020, 2031)
+    improvement = (1 - 0.02) ** np.arange(years.size)
+    qx_2d = np.minimum(qx[:, None] * improvement[None, :], 1.0)
+    qx_2d[-1] = 1.0
+    mort_2d = MortalityTable2D(ages, years, qx_2d, 'AM92 improved', base_year=2022)
+
+    def test_flat_table_matches_1d(self):
+
+        flat = MortalityTable2D(self.ages, self.years, np.repeat(self.qx[:, None], self.years.size, axis=1), 'flat')
+
+        assert np.allclose(flat.npx([34, 47, 73], [3, 2, 3], full_path=True),
+                           self.mort.npx([34, 47, 73], [3, 2, 3], full_path=True))
+        assert np.allclose(flat.nqx([34, 47, 117], 5, full_path=True), self.mort.nqx([34, 47, 117], 5, full_path=True))
+
+    def test_npx_follows_cohort_diagonal(self):
+
+        ages = np.array([34, 47, 73])
+        actual = self.mort_2d.npx(ages, 12, full_path=True)
+
+        for j, age in enumerate(ages):
+            year_idx = np.minimum(2022 - self.years[0] + np.arange(12), self.years.size - 1)
+            q = self.qx_2d[age - self.ages[0] + np.arange(12), year_idx]
+            assert np.allclose(actual[:, j], np.cumprod(1 - q))
+
+    def test_nqx_follows_cohort_diagonal(self):
+
+        ages = np.array([34, 47, 73])
+        actual = self.mort_2d.nqx(ages, 4, full_path=True)
+
+        for j, age in enumerate(ages):
+            q = self.qx_2d[age - self.ages[0] + np.arange(4), 2 + np.arange(4)]
+            surv = np.concatenate(([1.0], np.cumprod(1 - q)[:-1]))
+            assert np.allclose(actual[:, j], surv * q)
+
+    def test_explicit_birth_year(self):
+
+        expected = self.mort_2d.npx(50, 10)
+        actual = MortalityTable2D(self.ages, self.years, self.qx_2d, 'AM92 improved', base_year=2020).npx(50, 10, cohort=1972)
+
+        assert np.allclose(actual, expected)
+
+
+class TestSelectMortalityTable(unittest.TestCase):
+
+    df = pd.read_csv(data_path("mortality", "AM92.csv"))
+    ages = df['x'].to_numpy(int)
+    qx = df['q_x'].to_numpy(float)
+    mort = MortalityTable(ages, qx, 'AM92')
+
+    select_qx = np.stack([qx * 0.6, qx * 0.8], axis=1)
+    select = SelectMortalityTable(ages, qx, select_qx, 'AM92 select')
+
+    def test_ultimate_after_select_period(self):
+
+        expected = np.cumprod(1 - np.concatenate(([self.qx[34 - 17] * 0.6, self.qx[34 - 17] * 0.8],
+                                                  self.qx[36 - 17:39 - 17])))
+
+        actual = self.select.npx(34, 5, full_path=True)[:, 0]
+
+        assert np.allclose(actual, expected)
+
+    def test_selected_earlier_is_ultimate(self):
+
+        expected = self.mort.npx([50, 60], [5, 7])
+        actual = self.select.npx([50, 60], [5, 7], cohort=[40, 45])
+
+        assert np.allclose(actual, expected)
+
+    def test_nqx_within_select_period(self):
+
+        expected = (1 - self.qx[33] * 0.6) * self.qx[33] * 0.8
+
+        actual = self.select.nqx(50, 2)
+
+        assert np.allclose(actual, expected)
@@ -0,0 +1,110 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from modelic.core.curves import YieldCurve
+from modelic.core.mortality import MortalityTable
+from modelic.core.commutation import CommutationTable
+from modelic.core.policy_portfolio import PolicyPortfolio
+from modelic.core.contingent_cashflows.death_contingent_cashflow import DeathContingentCashflow
+from modelic.core.contingent_cashflows.survival_contingent_cashflow import SurvivalContingentCashflow
+from modelic.expenses.expense_engine import ExpenseEngine
+from modelic.products.endowment import Endowment
+from _data import data_path
+
+
+class TestCommutationTable(unittest.TestCase):
+
+    mort_raw = pd.read_csv(data_path("mortality", "AM92.csv"))
+    ages = mort_raw['x'].to_numpy(int)
+    qx = mort_raw['q_x'].to_numpy(float)
+    mortality = MortalityTable(ages, qx, 'AM92')
+
+    disc_raw = pd.read_csv(data_path("curves", "boe_spot_annual.csv"))
+    discount_curve = YieldCurve(disc_raw['year'].to_numpy(int), disc_raw['rate'].to_numpy(float), 'BoE')
+    flat_curve = YieldCurve(np.arange(1, 151), np.full(150, 0.04), '4% flat')
+
+    policy_ages = np.array([17, 30, 45, 60, 75, 100, 120])
+    policy_terms = np.array([1, 10, 25, np.nan, 5, 30, 3])
+
+    def _projected(self, curve, **kwargs):
+        age, term = self.policy_ages, self.policy_terms
+        return {'assurance': DeathContingentCashflow(curve, self.mortality, age, term, 1.0, **kwargs),
+                'annuity': SurvivalContingentCashflow(curve, self.mortality, age, term, periodic_cf=1.0, **kwargs),
+                'pure_endowment': SurvivalContingentCashflow(curve, self.mortality, age, term, terminal_cf=1.0, **kwargs)}
+
+    def test_flat_rate_factors_match_projection(self):
+
+        table = CommutationTable.from_rate(self.mortality, 0.04)
+        for factor, model in self._projected(self.flat_curve).items():
+            expected = model.present_value(aggregate=False)
+            np.testing.assert_allclose(getattr(table, factor)(self.policy_ages, self.policy_terms), expected,
+                                       rtol=1e-10, atol=1e-14)
+
+        np.testing.assert_allclose(table.Nx[:-1] - table.Nx[1:], table.Dx[:-1])
+        np.testing.assert_allclose(table.annuity_due(self.policy_ages, self.policy_terms),
+                                   1 + table.annuity(self.policy_ages, np.nan_to_num(self.policy_terms, nan=103) - 1))
+
+    def test_curve_factors_match_projection(self):
+
+        table = CommutationTable.from_curve(self.mortality, self.discount_curve)
+        for factor, model in self._projected(self.discount_curve).items():
+            expected = model.present_value(aggregate=False)
+            np.testing.assert_allclose(getattr(table, factor)(self.policy_ages, self.policy_terms), expected,
+                                       rtol=1e-10, atol=1e-14)
+
+        with self.assertRaises(ValueError):
+            table.Dx
+
+    def test_escalated_factors_match_projection(self):
+
+        table = CommutationTable.from_rate(self.mortality, 0.04, escalation=0.03)
+        for factor, model in self._projected(self.flat_curve, escalation=0.03).items():
+            expected = model.present_value(aggregate=False)
+            np.testing.assert_allclose(getattr(table, factor)(self.policy_ages, self.policy_terms), expected,
+                                       rtol=1e-10, atol=1e-14)
+
+    def test_products_and_expenses_use_commutation(self):
+
+        table = CommutationTable.from_rate(self.mortality, 0.04)
+        policies = PolicyPortfolio(self.policy_ages, self.policy_terms,
+                                   death_contingent_benefits=np.linspace(100, 700, 7),
+                                   terminal_survival_contingent_benefits=np.linspace(50, 350, 7))
+
+        expected = Endowment.from_policy_portfolio(policies, self.flat_curve, self.mortality)
+        actual = Endowment.from_policy_portfolio(policies, self.flat_curve, self.mortality, commutation=table)
+        np.testing.assert_allclose(actual.present_value(aggregate=False), expected.present_value(aggregate=False))
+
+        with self.assertRaises(ValueError):
+            actual.present_value(0.01)
+
+        policy_data = pd.read_csv(data_path('policy_data', 'mixed_policies.csv'))
+        expense_spec = pd.DataFrame({'Product': ['Term Assurance', 'Annuity', 'Endowment'] * 2,
+                                     'Basis': ['PER_POLICY'] * 6,
+                                     'Type': ['INITIAL'] * 3 + ['RENEWAL', 'SURVIVAL', 'DEATH'],
+                                     'Amount': [100.0, 150.0, 120.0, 20.0, 30.0, 40.0]})
+        policy_data = PolicyPortfolio.from_df(policy_data)
+
+        escalated = CommutationTable.from_rate(self.mortality, 0.04, escalation=0.02)
+        projected = ExpenseEngine(expense_spec, self.flat_curve, self.mortality, 0.02)
+        from_commutation = ExpenseEngine(expense_spec, self.flat_curve, self.mortality, 0.02, commutation=escalated)
+        np.testing.assert_allclose(from_commutation.present_value(policy_data)['Expense PV'],
+                                   projected.present_value(policy_data)['Expense PV'])
+
+        with self.assertRaises(ValueError):
+            ExpenseEngine(expense_spec, self.flat_curve, self.mortality, 0.03,
+                          commutation=escalated).present_value(policy_data)
+
+    def test_unsupported_bases_raise(self):
+
+        table = CommutationTable.from_rate(self.mortality, 0.04)
+        with self.assertRaises(ValueError):
+            DeathContingentCashflow(self.flat_curve, self.mortality, [40], [10], commutation=table,
+                                    qx_multipliers=np.array([1.1]))
+        with self.assertRaises(ValueError):
+            SurvivalContingentCashflow(self.flat_curve, self.mortality, [40], [10], periodic_cf=1.0, frequency=12,
+                                       commutation=table)
+
+
+if __name__ == '__main__':
+    unittest.main()
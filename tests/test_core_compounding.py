@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+
+from modelic.core import compounding
+
+
+class TestCompounding(unittest.TestCase):
+
+    years = np.arange(1, 11)
+    rates = np.array([[0.01, 0.015, 0.02, 0.022, 0.025, 0.027, 0.03, 0.031, 0.032, 0.033],
+                      [0.04, 0.04, 0.04, 0.04, 0.04, 0.04, 0.04, 0.04, 0.04, 0.04],
+                      [-0.005, 0.0, 0.004, 0.01, 0.012, 0.02, 0.021, 0.021, 0.025, 0.03]])
+
+    def test_zero_df_round_trip(self):
+
+        dfs = compounding.zero_to_df(self.years, self.rates)
+        np.testing.assert_allclose(dfs[1], 1.04 ** -self.years)
+        np.testing.assert_allclose(compounding.df_to_zero(self.years, dfs), self.rates, atol=1e-15)
+        np.testing.assert_allclose(compounding.acc(self.years, self.rates) * dfs, 1.0)
+        self.assertIs(compounding.df, compounding.zero_to_df)
+
+        by_column = compounding.zero_to_df(self.years[:, None], self.rates.T)
+        np.testing.assert_allclose(by_column, dfs.T)
+
+    def test_forwards(self):
+
+        fwds = compounding.fwd_from_zeros(self.years, self.rates)
+        np.testing.assert_allclose(fwds[1], 0.04)
+        np.testing.assert_allclose(fwds[:, 0], self.rates[:, 0])
+        np.testing.assert_allclose(compounding.fwd_to_df(self.years, fwds), compounding.zero_to_df(self.years, self.rates))
+
+        # Uneven periods: the forward over (2, 5] compounds for 3 years
+        years = np.array([2, 5])
+        fwds = compounding.fwd_from_df(years, np.array([1.03 ** -2, 1.03 ** -2 * 1.05 ** -3]))
+        np.testing.assert_allclose(fwds, [0.03, 0.05])
+
+    def test_annuities(self):
+
+        immediate = compounding.annuity_immediate(self.years, self.rates)
+        due = compounding.annuity_due(self.years, self.rates)
+        v = 1 / 1.04
+        np.testing.assert_allclose(immediate[1], v * (1 - v ** self.years) / (1 - v))
+        np.testing.assert_allclose(due[1], (1 - v ** self.years) / (1 - v))
+        np.testing.assert_allclose(due[:, 1:] - immediate[:, :-1], 1.0)
+
+    def test_par_swaps(self):
+
+        dfs = compounding.zero_to_df(self.years, self.rates)
+        par_rates = compounding.par_swap_from_df(self.years, dfs)
+        np.testing.assert_allclose(par_rates[1], 0.04)
+        np.testing.assert_allclose(compounding.par_swap_to_df(self.years, par_rates), dfs, rtol=1e-12)
+
+        # Each bootstrapped factor prices its own par swap: s_n * sum(df_1..n) + df_n = 1
+        long_years = np.arange(1, 61)
+        swaps = 0.02 + 0.015 * (1 - np.exp(-long_years / 15)) + np.array([[-0.01], [0.0], [0.02]])
+        bootstrapped = compounding.par_swap_to_df(long_years, swaps)
+        np.testing.assert_allclose(swaps * bootstrapped.cumsum(axis=-1) + bootstrapped, 1.0, rtol=1e-12)
+
+        out = np.empty_like(swaps)
+        self.assertIs(compounding.par_swap_to_df(long_years, swaps, out=out), out)
+        np.testing.assert_allclose(out, bootstrapped)
+
+    def test_zero_convert(self):
+
+        continuous = compounding.zero_convert(self.rates, 'annual', 'continuous')
+        np.testing.assert_allclose(continuous, np.log1p(self.rates))
+        np.testing.assert_allclose(compounding.zero_convert(0.04, 'annual', 'semi_annual'), 2 * (1.04 ** 0.5 - 1))
+        np.testing.assert_allclose(compounding.zero_convert(continuous, 'continuous', 'annual'), self.rates,
+                                   atol=1e-15)
+
+        with self.assertRaises(ValueError):
+            compounding.zero_convert(self.rates, 'annual', 'weekly')
+
+    def test_out_buffers(self):
+
+        out = np.empty_like(self.rates)
+        for kernel in (compounding.zero_to_df, compounding.acc, compounding.fwd_from_zeros,
+                       compounding.annuity_immediate, compounding.annuity_due):
+            result = kernel(self.years, self.rates, out=out)
+            self.assertIs(result, out)
+            np.testing.assert_allclose(out, kernel(self.years, self.rates))
+
+        dfs = compounding.zero_to_df(self.years, self.rates)
+        self.assertIs(compounding.df_to_zero(self.years, dfs, out=out), out)
+        self.assertIs(compounding.fwd_to_df(self.years, self.rates, out=out), out)
+        self.assertIs(compounding.zero_convert(self.rates, 'annual', 'monthly', out=out), out)
+
+
+if __name__ == '__main__':
+    unittest.main()
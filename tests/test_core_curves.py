@@ -1,7 +1,11 @@
 import unittest
+import numpy as np
 import pandas as pd
 
-from modelic.core.curves import YieldCurve
+from modelic.core.compounding import par_swap_from_df, zero_to_df
+from modelic.assumptions.interest import apply_spread, build_par_swap_curve, twist
+from modelic.core.curves import IndexCurve, YieldCurve, YieldCurveSet
+from modelic.core.enums import Extrapolation, Interpolation
 
 
 
@@ -13,4 +17,167 @@ class TestYieldCurve(unittest.TestCase):
     zeros = base_spot['rate'].to_numpy(float)
     yc = YieldCurve(times, zeros, 'BoE')
 
+    def test_transforms(self):
 
+        t = np.arange(1, 11)
+        np.testing.assert_allclose(self.yc.with_spread(25).zero(t), self.yc.zero(t) + 0.0025)
+        np.testing.assert_allclose(self.yc.shifted(-10).df(t), zero_to_df(t, self.yc.zero(t) - 0.001))
+        np.testing.assert_allclose(self.yc.scaled(1.5).zero(t), self.yc.zero(t) * 1.5)
+        np.testing.assert_allclose(apply_spread(self.yc, 0.01).zero(t), self.yc.zero(t) + 0.01)
+
+        by_time = np.linspace(0, 0.01, self.times.size)
+        np.testing.assert_allclose(apply_spread(self.yc, by_time).zero_rates, self.zeros + by_time)
+        with self.assertRaises(ValueError):
+            apply_spread(self.yc, np.zeros(3))
+
+    def test_transforms_are_lazy_and_collapse(self):
+
+        chained = self.yc.shifted(100).scaled(2.0).with_spread(-50)
+        self.assertIs(chained.base, self.yc)
+        self.assertIs(chained.times, self.yc.times)
+        self.assertNotIn('zero_rates', chained.__dict__)
+        self.assertEqual(chained.scale, 2.0)
+        np.testing.assert_allclose(chained.shift, 0.015)
+
+        self.assertIsNot(chained.fingerprint, None)
+        self.assertNotIn('zero_rates', chained.__dict__)
+        np.testing.assert_allclose(chained.zero_rates, (self.zeros + 0.01) * 2 - 0.005)
+        self.assertIs(chained.zero_rates, chained.zero_rates)
+        self.assertNotEqual(chained.fingerprint, self.yc.scaled(2.0).fingerprint)
+
+    def test_twist(self):
+
+        twisted = twist(self.yc, -0.01, 0.02, 10)
+        shift = twisted.zero_rates - self.zeros
+        np.testing.assert_allclose(shift[[0, 9, -1]], [-0.01, 0.0, 0.02], atol=1e-15)
+        np.testing.assert_allclose(np.diff(shift[:10]), 0.01 / 9)
+
+        with self.assertRaises(ValueError):
+            twist(self.yc, -0.01, 0.02, self.times[-1])
+
+    def test_interpolation(self):
+
+        for method in Interpolation:
+            curve = YieldCurve(self.times, self.zeros, 'BoE', interpolation=method)
+            np.testing.assert_allclose(curve.zero(self.times.astype(float)), self.zeros, rtol=1e-12)
+            np.testing.assert_allclose(curve.zero(np.array([0.25, 150.0, 175.5])), self.zeros[[0, -1, -1]])
+
+        t = np.array([1.5, 7.25])
+        linear = YieldCurve(self.times, self.zeros, 'BoE')
+        np.testing.assert_allclose(linear.zero(t), [self.zeros[:2].mean(), 0.75 * self.zeros[6] + 0.25 * self.zeros[7]])
+        log_linear = YieldCurve(self.times, self.zeros, 'BoE', interpolation=Interpolation.LOG_LINEAR_DF)
+        np.testing.assert_allclose(log_linear.df(1.5), np.sqrt(self.yc.df(1) * self.yc.df(2)))
+        # Before the first time ln df runs linearly from ln df(0) = 0
+        short = YieldCurve(self.times[2:], self.zeros[2:], 'BoE', interpolation=Interpolation.LOG_LINEAR_DF)
+        np.testing.assert_allclose(short.df(np.array([0.5, 2.0])),
+                                   short.df(self.times[2]) ** (np.array([0.5, 2.0]) / self.times[2]))
+
+        # Monotone convex forwards are continuous on a smooth curve, where linear zero forwards kink at each time
+        times = np.arange(1, 31)
+        smooth = 0.01 + 0.02 * (1 - np.exp(-times / 8)) + 0.002 * np.sin(times / 2)
+        nodes, eps = times[1:-1].astype(float), 1e-6
+        for method, tolerance in ((Interpolation.MONOTONE_CONVEX, 1e-6), (Interpolation.LINEAR_ZERO, None)):
+            log_df = lambda t: np.log(YieldCurve(times, smooth, 'smooth', interpolation=method).df(t))
+            jumps = np.abs((log_df(nodes + eps) - log_df(nodes)) - (log_df(nodes) - log_df(nodes - eps))) / eps
+            if tolerance:
+                self.assertLess(jumps.max(), tolerance)
+            else:
+                self.assertGreater(jumps.max(), 1e-4)
+
+        with self.assertRaises(ValueError):
+            YieldCurve(self.times, self.zeros, 'BoE', interpolation='cubic').zero(1.5)
+
+    def test_smith_wilson_extrapolation(self):
+
+        curve = YieldCurve(self.times[:20], self.zeros[:20], 'BoE 20y', extrapolation=Extrapolation.SMITH_WILSON,
+                           ufr=0.036, alpha=0.1)
+        np.testing.assert_allclose(curve.zero(np.array([5, 20])), self.zeros[[4, 19]])
+        np.testing.assert_allclose(curve.zero(20.0 + 1e-9), self.zeros[19], rtol=1e-6)
+        self.assertIs(curve._smith_wilson_weights, curve._smith_wilson_weights)
+
+        long_end = np.array([200.0, 201.0])
+        forward = np.log(curve.df(long_end[0]) / curve.df(long_end[1]))
+        np.testing.assert_allclose(forward, np.log1p(0.036), rtol=1e-4)
+
+        # Derived curves extrapolate their own rates with the base curve's settings
+        shifted = curve.shifted(100)
+        self.assertEqual(shifted.extrapolation, Extrapolation.SMITH_WILSON)
+        np.testing.assert_allclose(shifted.zero(np.array([10, 20])), self.zeros[[9, 19]] + 0.01)
+        self.assertGreater(shifted.zero(60.0), curve.zero(60.0))
+
+
+class TestYieldCurveSet(unittest.TestCase):
+
+    base_spot = pd.read_csv("data/curves/boe_spot_annual.csv")
+    times = base_spot['year'].to_numpy(int)
+    zeros = base_spot['rate'].to_numpy(float)
+    curves = [YieldCurve(times, zeros - 0.01, 'BoE down'), YieldCurve(times, zeros, 'BoE'),
+              YieldCurve(times, zeros + 0.02, 'BoE up')]
+    scenarios = YieldCurveSet.from_curves(curves, 'BoE shifts')
+
+    def test_discount_factors(self):
+
+        t = np.arange(1, 11)
+        actual = self.scenarios.discount_factors(t)
+
+        assert actual.shape == (3, 10)
+        for s, curve in enumerate(self.curves):
+            assert np.allclose(actual[s], zero_to_df(t, curve.zero(t)))
+            assert np.allclose(self.scenarios[s].zero_rates, curve.zero_rates)
+
+        assert np.allclose(self.scenarios.discount_factors(t, slice(1, 2), spread=0.02), actual[2:])
+
+    def test_off_grid(self):
+
+        t = np.array([0.5, 1.25, 7.75, 49.9, 150.0, 175.5])
+        for method in Interpolation:
+            for extrapolation in Extrapolation:
+                curves = YieldCurveSet(self.times[:50], self.scenarios.zero_rates[:, :50], 'BoE 50y',
+                                       interpolation=method, extrapolation=extrapolation)
+                expected = np.stack([curves[s].zero(t) for s in range(len(curves))])
+                np.testing.assert_allclose(curves.zero(t), expected, rtol=1e-12)
+                np.testing.assert_allclose(curves.discount_factors(t, slice(1, 3)), zero_to_df(t, expected[1:]))
+
+    def test_par_swap_curves(self):
+
+        par_rates = np.stack([par_swap_from_df(self.times, zero_to_df(self.times, c.zero_rates)) for c in self.curves])
+        scenarios = build_par_swap_curve(self.times, par_rates, 'BoE swaps')
+        np.testing.assert_allclose(scenarios.zero_rates, self.scenarios.zero_rates, atol=1e-12)
+
+        single = build_par_swap_curve(self.times, par_rates[1])
+        self.assertIsInstance(single, YieldCurve)
+        np.testing.assert_allclose(single.zero_rates, self.zeros, atol=1e-12)
+
+    def test_validation(self):
+
+        with self.assertRaises(ValueError):
+            YieldCurveSet(self.times, self.zeros, 'one curve')
+        with self.assertRaises(ValueError):
+            YieldCurveSet.from_curves([self.curves[0], YieldCurve(self.times[:10], self.zeros[:10], 'short')], 'bad')
+
+
+class TestIndexCurve(unittest.TestCase):
+
+    years = np.arange(0, 11)
+    levels = 100.0 * np.cumprod(np.append(1.0, np.linspace(1.02, 1.04, 10)))
+    rpi = IndexCurve(years, levels, 'RPI')
+
+    def test_level(self):
+
+        np.testing.assert_allclose(self.rpi.level(np.array([0, 3, 10])), self.levels[[0, 3, 10]])
+        np.testing.assert_allclose(self.rpi.level(2.5), np.sqrt(self.levels[2] * self.levels[3]))
+        np.testing.assert_allclose(self.rpi.level(12), self.levels[10] * 1.04 ** 2)
+        np.testing.assert_allclose(self.rpi.level(-1.0), self.levels[0] / 1.02)
+
+    def test_ratios(self):
+
+        t = np.arange(1, 11)
+        np.testing.assert_allclose(self.rpi.ratio(t, 1), np.linspace(1.02, 1.04, 10))
+        np.testing.assert_allclose(self.rpi.uplift(t), self.levels[1:] / 100.0)
+
+        nominal = YieldCurve(np.arange(1, 11), np.full(10, 0.05), '5%')
+        np.testing.assert_allclose(self.rpi.real_df(nominal, t), 1.05 ** -t * self.levels[1:] / 100.0)
+
+        wedged = self.rpi.with_wedge(100)
+        np.testing.assert_allclose(wedged.ratio(t, 1), np.linspace(1.02, 1.04, 10) * 1.01)
+        self.assertEqual(wedged.level(0), self.rpi.level(0))
@@ -3,6 +3,7 @@ import numpy as np
 import pandas as pd
 
 from modelic.core.curves import YieldCurve
+from modelic.core.discount_cache import DISCOUNT_CACHE
 from modelic.core.mortality import MortalityTable
 from modelic.core.contingent_cashflows.death_contingent_cashflow import DeathContingentCashflow
 from _data import data_path
@@ -58,3 +59,108 @@ class TestDeathContingentCashflow(unittest.TestCase):
         actual = self.wol_death_benefit.present_value(aggregate=True)
 
         assert np.allclose(actual, expected)
+
+
+    def test_present_value_qx_multipliers(self):
+
+        multipliers = [1.0, 1.15, 0.8]
+        stressed = DeathContingentCashflow(self.discount_curve, self.mortality, [34, 47, 73], [np.nan, np.nan, np.nan],
+                                           [5, 10, 15], qx_multipliers=multipliers)
+
+        actual = stressed.present_value(aggregate=False)
+
+        assert actual.shape == (3, 3)
+        assert np.allclose(actual[0], self.wol_death_benefit.present_value(aggregate=False))
+        assert np.allclose(stressed.present_value(aggregate=True), actual.sum(axis=1))
+
+        for k, multiplier in enumerate(multipliers):
+            stressed_qx = np.minimum(self.qx * multiplier, 1.0)
+            stressed_qx[-1] = 1.0
+            expected = DeathContingentCashflow(self.discount_curve, MortalityTable(self.ages, stressed_qx, 'stressed'),
+                                               [34, 47, 73], [3, 3, 3], [5, 10, 15])
+            actual = DeathContingentCashflow(self.discount_curve, self.mortality, [34, 47, 73], [3, 3, 3], [5, 10, 15],
+                                             qx_multipliers=multipliers).project_cashflows(aggregate=False)[k]
+
+            assert np.allclose(actual, expected.project_cashflows(aggregate=False))
+
+
+    def test_present_value_monthly(self):
+
+        monthly = DeathContingentCashflow(self.discount_curve, self.mortality, [34, 47, 73], [3, 3, 3], [5, 10, 15],
+                                          frequency=12)
+
+        actual = monthly.project_cashflows(aggregate=False)
+
+        assert actual.shape == (36, 3)
+        assert np.allclose(actual.reshape(3, 12, 3).sum(axis=1), self.term_death_benefit.project_cashflows(aggregate=False))
+        assert np.allclose(monthly.present_value(aggregate=False, time_chunk=5), monthly.present_value(aggregate=False))
+
+    def test_present_value_policy_chunks(self):
+
+        rng = np.random.default_rng(7)
+        ages = rng.integers(20, 80, 50)
+        terms = np.where(rng.random(50) < 0.2, np.nan, rng.integers(1, 40, 50))
+        death_benefit = DeathContingentCashflow(self.discount_curve, self.mortality, ages, terms, rng.random(50) * 1000,
+                                                qx_multipliers=np.array([0.9, 1.1]))
+
+        expected = death_benefit.present_value(aggregate=False)
+        np.testing.assert_allclose(death_benefit.present_value(aggregate=False, policy_chunk=7), expected, rtol=1e-12)
+        np.testing.assert_allclose(death_benefit.present_value(max_memory=20_000), expected.sum(axis=-1), rtol=1e-12)
+
+        spread = rng.random(50) * 0.01
+        np.testing.assert_allclose(death_benefit.present_value(spread, aggregate=False, policy_chunk=16),
+                                   death_benefit.present_value(spread, aggregate=False), rtol=1e-12)
+
+    def test_policy_chunks_leave_shared_cache_alone(self):
+
+        rng = np.random.default_rng(11)
+        n = 2_000
+        death_benefit = DeathContingentCashflow(self.discount_curve, self.mortality, rng.integers(20, 80, n),
+                                                np.full(n, np.nan), rng.random(n) * 1000)
+        spread = rng.random(n) * 0.01
+        expected = death_benefit.present_value(spread, aggregate=False)
+
+        before = dict(DISCOUNT_CACHE._cache)
+        for options in ({'max_memory': 200_000}, {'policy_chunk': 1}):
+            np.testing.assert_allclose(death_benefit.present_value(spread, aggregate=False, **options), expected,
+                                       rtol=1e-12)
+            self.assertEqual(DISCOUNT_CACHE._cache.keys(), before.keys())
+
+    def test_ragged_cashflows(self):
+
+        rng = np.random.default_rng(5)
+        ages = rng.integers(20, 80, 40)
+        terms = np.where(rng.random(40) < 0.1, np.nan, rng.integers(1, 30, 40))
+        spread = rng.random(40) * 0.01
+
+        for kwargs in ({}, {'qx_multipliers': np.array([0.8, 1.2])}, {'frequency': 12}):
+            benefit = DeathContingentCashflow(self.discount_curve, self.mortality, ages, terms, rng.random(40) * 1000,
+                                              escalation=0.01, **kwargs)
+            ragged = benefit.project_cashflows(aggregate=False, ragged=True)
+
+            assert ragged.values.shape[-1] == ragged.lengths.sum() < benefit.times.size * ages.size
+            assert np.allclose(ragged.to_dense(), benefit.project_cashflows(aggregate=False))
+            assert np.allclose(benefit.present_value(spread, aggregate=False, ragged=True),
+                               benefit.present_value(spread, aggregate=False))
+            assert np.allclose(benefit.present_value(ragged=True, policy_chunk=9), benefit.present_value())
+
+    def test_present_value_deduplicated(self):
+
+        rng = np.random.default_rng(3)
+        ages = rng.choice([30, 40, 50], 200)
+        terms = rng.choice([5, 10, np.nan], 200)
+        amounts = rng.random(200) * 1000
+
+        for kwargs in ({}, {'qx_multipliers': np.array([0.9, 1.1])}, {'frequency': 4}):
+            benefit = DeathContingentCashflow(self.discount_curve, self.mortality, ages, terms, amounts, **kwargs)
+            deduplicated = DeathContingentCashflow(self.discount_curve, self.mortality, ages, terms, amounts,
+                                                   deduplicate=True, **kwargs)
+
+            inverse, units = deduplicated._model_points()
+            assert units[0][0].age.size == 9
+            assert np.allclose(deduplicated.present_value(aggregate=False), benefit.present_value(aggregate=False))
+            assert np.allclose(deduplicated.present_value(0.01, ragged=True), benefit.present_value(0.01))
+
+        # Spreads per policy fall back to valuing every policy
+        spread = rng.random(200) * 0.01
+        assert np.allclose(deduplicated.present_value(spread), benefit.present_value(spread))
@@ -0,0 +1,79 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from modelic.core.compounding import zero_to_df
+from modelic.core.curves import YieldCurve
+from modelic.core.mortality import MortalityTable
+from modelic.core.discount_cache import DiscountFactorCache
+from modelic.core.policy_portfolio import PolicyPortfolio
+from modelic.products.endowment import Endowment
+from _data import data_path
+
+
+class TestDiscountFactorCache(unittest.TestCase):
+
+    mort_raw = pd.read_csv(data_path("mortality", "AM92.csv"))
+    mortality = MortalityTable(mort_raw['x'].to_numpy(int), mort_raw['q_x'].to_numpy(float), 'AM92')
+
+    disc_raw = pd.read_csv(data_path("curves", "boe_spot_annual.csv"))
+    discount_curve = YieldCurve(disc_raw['year'].to_numpy(int), disc_raw['rate'].to_numpy(float), 'BoE')
+
+    def test_matches_direct_calculation(self):
+        cache = DiscountFactorCache()
+        times = np.arange(1, 21)
+        spread = np.array([0.0, 0.01, 0.02])
+
+        df = cache.discount_factors(self.discount_curve, times, spread)
+        expected = zero_to_df(times[:, None], self.discount_curve.zero(times)[:, None] + spread)
+        np.testing.assert_allclose(df, expected)
+        self.assertFalse(df.flags.writeable)
+
+    def test_only_single_spreads_are_cached(self):
+        cache = DiscountFactorCache()
+        times = np.arange(1, 21)
+        per_policy = np.linspace(0.0, 0.02, 1000)
+
+        df = cache.discount_factors(self.discount_curve, times, per_policy)
+        self.assertEqual(df.shape, (20, 1000))
+        self.assertEqual(cache.cache_info(), {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 128})
+
+        cache.discount_factors(self.discount_curve, times, np.array([0.01]))
+        self.assertEqual(cache.cache_info()['size'], 1)
+
+    def test_hits_misses_and_eviction(self):
+        cache = DiscountFactorCache(maxsize=2)
+        times = np.arange(1, 11)
+
+        first = cache.discount_factors(self.discount_curve, times)
+        self.assertIs(cache.discount_factors(self.discount_curve, times.copy()), first)
+        cache.discount_factors(self.discount_curve, times, 0.01)
+        cache.discount_factors(self.discount_curve, times[:5])
+        self.assertEqual(cache.cache_info(), {'hits': 1, 'misses': 3, 'size': 2, 'maxsize': 2})
+
+        # The unspread entry was least recently used and has been evicted
+        self.assertIsNot(cache.discount_factors(self.discount_curve, times), first)
+        self.assertEqual(cache.misses, 4)
+
+        cache.clear()
+        self.assertEqual(cache.cache_info(), {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 2})
+
+    def test_composite_components_share_factors(self):
+        policies = PolicyPortfolio(np.array([30, 40, 50]), np.array([10, 20, 30]),
+                                   death_contingent_benefits=np.array([1000.0, 2000.0, 3000.0]),
+                                   terminal_survival_contingent_benefits=np.array([500.0, 500.0, 500.0]))
+        endowment = Endowment.from_policy_portfolio(policies, self.discount_curve, self.mortality)
+
+        cache = DiscountFactorCache()
+        for component in endowment.components:
+            component.df_cache = cache
+
+        pv = endowment.present_value()
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(endowment.present_value(), pv)
+        self.assertEqual(cache.misses, 1)
+        self.assertGreater(cache.hits, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from modelic.core.curves import YieldCurve
+from modelic.core.mortality import MortalityTable
+from modelic.core.model_points import compress
+from modelic.core.policy_portfolio import PolicyPortfolio
+from modelic.pricers.pricing_engine import PricingEngine
+from modelic.products.endowment import Endowment
+from _data import data_path
+
+
+class TestModelPoints(unittest.TestCase):
+
+    try:
+        expense_spec = pd.read_csv('./../Parameters/expense_spec.csv')
+    except FileNotFoundError:
+        expense_spec = pd.read_csv('./Parameters/expense_spec.csv')
+
+    mort_raw = pd.read_csv(data_path("mortality", "AM92.csv"))
+    mortality = MortalityTable(mort_raw['x'].to_numpy(int), mort_raw['q_x'].to_numpy(float), 'AM92')
+
+    disc_raw = pd.read_csv(data_path("curves", "boe_spot_annual.csv"))
+    discount_curve = YieldCurve(disc_raw['year'].to_numpy(int), disc_raw['rate'].to_numpy(float), 'BoE')
+
+    eng = PricingEngine(mortality, discount_curve, expense_spec, 0.03)
+    mixed = PolicyPortfolio.from_csv(data_path("policy_data", "mixed_policies.csv"))
+
+    def benefit_pvs(self, policies: PolicyPortfolio) -> np.ndarray:
+        return self.eng.present_value_of_benefits(policies).to_numpy()
+
+    def test_unit_bands_keep_every_policy(self):
+
+        model_points = compress(self.mixed, age_band=1, term_band=1)
+        full = self.benefit_pvs(self.mixed)
+
+        self.assertEqual(model_points.count, self.mixed.count)
+        np.testing.assert_array_equal(model_points.weights, 1.0)
+        np.testing.assert_allclose(model_points.expand(self.benefit_pvs(model_points.portfolio)), full)
+        np.testing.assert_allclose(model_points.total(self.benefit_pvs(model_points.portfolio)), full.sum())
+
+        prices = self.eng.price_policy_portfolio(model_points.portfolio).to_numpy()
+        np.testing.assert_allclose(model_points.expand(prices, by_benefit=False),
+                                   self.eng.price_policy_portfolio(self.mixed).to_numpy())
+
+    def test_groups(self):
+
+        model_points = compress(self.mixed, age_band=100, term_band=100)
+        portfolio = model_points.portfolio
+
+        # One point per product, with the mean benefits and the benefit-weighted age of its policies
+        self.assertEqual(model_points.count, 5)
+        self.assertEqual(model_points.compression_ratio, 3.0)
+        np.testing.assert_array_equal(model_points.weights, 3.0)
+        self.assertCountEqual(portfolio.policy_type, self.mixed.product_types)
+        np.testing.assert_array_equal(portfolio.policy_type[model_points.groups], self.mixed.policy_type)
+
+        endowment = portfolio.policy_type == 'Endowment'
+        np.testing.assert_allclose(portfolio.death_contingent_benefits[endowment], 63000.0)
+        np.testing.assert_array_equal(portfolio.ages[endowment], round((41 * 12 + 45 * 125 + 53 * 52) / 189))
+        self.assertTrue(np.isnan(portfolio._terms[portfolio.policy_type == 'Whole-of-Life Assurance']).all())
+        self.assertTrue(np.isnan(portfolio.terminal_survival_contingent_benefits[portfolio.policy_type == 'Annuity']))
+
+        # Mean benefits times weights preserve the total benefits
+        np.testing.assert_allclose(model_points.total(np.nan_to_num(portfolio.death_contingent_benefits)),
+                                   np.nansum(self.mixed.death_contingent_benefits))
+
+    def test_sampled_error(self):
+
+        rng = np.random.default_rng(1)
+        n = 5_000
+        ages = np.clip(rng.normal(45, 8, n).round(), 20, 70).astype(int)
+        terms = rng.choice([5, 10, 15, 20, 25], n).astype(float)
+        amounts = rng.lognormal(10, 1, n)
+        policies = PolicyPortfolio(ages, terms, death_contingent_benefits=amounts,
+                                   terminal_survival_contingent_benefits=amounts,
+                                   policy_type=np.full(n, 'Endowment'), premium_type=np.full(n, 'Regular'))
+
+        value = lambda p: Endowment.from_policy_portfolio(p, self.discount_curve, self.mortality).present_value(
+            aggregate=False)
+        full = value(policies).sum()
+
+        errors = []
+        for band in (1, 5, 10):
+            model_points = compress(policies, age_band=band, term_band=band)
+            errors.append(abs(model_points.total(value(model_points.portfolio)) / full - 1))
+            sampled = model_points.sampled_error(value, sample_size=1_000, seed=0)
+            self.assertEqual(sampled.sample_size, 1_000)
+            self.assertLess(abs(sampled.relative_error), 0.01)
+
+        self.assertLess(errors[0], 1e-12)
+        self.assertLess(errors[1], errors[2])
+        self.assertLess(errors[2], 0.01)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -273,4 +273,129 @@ class TestMortalityTable(unittest.TestCase):
         actual = self.mort.nqx([34, 47, 73], [3, 2, 3])
 
         assert actual.shape == expected.shape
-        assert np.allclose(actual, expected)
\ No newline at end of file
+        assert np.allclose(actual, expected)
+
+    def test_npx_matches_table_path(self):
+
+        rng = np.random.default_rng(0)
+        ages = rng.integers(17, 121, 500)
+        terms = rng.integers(0, 60, 500)
+
+        for full_path in (False, True):
+            expected = self.mort.npx(ages, terms, full_path=full_path, use_tables=True)
+            actual = self.mort.npx(ages, terms, full_path=full_path)
+
+            assert actual.shape == expected.shape
+            assert np.allclose(actual, expected)
+
+
+    def test_nqx_matches_table_path(self):
+
+        rng = np.random.default_rng(0)
+        ages = rng.integers(17, 121, 500)
+        terms = rng.integers(1, 60, 500)
+
+        for full_path in (False, True):
+            expected = self.mort.nqx(ages, terms, full_path=full_path, use_tables=True)
+            actual = self.mort.nqx(ages, terms, full_path=full_path)
+
+            assert actual.shape == expected.shape
+            assert np.allclose(actual, expected)
+
+
+    def test_point_lookups_at_table_edges(self):
+
+        # Single gathers from the ratio tables agree with lx ratios, including term 0 and terms past the table's end
+        rng = np.random.default_rng(3)
+        ages = rng.integers(0, 140, 2_000)
+        terms = rng.integers(0, 250, 2_000)
+        rows, cols, term = self.mort._broadcast_inputs(ages, terms, None)
+        lx, dx = self.mort.cohort_lx, self.mort.cohort_dx
+
+        np.testing.assert_array_equal(self.mort.npx(ages, terms), self.mort._lookup(lx, lx, rows, cols, term))
+        np.testing.assert_array_equal(self.mort.nqx(ages, terms), self.mort._lookup(dx, lx, rows, cols, term, shift=-1))
+        np.testing.assert_array_equal(self.mort.npx(40, [0, 500]), [1.0, 0.0])
+        np.testing.assert_array_equal(self.mort.nqx(40, [0, 500]), [0.0, 0.0])
+
+
+    def test_npx_full_path_into_out_buffer(self):
+
+        expected = self.mort.npx([34, 47, 73], [3, 2, 3], full_path=True)
+
+        out = np.full((3, 3), np.nan)
+        actual = self.mort.npx([34, 47, 73], [3, 2, 3], full_path=True, out=out)
+
+        assert actual is out
+        assert np.allclose(actual, expected)
+
+
+    def test_nqx_full_path_into_out_buffer(self):
+
+        expected = self.mort.nqx([34, 47, 117], 5, full_path=True)
+
+        out = np.full((5, 3), np.nan)
+        actual = self.mort.nqx([34, 47, 117], 5, full_path=True, out=out)
+
+        assert actual is out
+        assert np.allclose(actual, expected)
+
+
+    def test_lx_windows_read_only_view(self):
+
+        windows = self.mort.lx_windows(5)
+
+        assert windows.shape == (self.ages.size + 1, 5)
+        assert not windows.flags.writeable
+        assert np.allclose(windows[0], self.mort.lx[:5])
+        assert np.allclose(windows[-1], 0.0)
+
+
+    def test_npx_nqx_qx_multipliers_match_stressed_tables(self):
+
+        multipliers = [1.0, 1.15, 0.8]
+        ages = [34, 47, 117]
+        terms = [5, 2, 3]
+
+        surv = self.mort.npx(ages, terms, full_path=True, qx_multipliers=multipliers)
+        death = self.mort.nqx(ages, terms, full_path=True, qx_multipliers=multipliers)
+        surv_to_term = self.mort.npx(ages, terms, qx_multipliers=multipliers)
+
+        assert surv.shape == death.shape == (3, 5, 3)
+        assert surv_to_term.shape == (3, 3)
+
+        for k, multiplier in enumerate(multipliers):
+            stressed_qx = np.minimum(self.qx * multiplier, 1.0)
+            stressed_qx[-1] = 1.0
+            stressed = MortalityTable(self.ages, stressed_qx, 'AM92 stressed')
+
+            assert np.allclose(surv[k], stressed.npx(ages, terms, full_path=True))
+            assert np.allclose(death[k], stressed.nqx(ages, terms, full_path=True))
+            assert np.allclose(surv_to_term[k], stressed.npx(ages, terms))
+
+
+    def test_tpx_integer_times_match_npx(self):
+
+        expected = self.mort.npx([34, 47, 117], 5, full_path=True)
+
+        for assumption in ('udd', 'cfm'):
+            actual = self.mort.tpx([34, 47, 117], np.arange(1, 6)[:, None], assumption=assumption)
+
+            assert actual.shape == expected.shape
+            assert np.allclose(actual, expected)
+
+
+    def test_tpx_fractional_udd(self):
+
+        q34 = self.qx[34 - 17]
+
+        assert np.allclose(self.mort.tpx(34, 0.25), 1 - 0.25 * q34)
+        assert np.allclose(self.mort.tpx(34.5, 0.5), (1 - q34) / (1 - 0.5 * q34))
+        assert np.allclose(self.mort.tqx(34.25, 0.5), 0.5 * q34 / (1 - 0.25 * q34))
+
+
+    def test_tpx_fractional_cfm(self):
+
+        q34 = self.qx[34 - 17]
+
+        assert np.allclose(self.mort.tpx(34, 0.25, assumption='cfm'), (1 - q34) ** 0.25)
+        assert np.allclose(self.mort.tpx(34.5, 0.25, assumption='cfm'), (1 - q34) ** 0.25)
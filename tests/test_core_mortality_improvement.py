@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from modelic.core.curves import YieldCurve
+from modelic.core.mortality import MortalityTable
+from modelic.core.mortality_improvement import ImprovementBasis, MortalityImprovementEngine
+from modelic.core.contingent_cashflows.survival_contingent_cashflow import SurvivalContingentCashflow
+from modelic.core.contingent_cashflows.death_contingent_cashflow import DeathContingentCashflow
+from _data import data_path
+
+
+class TestMortalityImprovementEngine(unittest.TestCase):
+
+    mort_raw = pd.read_csv(data_path("mortality", "AM92.csv"))
+    ages = mort_raw['x'].to_numpy(int)
+    qx = mort_raw['q_x'].to_numpy(float)
+    mortality = MortalityTable(ages, qx, 'AM92')
+
+    disc_raw = pd.read_csv(data_path("curves", "boe_spot_annual.csv"))
+    times = disc_raw['year'].to_numpy(int)
+    zeros = disc_raw['rate'].to_numpy(float)
+    discount_curve = YieldCurve(times, zeros, 'BoE')
+
+    years = np.arange(1993, 2031)
+    no_improvement = ImprovementBasis(ages, years, np.zeros((ages.size, years.size)), 1992, 'None')
+    two_pct = ImprovementBasis(ages, years, np.full((ages.size, years.size), 0.02), 1992, 'CMI 2%',
+                               long_term_rate=0.015)
+
+    def test_no_improvement_matches_base(self):
+
+        engine = MortalityImprovementEngine()
+        table = engine.table(self.mortality, self.no_improvement, 2025)
+
+        assert np.allclose(table.npx([34, 47, 73], [3, 2, 3], full_path=True),
+                           self.mortality.npx([34, 47, 73], [3, 2, 3], full_path=True))
+
+    def test_improved_rates_by_birth_year(self):
+
+        engine = MortalityImprovementEngine()
+        table = engine.table(self.mortality, self.two_pct, 2025)
+
+        # A 60 year old at 2025 dies in the second year at the 2026 rate for age 61
+        expected = self.qx[61 - 17] * 0.98 ** (2026 - 1992) * (1 - self.qx[60 - 17] * 0.98 ** (2025 - 1992))
+
+        actual = table.nqx(60, 2)
+
+        assert np.allclose(actual, expected)
+
+        # A 20 year old at 2025 reaches age 30 in 2035, improved at 2% to 2030 then at the 1.5% long-term rate
+        expected = self.qx[30 - 17] * 0.98 ** (2030 - 1992) * 0.985 ** (2035 - 2030)
+
+        actual = table.nqx(20, 11) / table.npx(20, 10)
+
+        assert np.allclose(actual, expected)
+
+    def test_cache_hits_and_eviction(self):
+
+        engine = MortalityImprovementEngine(maxsize=2)
+
+        first = engine.table(self.mortality, self.two_pct, 2025)
+        assert engine.table(self.mortality, self.two_pct, 2025) is first
+        engine.table(self.mortality, self.two_pct, 2026)
+        engine.table(self.mortality, self.no_improvement, 2025)
+
+        assert engine.cache_info() == {'hits': 1, 'misses': 3, 'size': 2, 'maxsize': 2}
+        assert engine.table(self.mortality, self.two_pct, 2025) is not first
+
+    def test_contingent_cashflows_consume_improved_table(self):
+
+        engine = MortalityImprovementEngine()
+        base_annuity = SurvivalContingentCashflow(self.discount_curve, self.mortality, [58, 68, 78], [np.nan] * 3,
+                                                  periodic_cf=[5, 10, 15])
+        improved_table = engine.table(self.mortality, self.two_pct, 2025)
+        improved_annuity = SurvivalContingentCashflow(self.discount_curve, improved_table, [58, 68, 78], [np.nan] * 3,
+                                                      periodic_cf=[5, 10, 15])
+        improved_assurance = DeathContingentCashflow(self.discount_curve, improved_table, [58, 68, 78], [10, 10, 10])
+
+        assert (improved_annuity.present_value(aggregate=False) > base_annuity.present_value(aggregate=False)).all()
+        assert improved_assurance.present_value(aggregate=False).shape == (3,)
@@ -1,8 +1,15 @@
+import importlib.util
+import os
+import tempfile
 import unittest
 import pytest
 import numpy as np
+import pandas as pd
 
+from modelic.core.curves import YieldCurve
+from modelic.core.mortality import MortalityTable
 from modelic.core.policy_portfolio import PolicyPortfolio
+from modelic.products.endowment import Endowment
 from _data import data_path
 
 
@@ -22,4 +29,123 @@ class TestPolicyPortfolio(unittest.TestCase):
         assert np.allclose(self.policy_wol_csv.death_contingent_benefits, expected_death_contingent_benefits)
 
         assert self.policy_wol_csv.terminal_survival_contingent_benefits is None
-        assert self.policy_wol_csv.periodic_survival_contingent_benefits is None
\ No newline at end of file
+        assert self.policy_wol_csv.periodic_survival_contingent_benefits is None
+
+    def test_columns_and_cached_derived_columns(self):
+
+        policies = PolicyPortfolio.from_csv(data_path("policy_data", "mixed_policies.csv"))
+
+        for column in (policies.ages, policies.death_contingent_benefits, policies.premiums, policies.policy_type):
+            assert isinstance(column, np.ndarray) and column.flags.c_contiguous
+        assert policies.premiums.dtype == np.float64
+
+        assert policies.terms is policies.terms
+        assert policies.policy_id is policies.policy_id
+        assert not policies.terms.flags.writeable
+        assert np.all(policies.terms[np.isnan(policies._terms)] == 103)
+
+        data = policies.data
+        data['policy_type'] = 'Other'
+        assert not np.any(policies.data['policy_type'] == 'Other')
+
+    def test_select(self):
+
+        policies = PolicyPortfolio(np.array([30, 40, 50, 60]), np.array([10, np.nan, 5, 20]),
+                                   death_contingent_benefits=np.array([1.0, 2.0, 3.0, 4.0]))
+        policies.terms
+
+        first_two = policies.select(slice(0, 2))
+        assert np.shares_memory(first_two.ages, policies.ages)
+        assert np.shares_memory(first_two.terms, policies.terms)
+        assert np.allclose(first_two.terms, [10, 103])
+
+        masked = policies.select(policies.ages > 35)
+        assert np.allclose(masked.death_contingent_benefits, [2.0, 3.0, 4.0])
+        assert np.allclose(masked.policy_id, [2, 3, 4])
+        assert masked.terminal_survival_contingent_benefits is None
+        assert masked.count == 3
+
+    def test_product_type_groups(self):
+
+        policies = PolicyPortfolio.from_csv(data_path("policy_data", "mixed_policies.csv"))
+        by_type = policies.by_type
+
+        for product_type in policies.product_types:
+            rows = policies.type_slice(product_type)
+            assert np.all(by_type.policy_type[rows] == product_type)
+            assert np.array_equal(policies.is_type(product_type), policies.policy_type == product_type)
+            mask = policies.policy_type == product_type
+            assert np.array_equal(policies.get('ages', product_type), policies.ages[mask])
+            assert policies.get('count', product_type) == np.sum(policies.policy_type == product_type)
+
+        assert np.array_equal(policies.scatter_by_type(by_type.policy_id), policies.policy_id)
+        assert policies.type_slice('Unknown') == slice(0, 0)
+        assert not policies.is_type('Unknown').any()
+
+    def test_iter_batches(self):
+
+        source = data_path("policy_data", "mixed_policies.csv")
+        policies = PolicyPortfolio.from_csv(source)
+        batches = list(PolicyPortfolio.iter_batches(source, batch_size=4))
+
+        assert [batch.count for batch in batches] == [4, 4, 4, 3]
+        assert np.array_equal(np.concatenate([b.policy_id for b in batches]), policies.policy_id)
+        assert np.array_equal(np.concatenate([b.terms for b in batches]), policies.terms)
+        assert all(b.ages.dtype == np.float64 and b.premiums.dtype == np.float64 for b in batches)
+
+        pruned = next(PolicyPortfolio.iter_batches(source, 4, columns=['death_contingent_benefit']))
+        assert pruned.policy_type is None and pruned.death_contingent_benefits is not None
+
+        mortality_data = pd.read_csv(data_path("mortality", "AM92.csv"))
+        mortality = MortalityTable(mortality_data['x'].to_numpy(int), mortality_data['q_x'].to_numpy(float), 'AM92')
+        curve = YieldCurve(np.arange(1, 151), np.full(150, 0.03), '3%')
+        expected = Endowment.from_policy_portfolio(policies, curve, mortality).present_value(aggregate=False)
+        actual = Endowment.present_value_batches(PolicyPortfolio.iter_batches(source, 4), curve, mortality,
+                                                 aggregate=False, valuation={'fused': False})
+        np.testing.assert_allclose(actual, expected)
+        endowments = (b.select(b.is_type('Endowment')) for b in PolicyPortfolio.iter_batches(source, 4)
+                      if b.get('count', 'Endowment'))
+        np.testing.assert_allclose(Endowment.present_value_batches(endowments, curve, mortality), np.nansum(expected))
+
+    def test_iter_batches_fractional_ages(self):
+
+        frame = pd.read_csv(data_path("policy_data", "mixed_policies.csv"))
+        frame['age'] = frame['age'] + 0.5
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'policies.csv')
+            frame.to_csv(path, index=False)
+            batches = list(PolicyPortfolio.iter_batches(path, batch_size=4))
+
+        np.testing.assert_array_equal(np.concatenate([b.ages for b in batches]), frame['age'].to_numpy())
+
+    def test_store_round_trip(self):
+
+        policies = PolicyPortfolio.from_csv(data_path("policy_data", "mixed_policies.csv"))
+        with tempfile.TemporaryDirectory() as folder:
+            policies.to_store(folder)
+            opened = PolicyPortfolio.open_store(folder)
+
+            self.assertIsInstance(opened.premiums.base, np.memmap)
+            self.assertFalse(opened.ages.flags.writeable)
+            np.testing.assert_array_equal(opened.policy_id, policies.policy_id)
+            np.testing.assert_array_equal(opened.terms, policies.terms)
+            np.testing.assert_array_equal(opened.policy_type, policies.policy_type)
+            np.testing.assert_array_equal(opened.get('ages', 'Annuity'), policies.get('ages', 'Annuity'))
+            pd.testing.assert_frame_equal(opened.data, policies.data, check_dtype=False)
+            del opened
+
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertRaises(FileNotFoundError):
+                PolicyPortfolio.open_store(folder)
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), "pyarrow is not installed")
+    def test_iter_batches_parquet(self):
+
+        frame = pd.read_csv(data_path("policy_data", "mixed_policies.csv"))
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'policies.parquet')
+            frame.to_parquet(path)
+            batches = list(PolicyPortfolio.iter_batches(path, batch_size=10))
+
+        assert [batch.count for batch in batches] == [10, 5]
+        assert np.array_equal(np.concatenate([b.ages for b in batches]), frame['age'].to_numpy())
@@ -89,3 +89,10 @@ class TestExpenseEngine(unittest.TestCase):
         assert np.allclose(actual, expected)
 
 
+    def test_expense_engine_pv_policy_chunks(self):
+
+        expected = self.eng.present_value(self.policies_in, group_by=['policy_id', 'Basis'], unstack=True)
+        actual = self.eng.present_value(self.policies_in, group_by=['policy_id', 'Basis'], unstack=True,
+                                        policy_chunk=2, max_memory=20_000)
+
+        pd.testing.assert_frame_equal(actual, expected, rtol=1e-12)
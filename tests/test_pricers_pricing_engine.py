@@ -1,4 +1,7 @@
+import os
+import tempfile
 import unittest
+from unittest import mock
 import numpy as np
 import pandas as pd
 
@@ -76,3 +79,66 @@ class TestPricingEngine(unittest.TestCase):
         assert actual.shape == expected.shape
         assert np.allclose(actual, expected)
 
+
+
+    def test_pricing_engine_policy_chunks(self):
+
+        chunked = PricingEngine(self.mortality, self.discount_curve, self.expense_spec, self.expense_inflation_rate,
+                                policy_chunk=4, max_memory=50_000)
+
+        expected = self.eng.price_policy_portfolio(self.policies_in)
+        actual = chunked.price_policy_portfolio(self.policies_in)
+
+        assert np.allclose(actual, expected, rtol=1e-12)
+
+
+    def test_pricing_engine_policy_chunks_reach_expenses(self):
+
+        chunked = PricingEngine(self.mortality, self.discount_curve, self.expense_spec, self.expense_inflation_rate,
+                                policy_chunk=2, max_memory=20_000)
+        expected = self.eng.price_policy_portfolio(self.policies_in)
+
+        with mock.patch.object(chunked.expense_engine, 'present_value',
+                               wraps=chunked.expense_engine.present_value) as expense_pv:
+            actual = chunked.price_policy_portfolio(self.policies_in)
+
+        assert expense_pv.call_args.kwargs['policy_chunk'] == 2
+        assert expense_pv.call_args.kwargs['max_memory'] == 20_000
+        assert np.allclose(actual, expected, rtol=1e-12)
+
+
+    def test_pricing_engine_deduplicated(self):
+
+        deduplicated = PricingEngine(self.mortality, self.discount_curve, self.expense_spec, self.expense_inflation_rate,
+                                     deduplicate=True)
+
+        expected = self.eng.price_policy_portfolio(self.policies_in)
+        actual = deduplicated.price_policy_portfolio(self.policies_in)
+
+        assert np.allclose(actual, expected, rtol=1e-12)
+
+
+    def test_pricing_engine_batches(self):
+
+        policies = pd.read_csv(data_path('policy_data', 'mixed_policies.csv')).drop('premium', axis=1)
+        expected = self.eng.price_policy_portfolio(self.policies_in)
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'policies.csv')
+            policies.to_csv(path, index=False)
+            actual = self.eng.price_batches(PolicyPortfolio.iter_batches(path, batch_size=4))
+
+        assert np.array_equal(actual.index, expected.index)
+        assert np.allclose(actual, expected, rtol=1e-12)
+
+
+    def test_pricing_engine_store(self):
+
+        expected = self.eng.price_policy_portfolio(self.policies_in)
+
+        with tempfile.TemporaryDirectory() as folder:
+            self.policies_in.to_store(folder)
+            actual = self.eng.price_policy_portfolio(PolicyPortfolio.open_store(folder))
+
+        assert np.array_equal(actual.index, expected.index)
+        assert np.allclose(actual, expected, rtol=1e-12)
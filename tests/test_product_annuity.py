@@ -2,7 +2,7 @@ import unittest
 import numpy as np
 import pandas as pd
 
-from modelic.core.curves import YieldCurve
+from modelic.core.curves import IndexCurve, YieldCurve
 from modelic.core.mortality import MortalityTable
 from modelic.core.policy_portfolio import PolicyPortfolio
 from modelic.products.annuity import Annuity
@@ -84,3 +84,32 @@ class TestProductAnnuity(unittest.TestCase):
         actual = self.annuity.present_value(aggregate=True)
 
         assert np.allclose(actual, expected)
+
+
+    def test_present_value_index_linked(self):
+
+        # An index growing 3% a year escalates benefits exactly as a fixed 3% escalation does
+        years = np.arange(0, 121)
+        rpi = IndexCurve(years, 250.0 * 1.03 ** years, 'RPI')
+        fixed = Annuity.from_policy_portfolio(self.policies_various_terms, self.discount_curve, self.mortality,
+                                              escalation=0.03)
+        linked = Annuity.from_policy_portfolio(self.policies_various_terms, self.discount_curve, self.mortality,
+                                               escalation=rpi)
+        expected = fixed.present_value(aggregate=False)
+
+        np.testing.assert_allclose(linked.present_value(aggregate=False), expected, rtol=1e-12)
+        np.testing.assert_allclose(linked.present_value(aggregate=False, fused=False, time_chunk=2), expected,
+                                   rtol=1e-12)
+        np.testing.assert_allclose(linked.present_value(aggregate=False, ragged=True), expected, rtol=1e-12)
+
+        monthly = dict(frequency=12)
+        np.testing.assert_allclose(
+            Annuity(self.discount_curve, self.mortality, [60, 70], [10, 20], [1200.0, 600.0], escalation=rpi,
+                    **monthly).present_value(aggregate=False),
+            Annuity(self.discount_curve, self.mortality, [60, 70], [10, 20], [1200.0, 600.0], escalation=0.03,
+                    **monthly).present_value(aggregate=False), rtol=1e-12)
+
+        # Faster index growth is worth more
+        self.assertGreater(Annuity.from_policy_portfolio(self.policies_various_terms, self.discount_curve,
+                                                         self.mortality, escalation=rpi.with_wedge(50)).present_value(),
+                           linked.present_value())
@@ -2,7 +2,8 @@ import unittest
 import numpy as np
 import pandas as pd
 
-from modelic.core.curves import YieldCurve
+from modelic.core.curves import YieldCurve, YieldCurveSet
+from modelic.core.enums import Extrapolation, Interpolation
 from modelic.core.mortality import MortalityTable
 from modelic.core.policy_portfolio import PolicyPortfolio
 from modelic.products.endowment import Endowment
@@ -67,4 +68,119 @@ class TestProductEndowment(unittest.TestCase):
         expected = 8.127457751
         actual = self.endowments.present_value(aggregate=True)
 
-        assert np.allclose(actual, expected)
\ No newline at end of file
+        assert np.allclose(actual, expected)
+
+    def test_fused_present_value_matches_components(self):
+
+        policies = PolicyPortfolio(np.array([30, 45, 60, 75]), np.array([5, 12, 20, 30]),
+                                   death_contingent_benefits=np.array([1000.0, 2000.0, 500.0, 750.0]),
+                                   terminal_survival_contingent_benefits=np.array([800.0, 100.0, 2500.0, 50.0]))
+        endowments = Endowment.from_policy_portfolio(policies, self.discount_curve, self.mortality)
+        self.assertIsNotNone(endowments._shared_survival_basis())
+
+        for spread in (None, 0.01, np.array([0.0, 0.01, 0.02, 0.03])):
+            for aggregate in (True, False):
+                fused = endowments.present_value(spread, aggregate, fused=True)
+                separate = endowments.present_value(spread, aggregate, fused=False)
+                assert np.allclose(fused, separate)
+
+        stressed = Endowment(self.discount_curve, self.mortality, policies.ages, policies.terms,
+                             policies.terminal_survival_contingent_benefits, policies.death_contingent_benefits)
+        for component in stressed.components:
+            component.qx_multipliers = np.array([0.8, 1.0, 1.2])
+            component.escalation = 0.02
+        assert np.allclose(stressed.present_value(aggregate=False, fused=True),
+                           stressed.present_value(aggregate=False, fused=False))
+
+
+    def test_present_value_policy_chunks(self):
+
+        expected = self.endowments.present_value(aggregate=False)
+
+        for policy_chunk in (1, 2):
+            actual = self.endowments.present_value(aggregate=False, policy_chunk=policy_chunk)
+            np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+        np.testing.assert_allclose(self.endowments.present_value(max_memory=1), expected.sum(), rtol=1e-12)
+        np.testing.assert_allclose(self.endowments.present_value(fused=False, time_chunk=2, policy_chunk=2),
+                                   expected.sum(), rtol=1e-12)
+
+        np.testing.assert_allclose(self.endowments.present_value(aggregate=False, ragged=True), expected, rtol=1e-12)
+
+
+    def test_present_value_deduplicated(self):
+
+        policies = PolicyPortfolio(np.array([30, 45, 30, 45, 30]), np.array([10, 20, 10, 20, 15]),
+                                   death_contingent_benefits=np.array([1000.0, 2000.0, 500.0, 750.0, 100.0]),
+                                   terminal_survival_contingent_benefits=np.array([800.0, 100.0, 2500.0, 50.0, 10.0]))
+
+        expected = Endowment.from_policy_portfolio(policies, self.discount_curve, self.mortality)
+        actual = Endowment.from_policy_portfolio(policies, self.discount_curve, self.mortality, deduplicate=True)
+
+        np.testing.assert_allclose(actual.present_value(aggregate=False), expected.present_value(aggregate=False),
+                                   rtol=1e-12)
+
+
+    def test_present_value_scenarios(self):
+
+        shifts = np.array([-0.01, 0.0, 0.005, 0.02, 0.03])
+        curves = YieldCurveSet(self.times, self.zeros[None, :] + shifts[:, None], 'parallel shifts')
+        expected = np.stack([self.endowments.present_value(shift, aggregate=False) for shift in shifts])
+
+        np.testing.assert_allclose(self.endowments.present_value_scenarios(curves, aggregate=False), expected)
+        np.testing.assert_allclose(self.endowments.present_value_scenarios(curves, scenario_chunk=2),
+                                   expected.sum(axis=-1))
+        np.testing.assert_allclose(self.endowments.present_value_scenarios(curves, spread=0.01),
+                                   [self.endowments.present_value(shift + 0.01) for shift in shifts])
+
+
+    def test_present_value_scenarios_off_grid(self):
+
+        # Monthly cashflows fall between the curve's annual times; a 50-year curve ends before the long terms do
+        shifts = np.array([-0.01, 0.0, 0.02])
+        ages, terms, benefits = np.array([30, 45, 60]), np.array([70, 10, 25]), np.array([1000.0, 2000.0, 500.0])
+
+        for times, settings in ((self.times, {}), (self.times[:50], {}),
+                                (self.times[:50], {'interpolation': Interpolation.MONOTONE_CONVEX,
+                                                   'extrapolation': Extrapolation.SMITH_WILSON})):
+            zeros = self.zeros[:times.size]
+            curves = YieldCurveSet(times, zeros[None, :] + shifts[:, None], 'parallel shifts', **settings)
+            monthly = Endowment(curves[0], self.mortality, ages, terms, benefits, benefits, frequency=12)
+
+            expected = [Endowment(curves[s], self.mortality, ages, terms, benefits, benefits,
+                                  frequency=12).present_value(aggregate=False) for s in range(len(curves))]
+            np.testing.assert_allclose(monthly.present_value_scenarios(curves, aggregate=False), expected, rtol=1e-12)
+            np.testing.assert_allclose(monthly.present_value_scenarios(curves, scenario_chunk=2),
+                                       np.sum(expected, axis=-1), rtol=1e-12)
+
+
+    def test_present_value_sensitivities(self):
+
+        h = 1e-5
+        key_rate_times = np.array([1, 2, 5])
+        up, down = (self.endowments.present_value(s, aggregate=False) for s in (h, -h))
+        pv = self.endowments.present_value(aggregate=False)
+
+        result = self.endowments.present_value(aggregate=False, sensitivities=True, key_rate_times=key_rate_times)
+        np.testing.assert_allclose(result.pv, pv, rtol=1e-12)
+        np.testing.assert_allclose(result.pv01, (down - up) / (2 * h) * 1e-4, rtol=1e-6)
+        np.testing.assert_allclose(result.duration, (down - up) / (2 * h * pv), rtol=1e-6)
+        np.testing.assert_allclose(result.convexity, (up + down - 2 * pv) / (h * h * pv), rtol=1e-3)
+        np.testing.assert_allclose(result.key_rate_deltas.sum(axis=-2), result.pv01, rtol=1e-12)
+
+        for k, bucket in enumerate(np.eye(key_rate_times.size)):
+            bumped = [Endowment.from_policy_portfolio(
+                self.policies, YieldCurve(self.times, self.zeros + s * np.interp(self.times, key_rate_times, bucket),
+                                          'BoE bumped'), self.mortality).present_value(aggregate=False)
+                      for s in (h, -h)]
+            np.testing.assert_allclose(result.key_rate_deltas[k], (bumped[1] - bumped[0]) / (2 * h) * 1e-4,
+                                       rtol=1e-6, atol=1e-12)
+
+        total = self.endowments.present_value(0.01, sensitivities=True, time_chunk=2)
+        by_policy = self.endowments.present_value(0.01, aggregate=False, sensitivities=True)
+        np.testing.assert_allclose(total.pv, self.endowments.present_value(0.01), rtol=1e-12)
+        np.testing.assert_allclose(total.duration, by_policy.dpv.sum() / -by_policy.pv.sum(), rtol=1e-12)
+        np.testing.assert_allclose(total.key_rate_deltas, by_policy.key_rate_deltas.sum(axis=-1), rtol=1e-12)
+
+        with self.assertRaises(ValueError):
+            self.endowments.present_value(sensitivities=True, ragged=True)